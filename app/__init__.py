@@ -34,6 +34,13 @@ def create_app() -> Flask:
     app.register_blueprint(whatsapp_bp)
     app.register_blueprint(hooks_bp)
     logger.info("✅ Blueprints registrados correctamente")
+
+    # Reinsertar webhooks que quedaron en el journal de un proceso que murió
+    try:
+        from app.services.webhook_journal import webhook_journal
+        webhook_journal.recover(app)
+    except Exception as e:
+        logger.error(f"❌ Error recuperando journal de webhooks: {e}")
     
     # Inicializar scheduler inmediatamente al crear la app
     logger.info("🔧 Iniciando scheduler...")
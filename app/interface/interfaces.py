@@ -68,7 +68,7 @@ class IncidentsInterface(BaseInterface):
                 Cliente_Nombre=data.get('Cliente_Nombre'),
                 Asunto=data.get('Asunto'),
                 Fecha_Creacion=data.get('Fecha_Creacion'),
-                Ticket_ID=data.get('Ticket_ID'),
+                Ticket_ID=IncidentsInterface.normalize_ticket_id(data.get('Ticket_ID')),
                 Estado=data.get('Estado'),
                 Prioridad=data.get('Prioridad'),
                 is_created_splynx=data.get('is_created_splynx', False),
@@ -88,6 +88,84 @@ class IncidentsInterface(BaseInterface):
             logger.error(f"Error creating incident: {str(e)}")
             return None
     
+    @staticmethod
+    def existing_fechas(fechas: List[str]) -> set:
+        """
+        Return the Fecha_Creacion values (dedup key) that already exist.
+
+        Args:
+            fechas: Candidate Fecha_Creacion values
+
+        Returns:
+            Set of values already present in the table
+        """
+        if not fechas:
+            return set()
+        try:
+            rows = db.session.query(IncidentsDetection.Fecha_Creacion).filter(
+                IncidentsDetection.Fecha_Creacion.in_(list(fechas))
+            ).all()
+            return {row[0] for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error checking existing incidents: {str(e)}")
+            return set()
+
+    @staticmethod
+    def insert_ignore(rows: List[Dict[str, Any]], chunk_size: int = 500) -> Optional[int]:
+        """
+        Insert incidents with multi-row INSERT IGNORE (sqlite: INSERT OR IGNORE),
+        chunk_size rows per statement, in one transaction.
+
+        Rows colliding on the unique Fecha_Creacion are skipped by the database.
+
+        Args:
+            rows: Column -> value dictionaries
+            chunk_size: Rows per INSERT statement
+
+        Returns:
+            Number of rows actually inserted, or None on error
+        """
+        if not rows:
+            return 0
+        try:
+            inserted = 0
+            for start in range(0, len(rows), chunk_size):
+                stmt = (
+                    db.insert(IncidentsDetection.__table__)
+                    .values(rows[start:start + chunk_size])
+                    .prefix_with('IGNORE', dialect='mysql')
+                    .prefix_with('OR IGNORE', dialect='sqlite')
+                )
+                inserted += db.session.execute(stmt).rowcount
+            db.session.commit()
+            return inserted
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error bulk inserting incidents: {str(e)}")
+            return None
+
+    @staticmethod
+    def ids_by_fecha(fechas: List[str]) -> Dict[str, int]:
+        """
+        Map Fecha_Creacion -> incident id for the given values.
+
+        Args:
+            fechas: Fecha_Creacion values
+
+        Returns:
+            Dictionary with the incidents found
+        """
+        if not fechas:
+            return {}
+        try:
+            rows = db.session.query(IncidentsDetection.Fecha_Creacion, IncidentsDetection.id).filter(
+                IncidentsDetection.Fecha_Creacion.in_(list(fechas))
+            ).all()
+            return {fecha: incident_id for fecha, incident_id in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading incident ids: {str(e)}")
+            return {}
+
     @staticmethod
     def get_by_id(incident_id: int) -> Optional[IncidentsDetection]:
         """
@@ -146,7 +224,7 @@ class IncidentsInterface(BaseInterface):
             if 'Fecha_Creacion' in data:
                 incident.Fecha_Creacion = data['Fecha_Creacion']
             if 'Ticket_ID' in data:
-                incident.Ticket_ID = data['Ticket_ID']
+                incident.Ticket_ID = IncidentsInterface.normalize_ticket_id(data['Ticket_ID'])
             if 'Estado' in data:
                 incident.Estado = data['Estado']
             if 'Prioridad' in data:
@@ -186,9 +264,17 @@ class IncidentsInterface(BaseInterface):
             return False
     
     @staticmethod
-    def find_by_ticket_id(ticket_id: str) -> Optional[IncidentsDetection]:
+    def normalize_ticket_id(ticket_id: Any) -> Optional[str]:
+        """Splynx ticket ID as stored in Ticket_ID (trimmed string, empty -> None)."""
+        if ticket_id is None:
+            return None
+        ticket_id = str(ticket_id).strip()
+        return ticket_id or None
+
+    @staticmethod
+    def find_by_ticket_id(ticket_id: Any) -> Optional[IncidentsDetection]:
         """
-        Find incident by Ticket_ID.
+        Find incident by Ticket_ID (unique index).
         
         Args:
             ticket_id: Ticket ID to search for
@@ -196,11 +282,37 @@ class IncidentsInterface(BaseInterface):
         Returns:
             Incident or None if not found
         """
+        ticket_id = IncidentsInterface.normalize_ticket_id(ticket_id)
+        if ticket_id is None:
+            return None
         try:
             return IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Error finding incident by ticket ID: {str(e)}")
             return None
+
+    @staticmethod
+    def find_by_ticket_ids(ticket_ids) -> Dict[str, IncidentsDetection]:
+        """
+        Find the incidents for several Ticket_IDs in one query.
+        
+        Args:
+            ticket_ids: Ticket IDs to search for
+            
+        Returns:
+            Dictionary Ticket_ID -> incident for the ones found
+        """
+        ids = {IncidentsInterface.normalize_ticket_id(t) for t in ticket_ids} - {None}
+        if not ids:
+            return {}
+        try:
+            return {
+                incident.Ticket_ID: incident
+                for incident in IncidentsDetection.query.filter(IncidentsDetection.Ticket_ID.in_(ids)).all()
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Error finding incidents by ticket IDs: {str(e)}")
+            return {}
     
     @staticmethod
     def find_by_client(client_name: str) -> List[IncidentsDetection]:
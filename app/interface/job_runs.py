@@ -0,0 +1,125 @@
+"""
+Interface para el registro de ejecuciones de jobs (job_run)
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.utils.config import db
+from app.models.models import JobRun
+from app.utils.job_metrics import percentile
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Ventana máxima de get_stats (coincide con la retención por defecto de job_run)
+MAX_STATS_HOURS = 30 * 24
+
+# Columnas que necesita _summarize; no se cargan filas ORM completas
+_STATS_COLUMNS = (
+    JobRun.job_name, JobRun.started_at, JobRun.duration_ms, JobRun.outcome,
+    JobRun.items_processed, JobRun.splynx_calls, JobRun.db_statements, JobRun.whatsapp_sends,
+)
+
+
+def _summarize(runs: List[Any]) -> Dict[str, Any]:
+    durations = sorted(r.duration_ms for r in runs if r.duration_ms is not None)
+    total = len(runs)
+    return {
+        'runs': total,
+        'errors': sum(1 for r in runs if r.outcome == 'error'),
+        'skipped': sum(1 for r in runs if r.outcome == 'skipped'),
+        'p50_ms': percentile(durations, 50),
+        'p95_ms': percentile(durations, 95),
+        'max_ms': durations[-1] if durations else None,
+        'avg_ms': round(sum(durations) / len(durations)) if durations else None,
+        'avg_items': round(sum(r.items_processed or 0 for r in runs) / total, 1) if total else 0,
+        'avg_splynx_calls': round(sum(r.splynx_calls or 0 for r in runs) / total, 1) if total else 0,
+        'avg_db_statements': round(sum(r.db_statements or 0 for r in runs) / total, 1) if total else 0,
+        'whatsapp_sends': sum(r.whatsapp_sends or 0 for r in runs),
+    }
+
+
+class JobRunInterface:
+    """Interface para guardar y consultar ejecuciones de jobs"""
+
+    @staticmethod
+    def record(data: Dict[str, Any]) -> Optional[JobRun]:
+        try:
+            run = JobRun(**data)
+            db.session.add(run)
+            db.session.commit()
+            return run
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"❌ Error guardando ejecución del job {data.get('job_name')}: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_recent(job_name: str = None, outcome: str = None, limit: int = 100) -> List[JobRun]:
+        try:
+            query = JobRun.query
+            if job_name:
+                query = query.filter(JobRun.job_name == job_name)
+            if outcome:
+                query = query.filter(JobRun.outcome == outcome)
+            return query.order_by(JobRun.started_at.desc()).limit(limit).all()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Error leyendo ejecuciones de jobs: {str(e)}")
+            return []
+
+    @staticmethod
+    def get_stats(hours: int = 24, job_name: str = None, bucket: str = None) -> Dict[str, Any]:
+        """
+        Duración p50/p95 y contadores promedio por job en la ventana indicada.
+
+        Args:
+            hours: Ventana hacia atrás en horas (se limita a MAX_STATS_HOURS)
+            job_name: Limitar a un job
+            bucket: 'hour' o 'day' para agregar la tendencia por intervalo
+        """
+        try:
+            hours = min(max(hours, 1), MAX_STATS_HOURS)
+            since = datetime.now() - timedelta(hours=hours)
+            query = JobRun.query.with_entities(*_STATS_COLUMNS).filter(JobRun.started_at >= since)
+            if job_name:
+                query = query.filter(JobRun.job_name == job_name)
+            runs = query.order_by(JobRun.started_at).all()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Error calculando estadísticas de jobs: {str(e)}")
+            return {}
+
+        by_job = defaultdict(list)
+        for run in runs:
+            by_job[run.job_name].append(run)
+
+        stats = {}
+        for name, job_runs in by_job.items():
+            stats[name] = _summarize(job_runs)
+            if bucket in ('hour', 'day'):
+                fmt = '%Y-%m-%d %H:00' if bucket == 'hour' else '%Y-%m-%d'
+                buckets = defaultdict(list)
+                for run in job_runs:
+                    buckets[run.started_at.strftime(fmt)].append(run)
+                stats[name]['trend'] = [
+                    {'bucket': key, **_summarize(bucket_runs)}
+                    for key, bucket_runs in sorted(buckets.items())
+                ]
+        return stats
+
+    @staticmethod
+    def purge_older_than(days: int) -> int:
+        """Borra ejecuciones más viejas que `days` días; devuelve cuántas borró"""
+        try:
+            cutoff = datetime.now() - timedelta(days=days)
+            deleted = JobRun.query.filter(JobRun.started_at < cutoff).delete(synchronize_session=False)
+            db.session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"❌ Error purgando ejecuciones de jobs: {str(e)}")
+            return 0
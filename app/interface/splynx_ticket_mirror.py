@@ -0,0 +1,196 @@
+"""
+Interface para la tabla espejo de tickets abiertos de Splynx
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.utils.config import db
+from app.models.models import SplynxTicketMirror
+from app.utils.date_utils import parse_splynx_date
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# IDs por lista NOT IN al borrar tickets que ya no están abiertos
+RECONCILE_CHUNK_SIZE = 1000
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_closed(ticket: Dict[str, Any]) -> bool:
+    return ticket.get('closed') in ['1', 1, True, 'true']
+
+
+class SplynxTicketMirrorInterface:
+    """Interface para leer y mantener el espejo local de tickets de Splynx"""
+
+    @staticmethod
+    def _apply(row: SplynxTicketMirror, ticket: Dict[str, Any], now: datetime):
+        row.group_id = str(ticket.get('group_id', '') or '')
+        row.status_id = str(ticket.get('status_id', '') or '')
+        row.closed = _is_closed(ticket)
+        row.assign_to = _to_int(ticket.get('assign_to'))
+        row.customer_id = str(ticket.get('customer_id', '') or '')
+        row.subject = (ticket.get('subject') or '')[:255]
+        row.priority = ticket.get('priority')
+        row.note = ticket.get('note')
+        row.created_at = parse_splynx_date(ticket.get('created_at', ''))
+        row.updated_at = parse_splynx_date(ticket.get('updated_at', ''))
+        row.synced_at = now
+
+    @staticmethod
+    def apply_changes(tickets: Iterable[Dict[str, Any]], group_id: str) -> Dict[str, int]:
+        """
+        Aplica tickets recibidos de Splynx (delta): inserta/actualiza los abiertos
+        del grupo y elimina los que se cerraron o cambiaron de grupo.
+
+        Returns:
+            dict: {'upserted': n, 'removed': n}
+        """
+        tickets = [t for t in tickets if t.get('id') is not None]
+        if not tickets:
+            return {'upserted': 0, 'removed': 0}
+
+        try:
+            ids = [str(t['id']) for t in tickets]
+            existing = {
+                row.ticket_id: row
+                for row in SplynxTicketMirror.query.filter(SplynxTicketMirror.ticket_id.in_(ids)).all()
+            }
+
+            now = datetime.now()
+            upserted = removed = 0
+            for ticket in tickets:
+                ticket_id = str(ticket['id'])
+                row = existing.get(ticket_id)
+                keep = not _is_closed(ticket) and str(ticket.get('group_id')) == str(group_id)
+
+                if not keep:
+                    if row is not None:
+                        db.session.delete(row)
+                        removed += 1
+                    continue
+
+                if row is None:
+                    row = SplynxTicketMirror(ticket_id=ticket_id)
+                    db.session.add(row)
+                    existing[ticket_id] = row
+                SplynxTicketMirrorInterface._apply(row, ticket, now)
+                upserted += 1
+
+            db.session.commit()
+            return {'upserted': upserted, 'removed': removed}
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"❌ Error actualizando espejo de tickets Splynx: {str(e)}")
+            raise
+
+    @staticmethod
+    def reconcile(open_tickets: List[Dict[str, Any]], group_id: str) -> Dict[str, int]:
+        """
+        Pasada completa: el espejo queda exactamente con los tickets abiertos recibidos.
+
+        Returns:
+            dict: {'upserted': n, 'removed': n}
+        """
+        result = SplynxTicketMirrorInterface.apply_changes(open_tickets, group_id)
+        try:
+            open_ids = sorted({str(t['id']) for t in open_tickets if t.get('id') is not None})
+            # Un solo DELETE: de otro grupo, o del grupo y fuera de los abiertos (NOT IN por tramos)
+            not_open = [
+                SplynxTicketMirror.ticket_id.notin_(open_ids[start:start + RECONCILE_CHUNK_SIZE])
+                for start in range(0, len(open_ids), RECONCILE_CHUNK_SIZE)
+            ]
+            removed = SplynxTicketMirror.query.filter(or_(
+                SplynxTicketMirror.group_id != str(group_id),
+                and_(SplynxTicketMirror.group_id == str(group_id), *not_open)
+            )).delete(synchronize_session=False)
+            db.session.commit()
+            result['removed'] += removed
+            return result
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"❌ Error reconciliando espejo de tickets Splynx: {str(e)}")
+            raise
+
+    @staticmethod
+    def get_open(group_id: str, assigned: Optional[bool] = None, assign_to: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Tickets abiertos del espejo en formato Splynx.
+
+        Args:
+            group_id: Grupo de Splynx
+            assigned: True = solo asignados, False = solo sin asignar, None = todos
+            assign_to: Filtrar por operador
+        """
+        try:
+            query = SplynxTicketMirror.query.filter(
+                SplynxTicketMirror.group_id == str(group_id),
+                SplynxTicketMirror.closed == False
+            )
+            if assigned is True:
+                query = query.filter(SplynxTicketMirror.assign_to != 0)
+            elif assigned is False:
+                query = query.filter(SplynxTicketMirror.assign_to == 0)
+            if assign_to is not None:
+                query = query.filter(SplynxTicketMirror.assign_to == int(assign_to))
+
+            return [row.to_splynx_dict() for row in query.order_by(SplynxTicketMirror.created_at).all()]
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Error leyendo espejo de tickets Splynx: {str(e)}")
+            return []
+
+    @staticmethod
+    def update_assignment(ticket_id: str, assign_to: int, group_id: str) -> bool:
+        """
+        Write-through: refleja en el espejo una asignación hecha en Splynx.
+
+        Si el ticket todavía no está en el espejo se inserta como abierto del
+        grupo; el próximo delta o la pasada completa completan el resto de los campos.
+        """
+        try:
+            now = datetime.now()
+            row = db.session.get(SplynxTicketMirror, str(ticket_id))
+            if row is None:
+                row = SplynxTicketMirror(
+                    ticket_id=str(ticket_id),
+                    group_id=str(group_id),
+                    status_id='1',
+                    closed=False,
+                    created_at=now.replace(microsecond=0)
+                )
+                db.session.add(row)
+            row.assign_to = _to_int(assign_to)
+            row.updated_at = now.replace(microsecond=0)
+            row.synced_at = now
+            db.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"❌ Error actualizando asignación en espejo (ticket {ticket_id}): {str(e)}")
+            return False
+
+    @staticmethod
+    def count_by_operator(group_id: str) -> Dict[int, int]:
+        """Cantidad de tickets abiertos por operador (0 = sin asignar)"""
+        try:
+            rows = db.session.query(
+                SplynxTicketMirror.assign_to, func.count(SplynxTicketMirror.ticket_id)
+            ).filter(
+                SplynxTicketMirror.group_id == str(group_id),
+                SplynxTicketMirror.closed == False
+            ).group_by(SplynxTicketMirror.assign_to).all()
+            return {int(assign_to or 0): count for assign_to, count in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Error contando tickets del espejo: {str(e)}")
+            return {}
@@ -1,10 +1,12 @@
 """Repository interfaces for incoming webhook data."""
 
-from typing import List, Optional
-from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.exc import InterfaceError, OperationalError, ProgrammingError, SQLAlchemyError
 
 from app.utils.config import db
-from app.models.models import HookNuevoTicket, HookCierreTicket
+from app.models.models import HookNuevoTicket, HookCierreTicket, HookSplynxEvent
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,21 +15,28 @@ logger = get_logger(__name__)
 class HookNuevoTicketInterface:
     """Repository for HookNuevoTicket model."""
 
+    @staticmethod
+    def build(data: dict, received_at: Optional[datetime] = None, journal_id: Optional[str] = None) -> HookNuevoTicket:
+        """Build an unsaved record from a normalized payload."""
+        return HookNuevoTicket(
+            nombre_empresa=data.get('nombre_empresa'),
+            numero_ticket=data.get('numero_ticket'),
+            fecha_creado=data.get('fecha_creado'),
+            departamento=data.get('departamento'),
+            canal_entrada=data.get('canal_entrada'),
+            motivo_contacto=data.get('motivo_contacto'),
+            numero_cliente=data.get('numero_cliente'),
+            numero_whatsapp=data.get('numero_whatsapp'),
+            nombre_usuario=data.get('nombre_usuario'),
+            received_at=received_at or datetime.now(),
+            journal_id=journal_id,
+        )
+
     @staticmethod
     def create(data: dict) -> Optional[HookNuevoTicket]:
         """Save a new-ticket webhook payload to the database."""
         try:
-            record = HookNuevoTicket(
-                nombre_empresa=data.get('nombre_empresa'),
-                numero_ticket=data.get('numero_ticket'),
-                fecha_creado=data.get('fecha_creado'),
-                departamento=data.get('departamento'),
-                canal_entrada=data.get('canal_entrada'),
-                motivo_contacto=data.get('motivo_contacto'),
-                numero_cliente=data.get('numero_cliente'),
-                numero_whatsapp=data.get('numero_whatsapp'),
-                nombre_usuario=data.get('nombre_usuario'),
-            )
+            record = HookNuevoTicketInterface.build(data)
             db.session.add(record)
             db.session.commit()
             return record
@@ -74,31 +83,56 @@ class HookNuevoTicketInterface:
             return False
 
 
+    @staticmethod
+    def mark_processed_bulk(record_ids: List[int]) -> int:
+        """Mark several webhook records as processed with a single UPDATE; returns rows updated."""
+        if not record_ids:
+            return 0
+        try:
+            updated = HookNuevoTicket.query.filter(HookNuevoTicket.id.in_(list(record_ids))).update(
+                {HookNuevoTicket.processed: True, HookNuevoTicket.processed_at: datetime.now()},
+                synchronize_session=False
+            )
+            db.session.commit()
+            return updated
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error marking {len(record_ids)} HookNuevoTicket records as processed: {e}")
+            return 0
+
+
 class HookCierreTicketInterface:
     """Repository for HookCierreTicket model."""
 
+    @staticmethod
+    def build(data: dict, received_at: Optional[datetime] = None, journal_id: Optional[str] = None) -> HookCierreTicket:
+        """Build an unsaved record from a normalized payload."""
+        return HookCierreTicket(
+            nombre_empresa=data.get('nombre_empresa'),
+            numero_ticket=data.get('numero_ticket'),
+            fecha_creado=data.get('fecha_creado'),
+            fecha_cerrado=data.get('fecha_cerrado'),
+            asignado=data.get('asignado'),
+            descripcion_cierre=data.get('descripcion_cierre'),
+            motivo=data.get('motivo'),
+            tiempo_vida_ticket=data.get('tiempo_vida_ticket'),
+            tiempo_trabajo_real=data.get('tiempo_trabajo_real'),
+            tiempo_reaccion=data.get('tiempo_reaccion'),
+            departamento=data.get('departamento'),
+            canal_entrada=data.get('canal_entrada'),
+            motivo_contacto=data.get('motivo_contacto'),
+            numero_cliente=data.get('numero_cliente'),
+            numero_whatsapp=data.get('numero_whatsapp'),
+            nombre_usuario=data.get('nombre_usuario'),
+            received_at=received_at or datetime.now(),
+            journal_id=journal_id,
+        )
+
     @staticmethod
     def create(data: dict) -> Optional[HookCierreTicket]:
         """Save a ticket-closure webhook payload to the database."""
         try:
-            record = HookCierreTicket(
-                nombre_empresa=data.get('nombre_empresa'),
-                numero_ticket=data.get('numero_ticket'),
-                fecha_creado=data.get('fecha_creado'),
-                fecha_cerrado=data.get('fecha_cerrado'),
-                asignado=data.get('asignado'),
-                descripcion_cierre=data.get('descripcion_cierre'),
-                motivo=data.get('motivo'),
-                tiempo_vida_ticket=data.get('tiempo_vida_ticket'),
-                tiempo_trabajo_real=data.get('tiempo_trabajo_real'),
-                tiempo_reaccion=data.get('tiempo_reaccion'),
-                departamento=data.get('departamento'),
-                canal_entrada=data.get('canal_entrada'),
-                motivo_contacto=data.get('motivo_contacto'),
-                numero_cliente=data.get('numero_cliente'),
-                numero_whatsapp=data.get('numero_whatsapp'),
-                nombre_usuario=data.get('nombre_usuario'),
-            )
+            record = HookCierreTicketInterface.build(data)
             db.session.add(record)
             db.session.commit()
             return record
@@ -122,3 +156,187 @@ class HookCierreTicketInterface:
         except SQLAlchemyError as e:
             logger.error(f"Error finding HookCierreTicket by numero_ticket {numero_ticket}: {e}")
             return None
+
+    @staticmethod
+    def get_closed_numeros(numeros) -> set:
+        """Return, in one query, which of the given GR ticket numbers have a closure webhook."""
+        numeros = {n for n in numeros if n}
+        if not numeros:
+            return set()
+        try:
+            rows = db.session.query(HookCierreTicket.numero_ticket).filter(
+                HookCierreTicket.numero_ticket.in_(numeros)
+            ).distinct().all()
+            return {row[0] for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting closed GR ticket numbers: {e}")
+            return set()
+
+
+class HookSplynxEventInterface:
+    """Repository for HookSplynxEvent model."""
+
+    @staticmethod
+    def create(event_type: str, ticket_id: Optional[str], payload: str) -> Optional[HookSplynxEvent]:
+        """Save a Splynx ticket event to the database."""
+        try:
+            record = HookSplynxEvent(
+                event_type=event_type,
+                ticket_id=ticket_id,
+                payload=payload,
+                processed=False,
+            )
+            db.session.add(record)
+            db.session.commit()
+            return record
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error saving HookSplynxEvent: {e}")
+            return None
+
+    @staticmethod
+    def get_unprocessed(limit: int = 500) -> List[HookSplynxEvent]:
+        """
+        Return unprocessed Splynx events, oldest first.
+
+        Events waiting for a retry are skipped until their next_retry_at and,
+        once due, go after fresh events so a backlog of retries cannot starve them.
+        """
+        try:
+            now = datetime.now()
+            return HookSplynxEvent.query.filter(
+                HookSplynxEvent.processed.is_(False),
+                or_(HookSplynxEvent.next_retry_at.is_(None), HookSplynxEvent.next_retry_at <= now)
+            ).order_by(
+                HookSplynxEvent.next_retry_at.isnot(None), HookSplynxEvent.id.asc()
+            ).limit(limit).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting unprocessed HookSplynxEvent: {e}")
+            return []
+
+    @staticmethod
+    def schedule_retry(records: List[HookSplynxEvent], minutes: int) -> bool:
+        """Leave Splynx events pending but out of get_unprocessed() for `minutes` minutes."""
+        if not records:
+            return True
+        try:
+            next_retry_at = datetime.now() + timedelta(minutes=minutes)
+            HookSplynxEvent.query.filter(
+                HookSplynxEvent.id.in_([record.id for record in records])
+            ).update({HookSplynxEvent.next_retry_at: next_retry_at}, synchronize_session=False)
+            db.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error scheduling retry for {len(records)} HookSplynxEvent: {e}")
+            return False
+
+    @staticmethod
+    def mark_processed(record: HookSplynxEvent, error_message: Optional[str] = None) -> bool:
+        """Mark a Splynx event as processed, optionally recording why it failed."""
+        try:
+            record.processed = True
+            record.processed_at = datetime.now()
+            record.error_message = error_message[:500] if error_message else None
+            db.session.commit()
+            return True
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error marking HookSplynxEvent {record.id} as processed: {e}")
+            return False
+
+    @staticmethod
+    def received_since(minutes: int) -> bool:
+        """True if Splynx sent at least one event in the last `minutes` minutes."""
+        try:
+            last = HookSplynxEvent.query.order_by(HookSplynxEvent.id.desc()).first()
+            return bool(last and last.created_at and last.created_at >= datetime.now() - timedelta(minutes=minutes))
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading last HookSplynxEvent: {e}")
+            return False
+
+
+class WebhookJournalInterface:
+    """Batch persistence for webhook payloads replayed from the local journal."""
+
+    MODELS = {'nuevo': (HookNuevoTicket, HookNuevoTicketInterface), 'cierre': (HookCierreTicket, HookCierreTicketInterface)}
+
+    @staticmethod
+    def insert_batch(entries: List[dict]) -> Optional[list]:
+        """
+        Insert journal entries ({'id', 'kind', 'data', 'received_at'}) in one transaction.
+
+        Returns the saved records in entry order, or None if the batch was rolled back.
+        """
+        try:
+            records = [
+                WebhookJournalInterface.MODELS[entry['kind']][1].build(entry['data'], entry['received_at'], entry.get('id'))
+                for entry in entries
+            ]
+            db.session.add_all(records)
+            db.session.commit()
+            return records
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error inserting {len(entries)} journaled webhooks: {e}")
+            return None
+
+    @staticmethod
+    def insert_each(entries: List[dict]) -> Tuple[list, list, list]:
+        """
+        Insert journal entries one transaction per row, after insert_batch failed.
+
+        Returns:
+            (saved, rejected, retry): saved is [(entry, record)], rejected is
+            [(entry, error)] for rows the database refuses (bad data) and retry
+            holds the entries that failed for a transient reason (connection,
+            missing table) and should stay in the journal.
+        """
+        saved, rejected, retry = [], [], []
+        for entry in entries:
+            try:
+                record = WebhookJournalInterface.MODELS[entry['kind']][1].build(entry['data'], entry['received_at'], entry.get('id'))
+                db.session.add(record)
+                db.session.commit()
+                saved.append((entry, record))
+            except (OperationalError, InterfaceError, ProgrammingError) as e:
+                db.session.rollback()
+                logger.error(f"Error inserting journaled webhook, will retry: {e}")
+                retry.append(entry)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Journaled webhook rejected by the database: {e}")
+                rejected.append((entry, str(e)))
+        return saved, rejected, retry
+
+    @staticmethod
+    def existing_ids(journal_ids) -> set:
+        """Journal entry ids already saved, to skip them on replay."""
+        journal_ids = {jid for jid in journal_ids if jid}
+        ids = set()
+        if not journal_ids:
+            return ids
+        try:
+            for model, _ in WebhookJournalInterface.MODELS.values():
+                rows = db.session.query(model.journal_id).filter(model.journal_id.in_(journal_ids)).all()
+                ids.update(row[0] for row in rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Error checking journaled webhooks already saved: {e}")
+        return ids
+
+    @staticmethod
+    def existing_keys(entries: List[dict]) -> set:
+        """(kind, numero_ticket, received_at) of saved entries, for journal lines written without an id."""
+        keys = set()
+        try:
+            for kind, (model, _) in WebhookJournalInterface.MODELS.items():
+                numeros = {e['data'].get('numero_ticket') for e in entries if e['kind'] == kind}
+                if not numeros:
+                    continue
+                rows = db.session.query(model.numero_ticket, model.received_at).filter(
+                    model.numero_ticket.in_(numeros)
+                ).all()
+                keys.update((kind, numero, received_at) for numero, received_at in rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Error checking journaled webhooks already saved: {e}")
+        return keys
@@ -14,7 +14,7 @@ class IncidentsDetection(db.Model):
     Cliente_Nombre = db.Column(db.String(200))
     Asunto = db.Column(db.String(150))
     Fecha_Creacion = db.Column(db.String(100),unique=True)
-    Ticket_ID = db.Column(db.Text)
+    Ticket_ID = db.Column(db.String(32), unique=True, index=True)  # ID del ticket en Splynx
     Estado = db.Column(db.String(100))
     Prioridad = db.Column(db.String(1000))
     is_created_splynx = db.Column(db.Boolean)
@@ -335,6 +335,7 @@ class HookNuevoTicket(db.Model):
     numero_whatsapp = db.Column(db.String(50))
     nombre_usuario = db.Column(db.String(200))
     received_at = db.Column(db.DateTime, default=datetime.now)
+    journal_id = db.Column(db.String(32), unique=True, nullable=True)  # id de la línea del journal (modo journal)
     processed = db.Column(db.Boolean, default=False, index=True)
     processed_at = db.Column(db.DateTime, nullable=True)
 
@@ -365,7 +366,7 @@ class HookCierreTicket(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     nombre_empresa = db.Column(db.String(200))
-    numero_ticket = db.Column(db.Integer)
+    numero_ticket = db.Column(db.Integer, index=True)
     fecha_creado = db.Column(db.String(50))
     fecha_cerrado = db.Column(db.String(50))
     asignado = db.Column(db.String(200))
@@ -381,6 +382,7 @@ class HookCierreTicket(db.Model):
     numero_whatsapp = db.Column(db.String(50))
     nombre_usuario = db.Column(db.String(200))
     received_at = db.Column(db.DateTime, default=datetime.now)
+    journal_id = db.Column(db.String(32), unique=True, nullable=True)  # id de la línea del journal (modo journal)
 
     def to_dict(self):
         return {
@@ -405,4 +407,120 @@ class HookCierreTicket(db.Model):
         }
 
     def __repr__(self):
-        return f'<HookCierreTicket id: {self.id}, numero_ticket: {self.numero_ticket}>'
\ No newline at end of file
+        return f'<HookCierreTicket id: {self.id}, numero_ticket: {self.numero_ticket}>'
+
+
+class HookSplynxEvent(db.Model):
+    """Almacena cada evento de ticket enviado por Splynx (webhook) para procesarlo en el momento."""
+    __tablename__ = 'hook_splynx_event'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(50))   # created, updated, closed, assigned
+    ticket_id = db.Column(db.String(50))
+    payload = db.Column(db.Text)            # JSON crudo recibido
+    processed = db.Column(db.Boolean, default=False, index=True)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    next_retry_at = db.Column(db.DateTime, nullable=True)  # pendiente de reintento: no se toma antes
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    error_message = db.Column(db.String(500))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'event_type': self.event_type,
+            'ticket_id': self.ticket_id,
+            'processed': self.processed,
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
+            'next_retry_at': self.next_retry_at.isoformat() if self.next_retry_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'error_message': self.error_message,
+        }
+
+    def __repr__(self):
+        return f'<HookSplynxEvent id: {self.id}, event: {self.event_type}, ticket_id: {self.ticket_id}>'
+
+class SplynxTicketMirror(db.Model):
+    """Copia local de los tickets abiertos del grupo de soporte en Splynx (se mantiene con sync incremental)."""
+    __tablename__ = 'splynx_ticket_mirror'
+    __table_args__ = (
+        db.Index('ix_splynx_mirror_group_closed_assign', 'group_id', 'closed', 'assign_to'),
+    )
+
+    ticket_id = db.Column(db.String(32), primary_key=True)  # ID del ticket en Splynx
+    group_id = db.Column(db.String(10))
+    status_id = db.Column(db.String(10))
+    closed = db.Column(db.Boolean, default=False)
+    assign_to = db.Column(db.Integer, default=0)  # 0 = sin asignar
+    customer_id = db.Column(db.String(50))
+    subject = db.Column(db.String(255))
+    priority = db.Column(db.String(20))
+    note = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)  # created_at de Splynx
+    updated_at = db.Column(db.DateTime, index=True)  # updated_at de Splynx
+    synced_at = db.Column(db.DateTime, default=datetime.now)  # Última vez que se escribió la fila
+
+    def to_splynx_dict(self):
+        """Mismo formato que devuelve la API de Splynx (strings), para reutilizar la lógica de los jobs"""
+        fmt = '%Y-%m-%d %H:%M:%S'
+        return {
+            'id': self.ticket_id,
+            'group_id': self.group_id,
+            'status_id': self.status_id,
+            'closed': '1' if self.closed else '0',
+            'assign_to': str(self.assign_to or 0),
+            'customer_id': self.customer_id,
+            'subject': self.subject,
+            'priority': self.priority,
+            'note': self.note,
+            'created_at': self.created_at.strftime(fmt) if self.created_at else '',
+            'updated_at': self.updated_at.strftime(fmt) if self.updated_at else '',
+        }
+
+    def __repr__(self):
+        return f'<SplynxTicketMirror ticket_id: {self.ticket_id}, assign_to: {self.assign_to}>'
+
+
+class JobRun(db.Model):
+    """Registro de cada ejecución de un job (duración, contadores y resultado)."""
+    __tablename__ = 'job_run'
+    __table_args__ = (
+        db.Index('ix_job_run_name_started', 'job_name', 'started_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(64), nullable=False)
+    trigger = db.Column(db.String(20))  # scheduler, manual, deadline
+    host = db.Column(db.String(100))  # hostname:pid del proceso que lo corrió
+    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+    outcome = db.Column(db.String(20))  # success, error, skipped
+    items_processed = db.Column(db.Integer, default=0)
+    splynx_calls = db.Column(db.Integer, default=0)
+    db_statements = db.Column(db.Integer, default=0)
+    whatsapp_sends = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Integer, default=0)
+    error_message = db.Column(db.Text)
+    details = db.Column(JSON)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_name': self.job_name,
+            'trigger': self.trigger,
+            'host': self.host,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_ms': self.duration_ms,
+            'outcome': self.outcome,
+            'items_processed': self.items_processed,
+            'splynx_calls': self.splynx_calls,
+            'db_statements': self.db_statements,
+            'whatsapp_sends': self.whatsapp_sends,
+            'errors': self.errors,
+            'error_message': self.error_message,
+            'details': self.details,
+        }
+
+    def __repr__(self):
+        return f'<JobRun id: {self.id}, job_name: {self.job_name}, outcome: {self.outcome}>'
@@ -9,7 +9,8 @@ from app.interface.interfaces import (
     SystemConfigInterface,
     AuditLogInterface,
     AssignmentTrackerInterface,
-    TicketResponseMetricsInterface
+    TicketResponseMetricsInterface,
+    IncidentsInterface
 )
 from app.interface.message_templates import MessageTemplateInterface
 from app.utils.logger import get_logger
@@ -18,6 +19,7 @@ import pytz
 from sqlalchemy import func
 from app.utils.config import db
 from app.models.models import IncidentsDetection
+from app.utils.shift_triggers import shift_triggers, CONFIG_KEYS as SHIFT_CONFIG_KEYS
 
 logger = get_logger(__name__)
 
@@ -41,7 +43,7 @@ def log_audit(action: str, entity_type: str, entity_id: str = None,
             entity_id=entity_id,
             old_value=old_value,
             new_value=new_value,
-            performed_by=request.json.get('performed_by', 'admin') if request.json else 'admin',
+            performed_by=(request.get_json(silent=True) or {}).get('performed_by', 'admin'),
             ip_address=get_client_ip(),
             notes=notes
         )
@@ -362,6 +364,7 @@ def create_operator():
         
         operator = OperatorConfigInterface.create(data)
         if operator:
+            shift_triggers.request_rebuild()
             log_audit(
                 action='create_operator',
                 entity_type='operator',
@@ -396,6 +399,7 @@ def create_schedule():
         
         schedule = OperatorScheduleInterface.create(data)
         if schedule:
+            shift_triggers.request_rebuild()
             log_audit(
                 action='create_schedule',
                 entity_type='schedule',
@@ -444,6 +448,7 @@ def update_schedule(schedule_id):
         
         updated = OperatorScheduleInterface.update(schedule_id, data)
         if updated:
+            shift_triggers.request_rebuild()
             log_audit(
                 action='update_schedule',
                 entity_type='schedule',
@@ -490,6 +495,7 @@ def delete_schedule(schedule_id):
         
         success = OperatorScheduleInterface.delete(schedule_id)
         if success:
+            shift_triggers.request_rebuild()
             log_audit(
                 action='delete_schedule',
                 entity_type='schedule',
@@ -667,6 +673,8 @@ def update_config(key):
             # Limpiar caché de configuración para que se lea el nuevo valor
             ConfigHelper.clear_cache()
             logger.info(f"✅ Configuración '{key}' actualizada y caché limpiado")
+            if key in SHIFT_CONFIG_KEYS:
+                shift_triggers.request_rebuild()
             
             log_audit(
                 action='update_config',
@@ -1116,7 +1124,7 @@ def update_ticket_threshold(ticket_id):
         exceeded_threshold = data.get('exceeded_threshold', False)
         
         # Buscar el ticket en incidents_detection
-        incident = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        incident = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not incident:
             return jsonify({
@@ -1160,7 +1168,7 @@ def delete_ticket(ticket_id):
         from app.models.models import IncidentsDetection
         
         # Buscar el ticket
-        ticket = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        ticket = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not ticket:
             return jsonify({
@@ -1239,7 +1247,7 @@ def request_ticket_audit(ticket_id):
         person_id = data.get('person_id')
         
         # Buscar el ticket
-        ticket = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        ticket = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not ticket:
             return jsonify({
@@ -1329,7 +1337,7 @@ def get_audit_tickets():
 def mark_audit_notified(ticket_id):
     """Mark that admin has been notified about audit request."""
     try:
-        ticket = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        ticket = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not ticket:
             return jsonify({
@@ -1361,7 +1369,7 @@ def approve_audit(ticket_id):
         from datetime import datetime
         from flask import session
         
-        ticket = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        ticket = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not ticket:
             return jsonify({
@@ -1412,7 +1420,7 @@ def reject_audit(ticket_id):
         from datetime import datetime
         from flask import session
         
-        ticket = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        ticket = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not ticket:
             return jsonify({
@@ -1456,7 +1464,7 @@ def reject_audit(ticket_id):
 def delete_audit(ticket_id):
     """Oculta ticket de auditoría - Requiere que esté aprobado o rechazado previamente."""
     try:
-        ticket = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
+        ticket = IncidentsInterface.find_by_ticket_id(ticket_id)
         
         if not ticket:
             return jsonify({
@@ -1500,3 +1508,162 @@ def delete_audit(ticket_id):
             'success': False,
             'error': str(e)
         }), 500
+
+
+@admin_bp.route('/splynx/stats', methods=['GET'])
+def get_splynx_client_stats():
+    """Estadísticas del cliente HTTP de Splynx (pool de conexiones keep-alive)."""
+    try:
+        from app.services.splynx_services_singleton import SplynxServicesSingleton
+
+        # No forzar login si el cliente todavía no fue inicializado
+        splynx = SplynxServicesSingleton._instance
+        if splynx is None or not getattr(splynx, '_initialized', False):
+            return jsonify({
+                'success': True,
+                'initialized': False,
+                'stats': {}
+            }), 200
+
+        return jsonify({
+            'success': True,
+            'initialized': True,
+            'stats': {
+                'pool': splynx.get_pool_stats(),
+                'customer_cache': splynx.customer_cache.stats(),
+                'token': splynx.get_token_stats(),
+                'governor': splynx.governor.stats(),
+                'circuit_breaker': splynx.breaker.stats(),
+                'get_coalescing': splynx.get_coalesce_stats()
+            }
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting Splynx client stats: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/splynx/customer-cache/flush', methods=['POST'])
+def flush_splynx_customer_cache():
+    """Vacía la caché de clientes de Splynx (todos o uno con ?customer_id=)."""
+    try:
+        from app.services.splynx_services_singleton import SplynxServicesSingleton
+
+        splynx = SplynxServicesSingleton._instance
+        if splynx is None or not getattr(splynx, '_initialized', False):
+            return jsonify({
+                'success': True,
+                'flushed': 0,
+                'message': 'Splynx client not initialized'
+            }), 200
+
+        customer_id = request.args.get('customer_id')
+        if customer_id:
+            flushed = 1 if splynx.customer_cache.invalidate(str(customer_id)) else 0
+        else:
+            flushed = splynx.customer_cache.clear()
+
+        log_audit(
+            action='flush_cache',
+            entity_type='splynx_customer_cache',
+            entity_id=customer_id,
+            new_value={'flushed': flushed},
+            notes='Flush Splynx customer cache'
+        )
+
+        return jsonify({
+            'success': True,
+            'flushed': flushed
+        }), 200
+    except Exception as e:
+        logger.error(f"Error flushing Splynx customer cache: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/splynx/mirror', methods=['GET'])
+def get_splynx_ticket_mirror():
+    """Tickets abiertos del grupo de soporte desde el espejo local (sin llamar a Splynx)."""
+    try:
+        from app.interface.splynx_ticket_mirror import SplynxTicketMirrorInterface
+        from app.utils.sync_ticket_mirror import WATERMARK_NAME, mirror_is_usable
+        from app.utils.sync_watermark import SyncWatermark
+        from app.utils.constants import SPLYNX_SUPPORT_GROUP_ID
+
+        assign_to = request.args.get('assign_to', type=int)
+        assigned = request.args.get('assigned')
+        if assigned is not None:
+            assigned = assigned.lower() in ('true', '1', 'yes')
+
+        tickets = SplynxTicketMirrorInterface.get_open(
+            SPLYNX_SUPPORT_GROUP_ID, assigned=assigned, assign_to=assign_to
+        )
+        age = SyncWatermark.seconds_since_sync(WATERMARK_NAME)
+
+        return jsonify({
+            'success': True,
+            'fresh': mirror_is_usable(),
+            'age_seconds': int(age) if age is not None else None,
+            'by_operator': SplynxTicketMirrorInterface.count_by_operator(SPLYNX_SUPPORT_GROUP_ID),
+            'total': len(tickets),
+            'tickets': tickets
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting Splynx ticket mirror: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/jobs/runs', methods=['GET'])
+def get_job_runs():
+    """Últimas ejecuciones de jobs (?job_name=, ?outcome=, ?limit=)."""
+    try:
+        from app.interface.job_runs import JobRunInterface
+
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        runs = JobRunInterface.get_recent(
+            job_name=request.args.get('job_name'),
+            outcome=request.args.get('outcome'),
+            limit=limit
+        )
+        return jsonify({
+            'success': True,
+            'runs': [run.to_dict() for run in runs],
+            'total': len(runs)
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting job runs: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/jobs/stats', methods=['GET'])
+def get_job_run_stats():
+    """Duración p50/p95 y contadores por job (?hours=24, ?job_name=, ?bucket=hour|day para tendencia)."""
+    try:
+        from app.interface.job_runs import JobRunInterface, MAX_STATS_HOURS
+
+        hours = min(max(request.args.get('hours', 24, type=int), 1), MAX_STATS_HOURS)
+        return jsonify({
+            'success': True,
+            'hours': hours,
+            'stats': JobRunInterface.get_stats(
+                hours=hours,
+                job_name=request.args.get('job_name'),
+                bucket=request.args.get('bucket')
+            )
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting job run stats: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
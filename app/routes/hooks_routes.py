@@ -4,8 +4,16 @@ Recibe payloads desde Suricata y los persiste en BD.
 Normaliza los nombres de campos del webhook (con espacios) a snake_case del modelo.
 """
 
-from flask import Blueprint, request, jsonify
-from app.interface.webhook_interface import HookNuevoTicketInterface, HookCierreTicketInterface
+import json
+import time
+
+from flask import Blueprint, current_app, request, jsonify
+from app.interface.webhook_interface import HookNuevoTicketInterface, HookCierreTicketInterface, HookSplynxEventInterface
+from app.services.splynx_event_processor import parse_splynx_event
+from app.services.ticket_pipeline import ticket_pipeline
+from app.services.webhook_journal import webhook_journal
+from app.utils.config_helper import ConfigHelper
+from app.utils.job_executor import submit_job
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -60,18 +68,31 @@ def normalize_payload(raw_data: dict, field_map: dict) -> dict:
     return normalized
 
 
+def _journal(kind: str, normalized: dict, received_at: float = None) -> bool:
+    """Con WEBHOOK_INGEST_MODE='journal' deja el payload en el journal local; False = guardar directo"""
+    if ConfigHelper.get_webhook_ingest_mode() != 'journal':
+        return False
+    try:
+        webhook_journal.append(current_app._get_current_object(), kind, normalized, received_at)
+        return True
+    except (OSError, RuntimeError) as e:
+        logger.error(f"[WEBHOOK {kind}] Journal no disponible, guardando directo en BD: {e}")
+        return False
+
+
 @hooks_bp.route('/nuevo-ticket', methods=['POST'])
 def nuevo_ticket():
-    """Recibe payload de nuevo ticket y lo guarda en BD."""
+    """Recibe payload de nuevo ticket, lo guarda en BD (o en el journal) y, con el pipeline activo, lo pasa a Splynx."""
+    received_at = time.monotonic()
     data = request.get_json(silent=True)
-    logger.info(f"[WEBHOOK nuevo-ticket] Content-Type: {request.content_type} | Payload: {data}")
+    logger.debug(f"[WEBHOOK nuevo-ticket] Content-Type: {request.content_type} | Payload: {data}")
     if data is None:
         logger.warning(f"[WEBHOOK nuevo-ticket] Body JSON vacío o Content-Type incorrecto. Raw body: {request.get_data(as_text=True)[:500]}")
         return jsonify({'error': 'Body JSON requerido'}), 400
 
     # Normalizar campos del webhook a snake_case
     normalized = normalize_payload(data, NUEVO_TICKET_FIELD_MAP)
-    logger.info(f"[WEBHOOK nuevo-ticket] Normalizado: {normalized}")
+    logger.debug(f"[WEBHOOK nuevo-ticket] Normalizado: {normalized}")
 
     # Validar campos requeridos
     numero_ticket = normalized.get('numero_ticket')
@@ -88,26 +109,33 @@ def nuevo_ticket():
         logger.warning(f"[WEBHOOK nuevo-ticket] Falta numero_cliente. Payload original: {data}")
         return jsonify({'error': 'Campo numero_cliente es requerido'}), 400
 
+    if _journal('nuevo', normalized, received_at):
+        logger.info(f"[WEBHOOK nuevo-ticket] En journal: numero_ticket={numero_ticket}")
+        return jsonify({'ok': True, 'queued': True}), 200
+
     record = HookNuevoTicketInterface.create(normalized)
     if record is None:
         return jsonify({'error': 'Error al guardar el registro'}), 500
 
     logger.info(f"[WEBHOOK nuevo-ticket] Guardado OK: id={record.id}, numero_ticket={numero_ticket}")
+
+    if ConfigHelper.is_ticket_pipeline_enabled():
+        ticket_pipeline.submit_webhook(current_app._get_current_object(), record.id, received_at)
     return jsonify({'ok': True, 'id': record.id}), 200
 
 
 @hooks_bp.route('/cierre-ticket', methods=['POST'])
 def cierre_ticket():
-    """Recibe payload de cierre de ticket y lo guarda en BD."""
+    """Recibe payload de cierre de ticket y lo guarda en BD (o en el journal)."""
     data = request.get_json(silent=True)
-    logger.info(f"[WEBHOOK cierre-ticket] Content-Type: {request.content_type} | Payload: {data}")
+    logger.debug(f"[WEBHOOK cierre-ticket] Content-Type: {request.content_type} | Payload: {data}")
     if data is None:
         logger.warning(f"[WEBHOOK cierre-ticket] Body JSON vacío o Content-Type incorrecto. Raw body: {request.get_data(as_text=True)[:500]}")
         return jsonify({'error': 'Body JSON requerido'}), 400
 
     # Normalizar campos del webhook a snake_case
     normalized = normalize_payload(data, CIERRE_TICKET_FIELD_MAP)
-    logger.info(f"[WEBHOOK cierre-ticket] Normalizado: {normalized}")
+    logger.debug(f"[WEBHOOK cierre-ticket] Normalizado: {normalized}")
 
     # Validar campos requeridos
     numero_ticket = normalized.get('numero_ticket')
@@ -120,9 +148,35 @@ def cierre_ticket():
         logger.warning(f"[WEBHOOK cierre-ticket] numero_ticket no numérico: {numero_ticket}")
         return jsonify({'error': 'Campo numero_ticket debe ser numérico'}), 400
 
+    if _journal('cierre', normalized):
+        logger.info(f"[WEBHOOK cierre-ticket] En journal: numero_ticket={normalized.get('numero_ticket')}")
+        return jsonify({'ok': True, 'queued': True}), 200
+
     record = HookCierreTicketInterface.create(normalized)
     if record is None:
         return jsonify({'error': 'Error al guardar el registro'}), 500
 
     logger.info(f"[WEBHOOK cierre-ticket] Guardado OK: id={record.id}, numero_ticket={normalized.get('numero_ticket')}")
     return jsonify({'ok': True, 'id': record.id}), 200
+
+
+@hooks_bp.route('/splynx-event', methods=['POST'])
+def splynx_event():
+    """Recibe un evento de ticket de Splynx, lo guarda en BD y dispara su procesamiento."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        logger.warning(f"[WEBHOOK splynx-event] Body JSON vacío o Content-Type incorrecto. Raw body: {request.get_data(as_text=True)[:500]}")
+        return jsonify({'error': 'Body JSON requerido'}), 400
+
+    event_type, ticket_id, _ = parse_splynx_event(data)
+    if not ticket_id:
+        logger.warning(f"[WEBHOOK splynx-event] Evento sin ID de ticket: {str(data)[:500]}")
+        return jsonify({'error': 'ID de ticket requerido'}), 400
+
+    record = HookSplynxEventInterface.create(event_type, ticket_id, json.dumps(data))
+    if record is None:
+        return jsonify({'error': 'Error al guardar el registro'}), 500
+
+    logger.info(f"[WEBHOOK splynx-event] Guardado OK: id={record.id}, evento={event_type}, ticket={ticket_id}")
+    submit_job(current_app._get_current_object(), 'process_splynx_events', 'webhook')
+    return jsonify({'ok': True, 'id': record.id}), 200
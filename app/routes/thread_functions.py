@@ -44,12 +44,12 @@ def thread_process_webhooks(app):
             # Step 2: Create tickets in Splynx for new incidents
             sp = get_splynx_service()
             tk = TicketManager(sp)
-            tk.create_ticket()
+            created = tk.create_ticket()
             logger.info("Tickets creados en Splynx exitosamente")
-            return True
+            return {**result, "success": True, "tickets_creados": len(created or [])}
         except Exception as e:
             logger.error(f"Error en thread_process_webhooks: {str(e)}")
-            return False
+            return {"success": False, "error": str(e)}
 
 
 def thread_create_tickets(app):
@@ -62,12 +62,12 @@ def thread_create_tickets(app):
         tk = TicketManager(sp)
 
         try:
-            tk.create_ticket()
+            created = tk.create_ticket()
             logger.info("✅ Tickets creados exitosamente")
-            return True
+            return {"success": True, "tickets_creados": len(created or [])}
         except Exception as e:
             logger.error(f"❌ Error al crear tickets: {str(e)}")
-            return False
+            return {"success": False, "error": str(e)}
 
 
 def thread_assign_unassigned_tickets(app):
@@ -121,14 +121,18 @@ def thread_alert_overdue_tickets(app):
 def thread_end_of_shift_notifications(app):
     """
     Versión para hilos de end_of_shift_notifications.
-    Envía resumen 1 hora antes del fin de turno.
+    Envía resumen 1 hora antes del fin de turno. Si lo disparó un trigger de
+    turno, solo a los operadores de ese trigger.
     """
+    from app.utils.shift_triggers import shift_triggers
+
+    person_ids = shift_triggers.take_pending_summaries()
     with app.app_context():
         sp = get_splynx_service()
         tk = TicketManager(sp)
 
         try:
-            resultado = tk.send_end_of_shift_notifications()
+            resultado = tk.send_end_of_shift_notifications(person_ids=person_ids or None)
             logger.info(f"✅ Notificaciones de fin de turno: {resultado['operadores_notificados']} operadores notificados")
             return resultado
         except Exception as e:
@@ -162,3 +166,155 @@ def thread_auto_unassign_after_shift(app):
                 "errores": 1,
                 "error": str(e)
             }
+
+
+def thread_auto_unassign_after_shift_if_enabled(app):
+    """
+    Igual que thread_auto_unassign_after_shift pero respeta
+    AUTO_UNASSIGN_AFTER_SHIFT_ENABLED (usado por el scheduler).
+    """
+    with app.app_context():
+        from app.utils.config_helper import ConfigHelper
+        if not ConfigHelper.is_auto_unassign_enabled():
+            logger.info("⏭️ Desasignación automática deshabilitada (AUTO_UNASSIGN_AFTER_SHIFT_ENABLED=false)")
+            return {"skipped": "auto_unassign_disabled"}
+    return thread_auto_unassign_after_shift(app)
+
+
+def thread_sync_tickets_status(app):
+    """
+    Sincroniza el estado de tickets abiertos con Splynx.
+    """
+    with app.app_context():
+        from app.utils.sync_tickets_status import sync_tickets_status
+        result = sync_tickets_status()
+        logger.info(f"Sincronización completada: {result}")
+        return result
+
+
+def thread_sync_ticket_mirror(app):
+    """
+    Sincroniza el espejo local de tickets abiertos de Splynx.
+    """
+    with app.app_context():
+        from app.utils.sync_ticket_mirror import sync_ticket_mirror
+        result = sync_ticket_mirror()
+        logger.debug(f"🪞 Sync espejo Splynx resultado: {result}")
+        return result
+
+
+def thread_import_existing_tickets(app):
+    """
+    Importa tickets existentes del grupo 4 de Splynx a la BD.
+    """
+    with app.app_context():
+        from app.utils.import_existing_tickets import import_existing_tickets_from_splynx
+        result = import_existing_tickets_from_splynx()
+        logger.info(f"Importación completada: {result}")
+        return result
+
+
+def thread_process_splynx_events(app):
+    """
+    Aplica los eventos de tickets enviados por Splynx (hook_splynx_event).
+    Si llegaron tickets creados que todavía no están en la BD, dispara la importación.
+    """
+    with app.app_context():
+        from app.services.splynx_event_processor import process_pending_splynx_events
+        result = process_pending_splynx_events()
+
+    if result.get('unknown_created'):
+        from app.utils.job_executor import submit_job
+        submit_job(app, 'import_existing_tickets', 'splynx_event')
+    return result
+
+
+def thread_ticket_reopen_checker(app):
+    """
+    Verifica tickets en ventana de reapertura y reabre si no hay cierre de GR.
+    """
+    with app.app_context():
+        from app.services.ticket_reopen_checker import check_and_reopen_tickets
+        result = check_and_reopen_tickets()
+        logger.info(f"🔍 Reopen checker resultado: {result}")
+        return result
+
+
+def thread_reset_assignment_counters(app):
+    """
+    Resetea los contadores de asignación al inicio de un turno.
+
+    Lo dispara el trigger cron de app.utils.shift_triggers a cada hora de
+    ASSIGNMENT_RESET_HOURS (system_config, CSV de horas, ej: "8,16").
+    """
+    from datetime import datetime
+    import pytz
+
+    with app.app_context():
+        from app.interface.interfaces import AssignmentTrackerInterface
+
+        tz_argentina = pytz.timezone('America/Argentina/Buenos_Aires')
+        now = datetime.now(tz_argentina)
+
+        logger.info("=" * 60)
+        logger.info(f"⚖️ RESET DE CONTADORES DE ASIGNACIÓN - Turno {now.hour}:00")
+
+        success = AssignmentTrackerInterface.reset_all_counts()
+        if success:
+            logger.info(f"⚖️ Contadores de asignación reseteados (turno {now.hour}:00)")
+        else:
+            logger.error(f"❌ Error al resetear contadores de asignación (turno {now.hour}:00)")
+
+        logger.info("=" * 60)
+        return {"reset": bool(success), "shift_hour": now.hour}
+
+
+def thread_alert_due_tickets(app):
+    """
+    Revisa solo los tickets cuyo vencimiento de alerta llegó (cola de vencimientos).
+    """
+    from app.services.alert_deadlines import deadline_queue
+
+    ticket_ids = deadline_queue.take_due()
+    if not ticket_ids:
+        return {"tickets_vencidos": 0, "total_tickets_revisados": 0}
+
+    with app.app_context():
+        sp = get_splynx_service()
+        tk = TicketManager(sp)
+
+        try:
+            resultado = tk.check_and_alert_overdue_tickets(only_ticket_ids=ticket_ids)
+        except Exception as e:
+            logger.error(f"❌ Error al alertar tickets por vencimiento: {str(e)}")
+            deadline_queue.retry(ticket_ids)
+            return {
+                "total_tickets_revisados": 0,
+                "tickets_vencidos": 0,
+                "alertas_enviadas": 0,
+                "errores": 1,
+                "error": str(e)
+            }
+
+        # Sin revisión real (lock ocupado, circuito abierto o error): no perder los vencidos
+        if resultado.get("skipped") or resultado.get("error"):
+            logger.warning(f"⏲️ Vencimientos: {len(ticket_ids)} tickets sin revisar ({resultado.get('skipped') or resultado.get('error')}), se reintentan")
+            deadline_queue.retry(ticket_ids)
+            return resultado
+
+        logger.info(f"⏲️ Vencimientos: {len(ticket_ids)} tickets revisados, {resultado['alertas_enviadas']} alertas y {resultado['pre_alertas_enviadas']} pre-alertas enviadas")
+        return resultado
+
+
+def thread_purge_job_runs(app):
+    """
+    Borra del registro de ejecuciones (job_run) las más viejas que JOB_RUN_RETENTION_DAYS.
+    """
+    with app.app_context():
+        from app.utils.config_helper import ConfigHelper
+        from app.interface.job_runs import JobRunInterface
+
+        days = ConfigHelper.get_int('JOB_RUN_RETENTION_DAYS', 30)
+        deleted = JobRunInterface.purge_older_than(days)
+        logger.info(f"🧹 {deleted} ejecuciones de jobs purgadas (retención {days} días)")
+        return {"purged": deleted, "retention_days": days}
@@ -1,14 +1,33 @@
 """Views"""
 
-import threading
 from flask import jsonify, current_app
 from app.routes import blueprint
-from app.routes.thread_functions import thread_process_webhooks, thread_create_tickets, thread_assign_unassigned_tickets, thread_alert_overdue_tickets, thread_end_of_shift_notifications, thread_auto_unassign_after_shift
+from app.utils.job_executor import submit_job, get_executor, REJECTED
+from app.utils.job_registry import get_jobs_stats
+from app.services.alert_deadlines import deadline_queue
+from app.services.ticket_pipeline import ticket_pipeline
+from app.services.webhook_journal import webhook_journal
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _dispatch_job(name, message):
+    """Dispara un job en el pool compartido y arma la respuesta del endpoint"""
+    estado = submit_job(current_app._get_current_object(), name)
+    if estado == REJECTED:
+        return jsonify({
+            "success": False,
+            "error": "Cola de jobs llena, reintentar más tarde",
+            "job": estado
+        }), 503
+    return jsonify({
+        "success": True,
+        "message": message,
+        "job": estado
+    }), 200
+
+
 @blueprint.route("/", methods=["GET"])
 def health_check():
     """Health check endpoint para Docker y monitoreo"""
@@ -23,25 +42,14 @@ def health_check():
 @blueprint.route("/api/tickets/create", methods=["POST"])
 def create_tickets():
     """"""
-    app = current_app._get_current_object()  # Obtiene el objeto real de la aplicación
-    hilo = threading.Thread(target=thread_create_tickets, args=(app,))
-    hilo.start()
-    return jsonify({
-        "success": True,
-    }), 200
+    return _dispatch_job('create_tickets', "Creación de tickets iniciada")
 
 
 @blueprint.route("/api/tickets/process_webhooks", methods=["POST"])
 def process_webhooks():
     """Procesa webhooks pendientes y crea tickets en Splynx"""
     try:
-        app = current_app._get_current_object()
-        hilo = threading.Thread(target=thread_process_webhooks, args=(app,))
-        hilo.start()
-        return jsonify({
-            "success": True,
-            "message": "Procesamiento de webhooks iniciado"
-        }), 200
+        return _dispatch_job('process_webhooks', "Procesamiento de webhooks iniciado")
     except Exception as e:
         logger.error(f"Error en process_webhooks: {str(e)}")
         return jsonify({
@@ -54,12 +62,7 @@ def process_webhooks():
 def assign_unassigned():
     """Asigna tickets no asignados del grupo de Soporte Técnico usando round-robin"""
     try:
-        hilo = threading.Thread(target=thread_assign_unassigned_tickets, args=(current_app._get_current_object(),))
-        hilo.start()
-        return jsonify({
-            "success": True,
-            "message": "Asignación de tickets no asignados iniciada"
-        }), 200
+        return _dispatch_job('assign_unassigned', "Asignación de tickets no asignados iniciada")
     except Exception as e:
         return jsonify({
             "success": False,
@@ -71,12 +74,7 @@ def assign_unassigned():
 def alert_overdue_tickets():
     """Alerta sobre tickets asignados que superen 45 minutos sin respuesta"""
     try:
-        hilo = threading.Thread(target=thread_alert_overdue_tickets, args=(current_app._get_current_object(),))
-        hilo.start()
-        return jsonify({
-            "success": True,
-            "message": "Verificación de tickets vencidos iniciada"
-        }), 200
+        return _dispatch_job('alert_overdue', "Verificación de tickets vencidos iniciada")
     except Exception as e:
         return jsonify({
             "success": False,
@@ -87,12 +85,7 @@ def alert_overdue_tickets():
 def end_of_shift_notifications():
     """Envía notificaciones de resumen 1 hora antes del fin de turno"""
     try:
-        hilo = threading.Thread(target=thread_end_of_shift_notifications, args=(current_app._get_current_object(),))
-        hilo.start()
-        return jsonify({
-            "success": True,
-            "message": "Verificación de notificaciones de fin de turno iniciada"
-        }), 200
+        return _dispatch_job('end_of_shift_notifications', "Verificación de notificaciones de fin de turno iniciada")
     except Exception as e:
         return jsonify({
             "success": False,
@@ -155,11 +148,60 @@ def system_status():
     try:
         from app.utils.system_control import SystemControl
         
+        from app.services.splynx_services_singleton import SplynxServicesSingleton
+        
         status = SystemControl.get_status()
         
+        # Estado del circuit breaker de Splynx (sin forzar login si no se inicializó)
+        splynx = SplynxServicesSingleton._instance
+        breaker = getattr(splynx, 'breaker', None)
+        
+        from app.utils.scheduler import get_scheduler_status
+        
+        return jsonify({
+            "success": True,
+            "status": status,
+            "scheduler": get_scheduler_status(),
+            "splynx": {
+                "initialized": bool(splynx and getattr(splynx, '_initialized', False)),
+                "circuit_breaker": breaker.stats() if breaker else None
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@blueprint.route("/api/system/jobs", methods=["GET"])
+def system_jobs():
+    """Estadísticas en memoria de los jobs de tickets (ejecuciones, duración, errores)"""
+    try:
         return jsonify({
             "success": True,
-            "status": status
+            "jobs": get_jobs_stats(),
+            "executor": get_executor().stats(),
+            "alert_deadlines": deadline_queue.stats()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@blueprint.route("/api/system/pipeline", methods=["GET"])
+def system_pipeline():
+    """Colas y latencias por etapa del pipeline webhook -> Splynx"""
+    try:
+        from app.utils.config_helper import ConfigHelper
+        return jsonify({
+            "success": True,
+            "enabled": ConfigHelper.is_ticket_pipeline_enabled(),
+            "pipeline": ticket_pipeline.stats(),
+            "ingest_mode": ConfigHelper.get_webhook_ingest_mode(),
+            "journal": webhook_journal.stats()
         }), 200
     except Exception as e:
         return jsonify({
@@ -180,12 +222,7 @@ def auto_unassign_after_shift():
                 "skipped": True
             }), 200
 
-        hilo = threading.Thread(target=thread_auto_unassign_after_shift, args=(current_app._get_current_object(),))
-        hilo.start()
-        return jsonify({
-            "success": True,
-            "message": "Verificación de desasignación automática iniciada"
-        }), 200
+        return _dispatch_job('auto_unassign_after_shift', "Verificación de desasignación automática iniciada")
     except Exception as e:
         return jsonify({
             "success": False,
@@ -197,22 +234,7 @@ def auto_unassign_after_shift():
 def sync_tickets_status_endpoint():
     """Sincroniza el estado de tickets abiertos con Splynx"""
     try:
-        from app.utils.sync_tickets_status import sync_tickets_status
-        
-        app = current_app._get_current_object()
-        
-        def run_sync():
-            with app.app_context():
-                result = sync_tickets_status()
-                logger.info(f"Sincronización completada: {result}")
-        
-        hilo = threading.Thread(target=run_sync)
-        hilo.start()
-        
-        return jsonify({
-            "success": True,
-            "message": "Sincronización de estado de tickets iniciada"
-        }), 200
+        return _dispatch_job('sync_tickets_status', "Sincronización de estado de tickets iniciada")
     except Exception as e:
         logger.error(f"Error en endpoint sync_status: {e}")
         return jsonify({
@@ -221,26 +243,24 @@ def sync_tickets_status_endpoint():
         }), 500
 
 
+@blueprint.route("/api/tickets/sync_mirror", methods=["POST"])
+def sync_ticket_mirror_endpoint():
+    """Sincroniza el espejo local de tickets abiertos de Splynx"""
+    try:
+        return _dispatch_job('ticket_mirror_sync', "Sincronización del espejo de tickets iniciada")
+    except Exception as e:
+        logger.error(f"Error en endpoint sync_mirror: {e}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 @blueprint.route("/api/tickets/import_existing", methods=["POST"])
 def import_existing_tickets():
     """Importa tickets existentes del grupo 4 de Splynx a la BD"""
     try:
-        from app.utils.import_existing_tickets import import_existing_tickets_from_splynx
-        
-        app = current_app._get_current_object()
-        
-        def run_import():
-            with app.app_context():
-                result = import_existing_tickets_from_splynx()
-                logger.info(f"Importación completada: {result}")
-        
-        hilo = threading.Thread(target=run_import)
-        hilo.start()
-        
-        return jsonify({
-            "success": True,
-            "message": "Importación de tickets existentes iniciada"
-        }), 200
+        return _dispatch_job('import_existing_tickets', "Importación de tickets existentes iniciada")
     except Exception as e:
         logger.error(f"Error en endpoint import_existing: {e}")
         return jsonify({
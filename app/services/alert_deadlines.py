@@ -0,0 +1,270 @@
+"""
+Cola de vencimientos para alertas de tickets.
+
+En lugar de revisar todos los tickets asignados cada 3 minutos, cada ticket
+queda en un heap con su próximo vencimiento:
+
+- pre-alerta: updated_at + (umbral - TICKET_PRE_ALERT_MINUTES)
+- vencido:    updated_at + umbral (OutHouse: updated_at + OUTHOUSE_NO_ALERT_MINUTES)
+- ya vencido: ahora + TICKET_RENOTIFICATION_INTERVAL_MINUTES (re-alerta)
+
+Un hilo del proceso líder duerme hasta el vencimiento más cercano; al llegar,
+deja los tickets en el conjunto de vencidos y dispara el job 'alert_deadlines',
+que los revisa con check_and_alert_overdue_tickets(only_ticket_ids=...).
+Cuando el espejo de Splynx ve un ticket cambiar, su vencimiento se recalcula.
+El barrido completo sigue corriendo con menor frecuencia como red de seguridad.
+"""
+
+import heapq
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import pytz
+
+from app.utils.constants import OUTHOUSE_STATUS_ID, SPLYNX_SUPPORT_GROUP_ID, TIMEZONE
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Margen para que al disparar el ticket ya haya cruzado el umbral (minutos enteros)
+FIRE_SLACK_SECONDS = 2
+
+# Reintento de tickets vencidos que no se pudieron revisar (lock ocupado, circuito abierto)
+RETRY_DELAY_SECONDS = 30
+
+
+def _to_timestamp(value: str, tz) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return tz.localize(datetime.strptime(value, '%Y-%m-%d %H:%M:%S')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_alertable(ticket: dict) -> bool:
+    return (
+        ticket.get('closed') not in ['1', 1, True, 'true']
+        and str(ticket.get('group_id', SPLYNX_SUPPORT_GROUP_ID)) == str(SPLYNX_SUPPORT_GROUP_ID)
+        and str(ticket.get('assign_to') or '0') not in ('', '0')
+    )
+
+
+class AlertDeadlineQueue:
+    """Heap de próximos vencimientos por ticket con un hilo que despierta al más cercano"""
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._deadlines: Dict[str, float] = {}
+        self._due: Set[str] = set()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._on_due: Optional[Callable[[], None]] = None
+        self._tz = pytz.timezone(TIMEZONE)
+
+        self.threshold_minutes = 60
+        self.pre_alert_minutes = 15
+        self.renotification_minutes = 60
+        self.outhouse_minutes = 120
+
+        self.fired = 0
+        self.rescheduled = 0
+        self.last_fired_at: Optional[datetime] = None
+        self.max_fire_lag: float = 0.0
+
+    # --- configuración -------------------------------------------------
+
+    def load_config(self):
+        """Relee los umbrales de system_config (requiere app context)"""
+        from app.utils.config_helper import ConfigHelper
+        self.threshold_minutes = ConfigHelper.get_ticket_alert_threshold()
+        self.pre_alert_minutes = ConfigHelper.get_pre_alert_minutes()
+        self.renotification_minutes = ConfigHelper.get_renotification_interval()
+        self.outhouse_minutes = ConfigHelper.get_outhouse_no_alert_minutes()
+
+    def next_deadline(self, ticket: dict, now: Optional[float] = None) -> Optional[float]:
+        """
+        Próximo instante (epoch) en que el ticket cruza la pre-alerta o el umbral.
+        None si ya los cruzó a ambos (queda a cargo de la re-notificación).
+        """
+        now = now if now is not None else time.time()
+        updated_at = _to_timestamp(ticket.get('updated_at', ''), self._tz)
+        if updated_at is None:
+            return None
+
+        if str(ticket.get('status_id', '')) == OUTHOUSE_STATUS_ID:
+            candidates = [updated_at + max(self.outhouse_minutes, self.threshold_minutes) * 60]
+        else:
+            candidates = [
+                updated_at + (self.threshold_minutes - self.pre_alert_minutes) * 60,
+                updated_at + self.threshold_minutes * 60,
+            ]
+
+        for deadline in candidates:
+            if deadline + FIRE_SLACK_SECONDS > now:
+                return deadline + FIRE_SLACK_SECONDS
+        return None
+
+    # --- ciclo de vida -------------------------------------------------
+
+    def start(self, on_due: Callable[[], None]):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._on_due = on_due
+        self._thread = threading.Thread(target=self._loop, name='alert-deadlines', daemon=True)
+        self._thread.start()
+        logger.info("⏲️ Cola de vencimientos de alertas iniciada")
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._deadlines.clear()
+            self._due.clear()
+            self._cond.notify_all()
+        logger.info("⏹️ Cola de vencimientos de alertas detenida")
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    # --- programación --------------------------------------------------
+
+    def schedule_tickets(self, tickets: Iterable[dict], full: bool = False, evaluated: bool = False):
+        """
+        Recalcula el vencimiento de los tickets recibidos.
+
+        Args:
+            tickets: Tickets en formato Splynx (los cerrados, sin asignar o de
+                     otro grupo se quitan de la cola)
+            full: Si es True, los tickets de la cola que no vinieron se quitan
+            evaluated: True si los tickets se acaban de revisar para alertar; los
+                       ya vencidos se reprograman a ahora + re-notificación. Si es
+                       False (visto por el espejo) un vencido ya programado conserva
+                       su vencimiento y uno nuevo se revisa de inmediato.
+        """
+        if not self._running:
+            return
+        now = time.time()
+        seen = set()
+        with self._cond:
+            for ticket in tickets:
+                if ticket.get('id') is None:
+                    continue
+                ticket_id = str(ticket['id'])
+                seen.add(ticket_id)
+                if not _is_alertable(ticket):
+                    self._deadlines.pop(ticket_id, None)
+                    continue
+                deadline = self.next_deadline(ticket, now)
+                if deadline is None:
+                    if evaluated:
+                        deadline = now + self.renotification_minutes * 60
+                    elif ticket_id in self._deadlines:
+                        continue
+                    else:
+                        deadline = now
+                if self._deadlines.get(ticket_id) != deadline:
+                    self._deadlines[ticket_id] = deadline
+                    heapq.heappush(self._heap, (deadline, ticket_id))
+                    self.rescheduled += 1
+
+            if full:
+                for ticket_id in list(self._deadlines):
+                    if ticket_id not in seen:
+                        del self._deadlines[ticket_id]
+                # Compactar entradas obsoletas del heap
+                self._heap = [(d, t) for d, t in self._heap if self._deadlines.get(t) == d]
+                heapq.heapify(self._heap)
+
+            self._cond.notify_all()
+
+    def cancel(self, ticket_id):
+        """Quita un ticket de la cola (cerrado o desasignado)"""
+        with self._cond:
+            self._deadlines.pop(str(ticket_id), None)
+            self._due.discard(str(ticket_id))
+
+    def take_due(self) -> Set[str]:
+        """Devuelve y vacía el conjunto de tickets vencidos pendientes de revisar"""
+        with self._cond:
+            due, self._due = self._due, set()
+            return due
+
+    def retry(self, ticket_ids: Iterable[str], delay: float = RETRY_DELAY_SECONDS):
+        """
+        Vuelve a programar tickets tomados con take_due() que no llegaron a revisarse.
+
+        Se reprograman a ahora + delay en lugar de volver al conjunto de vencidos
+        para no disparar en bucle mientras el lock o el circuito sigan ocupados.
+        Si el ticket ya tiene un vencimiento anterior se conserva ese.
+        """
+        if not self._running:
+            return
+        deadline = time.time() + delay
+        with self._cond:
+            for ticket_id in ticket_ids:
+                ticket_id = str(ticket_id)
+                current = self._deadlines.get(ticket_id)
+                if current is not None and current <= deadline:
+                    continue
+                self._deadlines[ticket_id] = deadline
+                heapq.heappush(self._heap, (deadline, ticket_id))
+            self._cond.notify_all()
+
+    def _loop(self):
+        while True:
+            fire = False
+            with self._cond:
+                if not self._running:
+                    return
+                now = time.time()
+                while self._heap:
+                    deadline, ticket_id = self._heap[0]
+                    if self._deadlines.get(ticket_id) != deadline:
+                        heapq.heappop(self._heap)  # entrada reemplazada por una reprogramación
+                        continue
+                    if deadline > now:
+                        break
+                    heapq.heappop(self._heap)
+                    del self._deadlines[ticket_id]
+                    self._due.add(ticket_id)
+                    self.max_fire_lag = max(self.max_fire_lag, now - deadline)
+                    fire = True
+
+                if not fire:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._cond.wait(timeout)
+                    continue
+
+                self.fired += 1
+                self.last_fired_at = datetime.now(self._tz)
+                on_due = self._on_due
+
+            try:
+                on_due()
+            except Exception as e:
+                logger.error(f"❌ Error disparando alertas por vencimiento: {e}")
+
+    def stats(self) -> dict:
+        with self._cond:
+            next_deadline = min(self._deadlines.values()) if self._deadlines else None
+            return {
+                'running': self._running,
+                'scheduled_tickets': len(self._deadlines),
+                'heap_size': len(self._heap),
+                'due_pending': len(self._due),
+                'next_deadline_in_seconds': round(next_deadline - time.time(), 1) if next_deadline else None,
+                'fired': self.fired,
+                'rescheduled': self.rescheduled,
+                'max_fire_lag_seconds': round(self.max_fire_lag, 3),
+                'last_fired_at': self.last_fired_at.isoformat() if self.last_fired_at else None,
+            }
+
+
+deadline_queue = AlertDeadlineQueue()
@@ -4,6 +4,7 @@ Evolution API Service - Handles WhatsApp message sending
 
 import requests
 from typing import Optional, Dict, Any, List
+from app.utils import job_metrics
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,6 +49,7 @@ class EvolutionAPIService:
         }
         
         try:
+            job_metrics.count(job_metrics.WHATSAPP_SENDS)
             response = requests.post(url, headers=self.headers, json=payload, timeout=30)
             response.raise_for_status()
             
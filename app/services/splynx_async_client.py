@@ -0,0 +1,205 @@
+"""
+Asyncio variant of the Splynx client for fan-out jobs.
+Exposes the same method names as SplynxServicesSingleton, awaitable, so a job
+can issue N reads or writes at once and wait roughly the slowest one instead
+of the sum of all latencies.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from flask import current_app, has_app_context
+
+from app.services.splynx_services_singleton import SplynxServicesSingleton
+from app.utils.config_helper import ConfigHelper
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Writes are not abandoned client-side: a timed-out future would leave the PUT
+# running in the worker thread and the caller would report a failure for a
+# change Splynx may still apply. They are bounded by the session's request
+# timeout (_make_request) instead.
+WRITE_METHODS = frozenset({'update_ticket_assignment', 'reopen_ticket', 'create_ticket'})
+
+
+class AsyncSplynxClient:
+    """
+    Awaitable facade over SplynxServicesSingleton with bounded concurrency.
+
+    Calls are executed on the singleton's shared keep-alive pool (token refresh
+    and error handling stay in one place) from a dedicated worker pool. A
+    semaphore caps in-flight calls at `concurrency` and every read gets its own
+    timeout (writes rely on the HTTP request timeout, see WRITE_METHODS).
+    """
+
+    def __init__(self, splynx_service: Optional[SplynxServicesSingleton] = None,
+                 concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Args:
+            splynx_service: Sync client to wrap (defaults to the singleton)
+            concurrency: Max in-flight calls (SPLYNX_ASYNC_CONCURRENCY, default 8)
+            timeout: Per-read timeout in seconds (SPLYNX_ASYNC_TIMEOUT_SECONDS, default 30)
+        """
+        self.splynx = splynx_service or SplynxServicesSingleton()
+        self.concurrency = concurrency or ConfigHelper.get_int('SPLYNX_ASYNC_CONCURRENCY', 8)
+        self.timeout = timeout or ConfigHelper.get_int('SPLYNX_ASYNC_TIMEOUT_SECONDS', 30)
+
+        # Worker threads need the Flask app context of the calling job
+        self._app = current_app._get_current_object() if has_app_context() else None
+
+        self._loop = None
+        self._semaphore = None
+        self._executor = None
+
+    def _bind_loop(self):
+        """Create loop-bound primitives the first time they are used in a loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency,
+                    thread_name_prefix='splynx-async'
+                )
+        return loop
+
+    def _run_in_context(self, func, *args, **kwargs):
+        if self._app is None:
+            return func(*args, **kwargs)
+        with self._app.app_context():
+            return func(*args, **kwargs)
+
+    async def _call(self, method_name: str, *args, timeout: Optional[float] = None, **kwargs):
+        """Run one sync client method under the semaphore (reads with a timeout)."""
+        loop = self._bind_loop()
+        func = getattr(self.splynx, method_name)
+
+        async with self._semaphore:
+            # copy_context: los contadores del job en curso siguen sumando desde el pool
+            future = loop.run_in_executor(
+                self._executor,
+                partial(contextvars.copy_context().run, self._run_in_context, func, *args, **kwargs)
+            )
+            if method_name in WRITE_METHODS:
+                return await future
+            return await asyncio.wait_for(future, timeout or self.timeout)
+
+    # ------------------------------------------------------------------
+    # Same method names as SplynxServicesSingleton
+    # ------------------------------------------------------------------
+
+    async def search_customer(self, customer_id: str, use_cache: bool = True, **kwargs):
+        return await self._call('search_customer', customer_id, use_cache, **kwargs)
+
+    async def get_ticket_data_status(self, ticket_id: str, **kwargs):
+        return await self._call('get_ticket_data_status', ticket_id, **kwargs)
+
+    async def get_tickets_by_ids(self, ticket_ids, chunk_size=None, **kwargs):
+        return await self._call('get_tickets_by_ids', ticket_ids, chunk_size, **kwargs)
+
+    async def get_tickets_updated_since(self, since: str, group_id=None, **kwargs):
+        return await self._call('get_tickets_updated_since', since, group_id, **kwargs)
+
+    async def get_open_tickets(self, group_id="4", **kwargs):
+        return await self._call('get_open_tickets', group_id, **kwargs)
+
+    async def get_unassigned_tickets(self, group_id="4", **kwargs):
+        return await self._call('get_unassigned_tickets', group_id, **kwargs)
+
+    async def get_assigned_tickets(self, group_id="4", **kwargs):
+        return await self._call('get_assigned_tickets', group_id, **kwargs)
+
+    async def update_ticket_assignment(self, ticket_id: str, assigned_to: int, **kwargs):
+        return await self._call('update_ticket_assignment', ticket_id, assigned_to, **kwargs)
+
+    async def reopen_ticket(self, ticket_id: str, **kwargs):
+        return await self._call('reopen_ticket', ticket_id, **kwargs)
+
+    async def create_ticket(self, *args, **kwargs):
+        return await self._call('create_ticket', *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Fan-out helpers
+    # ------------------------------------------------------------------
+
+    async def gather(self, method_name: str, calls: Iterable[Sequence[Any]]) -> List[Any]:
+        """
+        Run `method_name` once per argument tuple concurrently.
+
+        Returns:
+            list: Results in the same order as `calls`; failed or timed-out
+            calls are returned as the exception instance (writes never time
+            out client-side).
+        """
+        method = getattr(self, method_name)
+        return await asyncio.gather(
+            *(method(*args) for args in calls),
+            return_exceptions=True
+        )
+
+    def fan_out(self, method_name: str, calls: Iterable[Sequence[Any]]) -> List[Any]:
+        """
+        Sync entry point for job threads: run the calls concurrently and block
+        until all finished (≈ max latency instead of the sum).
+        """
+        calls = [tuple(args) for args in calls]
+        if not calls:
+            return []
+
+        try:
+            results = asyncio.run(self.gather(method_name, calls))
+        finally:
+            self.close()
+
+        failures = sum(1 for r in results if isinstance(r, BaseException))
+        if failures:
+            logger.warning(f"⚠️ Splynx fan-out {method_name}: {failures} of {len(calls)} calls failed")
+        else:
+            logger.debug(f"✅ Splynx fan-out {method_name}: {len(calls)} calls (concurrency={self.concurrency})")
+        return results
+
+    def close(self):
+        """Release the worker pool (a new one is created on next use)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._loop = None
+        self._semaphore = None
+
+
+def fetch_customer_names(customer_ids: Iterable[Any], splynx_service: Optional[SplynxServicesSingleton] = None,
+                         default: str = 'Cliente desconocido') -> Dict[str, str]:
+    """
+    Resolve many Splynx customer names concurrently.
+
+    Returns:
+        dict: {customer_id (str): name}; unknown or failed lookups map to `default`.
+    """
+    unique_ids = list(dict.fromkeys(str(cid) for cid in customer_ids if cid not in (None, '')))
+    if not unique_ids:
+        return {}
+
+    client = AsyncSplynxClient(splynx_service)
+
+    # Cache hits are answered inline; only misses go through the fan-out
+    names = {}
+    missing = []
+    for customer_id in unique_ids:
+        found, info = client.splynx.customer_cache.get(customer_id)
+        if found:
+            names[customer_id] = info.get('name', default) if info else default
+        else:
+            missing.append(customer_id)
+
+    results = client.fan_out('search_customer', [(cid, False) for cid in missing])
+    for customer_id, info in zip(missing, results):
+        if isinstance(info, BaseException) or not info:
+            names[customer_id] = default
+        else:
+            names[customer_id] = info.get('name', default)
+    return names
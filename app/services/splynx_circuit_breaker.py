@@ -0,0 +1,159 @@
+"""
+Circuit breaker for the Splynx dependency.
+
+closed    -> calls go through; consecutive failures are counted
+open      -> calls fail immediately with SplynxCircuitOpenError until the
+             recovery timeout elapses
+half_open -> a limited number of probe calls go through; one success closes
+             the circuit, one failure opens it again
+"""
+
+import time
+from threading import Lock
+from typing import Optional
+
+import requests
+from flask import has_app_context
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class SplynxCircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling Splynx while the circuit is open."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Splynx circuit open, retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class SplynxCircuitBreaker:
+    """
+    SystemConfig keys:
+        SPLYNX_BREAKER_FAILURE_THRESHOLD   consecutive failures that open the circuit
+        SPLYNX_BREAKER_RECOVERY_SECONDS    time open before probing again
+        SPLYNX_BREAKER_HALF_OPEN_MAX_CALLS concurrent probe calls in half-open
+    """
+
+    RELOAD_INTERVAL_SECONDS = 60
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 60, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.last_failure = None
+        self._half_open_in_flight = 0
+        self._lock = Lock()
+        self._last_reload = 0.0
+
+        self.opens = 0
+        self.short_circuited = 0
+        self.failures = 0
+        self.successes = 0
+
+    def reload_if_due(self):
+        now = time.monotonic()
+        if now - self._last_reload < self.RELOAD_INTERVAL_SECONDS or not has_app_context():
+            return
+        self._last_reload = now
+        try:
+            from app.utils.config_helper import ConfigHelper
+            self.failure_threshold = ConfigHelper.get_int('SPLYNX_BREAKER_FAILURE_THRESHOLD', self.failure_threshold)
+            self.recovery_seconds = ConfigHelper.get_int('SPLYNX_BREAKER_RECOVERY_SECONDS', self.recovery_seconds)
+            self.half_open_max_calls = ConfigHelper.get_int('SPLYNX_BREAKER_HALF_OPEN_MAX_CALLS', self.half_open_max_calls)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not reload Splynx breaker config: {e}")
+
+    def _retry_in(self, now: float) -> float:
+        return max(self.opened_at + self.recovery_seconds - now, 0.0)
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (jobs use this to skip work early)."""
+        with self._lock:
+            return self.state == OPEN and self._retry_in(time.monotonic()) > 0
+
+    def before_call(self):
+        """Admit a call or raise SplynxCircuitOpenError."""
+        self.reload_if_due()
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if self._retry_in(now) > 0:
+                    self.short_circuited += 1
+                    raise SplynxCircuitOpenError(self._retry_in(now))
+                self.state = HALF_OPEN
+                self._half_open_in_flight = 0
+                logger.info("🟡 Splynx circuit half-open: probing")
+
+            if self.state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_max_calls:
+                    self.short_circuited += 1
+                    raise SplynxCircuitOpenError(0)
+                self._half_open_in_flight += 1
+
+    @staticmethod
+    def _is_failure(response: Optional[requests.Response], error: Optional[BaseException]) -> Optional[bool]:
+        """True = Splynx unhealthy, False = healthy answer, None = not informative."""
+        if response is None and error is not None:
+            response = getattr(error, 'response', None)
+        if response is not None:
+            return response.status_code >= 500 or response.status_code == 429
+        if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            return True
+        return None
+
+    def record(self, response: Optional[requests.Response] = None, error: Optional[BaseException] = None):
+        """Feed the outcome of an admitted call."""
+        failed = self._is_failure(response, error)
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+
+            if failed is None:
+                return
+
+            if not failed:
+                self.successes += 1
+                self.consecutive_failures = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    logger.info("🟢 Splynx circuit closed: Splynx answering again")
+                return
+
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_failure = str(error) if error is not None else f"HTTP {response.status_code}"
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opens += 1
+                    logger.error(
+                        f"🔴 Splynx circuit OPEN after {self.consecutive_failures} failures "
+                        f"({self.last_failure}); short-circuiting for {self.recovery_seconds}s"
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_seconds': self.recovery_seconds,
+                'retry_in_seconds': round(self._retry_in(now), 1) if self.state == OPEN else 0,
+                'last_failure': self.last_failure,
+                'opens': self.opens,
+                'short_circuited': self.short_circuited,
+                'failures': self.failures,
+                'successes': self.successes,
+            }
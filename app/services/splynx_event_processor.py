@@ -0,0 +1,177 @@
+"""
+Procesador de eventos de tickets enviados por Splynx (hook_splynx_event).
+
+Splynx avisa cada alta, edición, cierre o asignación de ticket a
+/api/hooks/splynx-event; el evento se guarda y se dispara este procesador, que
+aplica el estado del ticket a IncidentsDetection con la misma lógica que la
+sincronización por polling (apply_splynx_ticket): historial y aviso de
+reasignación, vencimiento, cierre y ventana de reapertura. La sincronización
+por polling queda como red de seguridad.
+
+El endpoint no tiene autenticación, así que el payload solo dispara el
+procesamiento: el estado de cada ticket se pide siempre a Splynx.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from app.interface.interfaces import IncidentsInterface
+from app.interface.webhook_interface import HookSplynxEventInterface
+from app.services.alert_deadlines import deadline_queue
+from app.services.splynx_services_singleton import SplynxServicesSingleton
+from app.utils.config import db
+from app.utils.config_helper import ConfigHelper
+from app.utils.leader_election import db_named_lock
+from app.utils.logger import get_logger
+from app.utils.sync_tickets_status import APPLY_LOCK_NAME, apply_splynx_ticket, prefetch_gr_closures
+
+logger = get_logger(__name__)
+
+# Nombres de evento de Splynx -> tipo normalizado
+EVENT_TYPES = {
+    'create': 'created', 'created': 'created', 'add': 'created',
+    'edit': 'updated', 'update': 'updated', 'updated': 'updated',
+    'close': 'closed', 'closed': 'closed',
+    'assign': 'assigned', 'assigned': 'assigned',
+    'delete': 'deleted', 'deleted': 'deleted',
+}
+
+# Eventos de tickets que Splynx no devolvió se reintentan durante este tiempo;
+# después se marcan procesados con error (ticket borrado o inaccesible)
+FETCH_RETRY_MINUTES = 30
+# Pausa entre reintentos de un mismo evento (mientras tanto no ocupa lugar en el lote)
+FETCH_RETRY_INTERVAL_MINUTES = 2
+FETCH_FAILED_MESSAGE = "No se pudo obtener el ticket de Splynx"
+
+
+def parse_splynx_event(payload: dict) -> Tuple[str, Optional[str], dict]:
+    """
+    Extrae tipo de evento, ID de ticket y atributos del payload de Splynx.
+
+    Acepta el formato de webhooks de Splynx ({"data": {"event", "attributes",
+    "changed_attributes"}}) y uno plano ({"event", "ticket_id", "ticket"}).
+    """
+    data = payload.get('data') if isinstance(payload.get('data'), dict) else payload
+    attributes = data.get('attributes') or data.get('ticket') or {}
+    if not isinstance(attributes, dict):
+        attributes = {}
+    changed = data.get('changed_attributes') or {}
+    if not isinstance(changed, dict):
+        changed = {}
+
+    raw_event = str(data.get('event') or data.get('action') or data.get('event_type') or '').strip().lower()
+    event_type = EVENT_TYPES.get(raw_event, raw_event or 'updated')
+    if event_type == 'updated':
+        if 'closed' in changed and str(attributes.get('closed', '')) == '1':
+            event_type = 'closed'
+        elif 'assign_to' in changed:
+            event_type = 'assigned'
+
+    ticket_id = attributes.get('id') or data.get('ticket_id') or data.get('id')
+    return event_type, str(ticket_id) if ticket_id else None, attributes
+
+
+def process_pending_splynx_events() -> Dict:
+    """
+    Procesa los eventos de Splynx pendientes (el último estado de cada ticket).
+
+    Returns:
+        dict: Estadísticas de la corrida; 'unknown_created' cuenta tickets
+        creados en Splynx que todavía no están en la BD (los trae la importación)
+        y 'retry' los eventos que quedan pendientes porque Splynx no devolvió el ticket.
+    """
+    with db_named_lock(APPLY_LOCK_NAME, timeout=30) as acquired:
+        if not acquired:
+            logger.info("Otro proceso está aplicando estados de Splynx - eventos quedan pendientes")
+            return {'success': True, 'processed': 0, 'skipped': 'lock_busy'}
+        return _process_pending_splynx_events()
+
+
+def _process_pending_splynx_events() -> Dict:
+    events = HookSplynxEventInterface.get_unprocessed()
+    result = {'success': True, 'processed': 0, 'tickets': 0, 'closed': 0, 'reassigned': 0,
+              'ignored': 0, 'unknown_created': 0, 'retry': 0, 'errors': 0}
+    if not events:
+        return result
+
+    # El endpoint no está autenticado: el evento solo dice qué ticket cambió y su
+    # estado se pide siempre a Splynx (nunca se aplica lo que trae el payload)
+    ticket_ids = []
+    created_ids = set()
+    for event in events:
+        if not event.ticket_id or event.event_type == 'deleted':
+            continue
+        if event.ticket_id not in ticket_ids:
+            ticket_ids.append(event.ticket_id)
+        if event.event_type == 'created':
+            created_ids.add(event.ticket_id)
+
+    splynx = SplynxServicesSingleton()
+    snapshots: Dict[str, dict] = {}
+    unfetched = set()
+    if ticket_ids:
+        if splynx.is_circuit_open():
+            logger.warning("🔴 Splynx no disponible (circuito abierto) - eventos quedan pendientes")
+            return {'success': False, 'skipped': 'splynx_circuit_open'}
+        fetched = splynx.get_tickets_by_ids(ticket_ids)
+        for tid in ticket_ids:
+            if tid in fetched:
+                snapshots[tid] = fetched[tid]
+            else:
+                unfetched.add(tid)
+        if unfetched:
+            logger.warning(f"⚠️ {len(unfetched)} ticket(s) de eventos Splynx no se pudieron obtener: {sorted(unfetched)}")
+
+    threshold_minutes = ConfigHelper.get_int('TICKET_ALERT_THRESHOLD_MINUTES', 60)
+    incidents = IncidentsInterface.find_by_ticket_ids(snapshots)
+
+    gr_closed = prefetch_gr_closures((incident, snapshots[tid]) for tid, incident in incidents.items())
+
+    failed: Dict[str, str] = {}
+    for ticket_id, snapshot in snapshots.items():
+        incident = incidents.get(ticket_id)
+        if incident is None:
+            if ticket_id in created_ids:
+                result['unknown_created'] += 1
+            else:
+                result['ignored'] += 1
+            continue
+        if incident.is_closed:
+            result['ignored'] += 1
+            continue
+        try:
+            outcome = apply_splynx_ticket(incident, snapshot, threshold_minutes, gr_closed)
+            result['tickets'] += 1
+            result['closed'] += outcome['closed']
+            result['reassigned'] += outcome['reassigned']
+        except Exception as e:
+            failed[ticket_id] = str(e)
+            result['errors'] += 1
+            logger.error(f"❌ Error aplicando evento de Splynx al ticket {ticket_id}: {e}")
+
+    db.session.commit()
+
+    if deadline_queue.running:
+        deadline_queue.schedule_tickets([{'id': tid, **snap} for tid, snap in snapshots.items()])
+
+    retry_cutoff = datetime.now() - timedelta(minutes=FETCH_RETRY_MINUTES)
+    retry_events = []
+    for event in events:
+        if event.ticket_id in unfetched:
+            # Sin estado del ticket no se aplicó nada: queda pendiente para un reintento
+            if event.created_at is None or event.created_at >= retry_cutoff:
+                retry_events.append(event)
+                result['retry'] += 1
+                continue
+            if event.ticket_id not in failed:
+                failed[event.ticket_id] = FETCH_FAILED_MESSAGE
+                result['errors'] += 1
+        HookSplynxEventInterface.mark_processed(event, failed.get(event.ticket_id))
+        result['processed'] += 1
+    HookSplynxEventInterface.schedule_retry(retry_events, FETCH_RETRY_INTERVAL_MINUTES)
+
+    logger.info(
+        f"⚡ Eventos Splynx: {result['processed']} eventos, {result['tickets']} tickets actualizados, "
+        f"{result['closed']} cerrados, {result['reassigned']} reasignados, {result['retry']} a reintentar, {result['errors']} errores"
+    )
+    return result
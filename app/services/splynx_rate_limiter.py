@@ -0,0 +1,316 @@
+"""
+Client-side governor for Splynx calls: a token-bucket rate limiter plus an
+AIMD (additive increase / multiplicative decrease) concurrency limiter driven
+by observed latency and errors.
+
+Limits are read from SystemConfig (ConfigHelper) and reloaded periodically so
+they can be tuned from the admin panel without a restart.
+"""
+
+import time
+from threading import Condition, Lock
+from typing import Optional
+
+import requests
+from flask import has_app_context
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SplynxThrottledError(requests.exceptions.RequestException):
+    """Raised when a call could not get a rate/concurrency slot in time."""
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` stored."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+        self.waits = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def configure(self, rate: float, burst: int):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            self.burst = max(int(burst), 1)
+            self._tokens = min(self._tokens, self.burst)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. Splynx answered 429 + Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def acquire(self, timeout: float) -> bool:
+        """Take one token, sleeping until available. False if `timeout` expires first."""
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        if waited:
+                            self.waits += 1
+                        return True
+                    if self.rate <= 0:
+                        sleep_for = 0.5
+                    else:
+                        sleep_for = (1 - self._tokens) / self.rate
+                else:
+                    sleep_for = self._paused_until - now
+
+            if now + sleep_for > deadline:
+                return False
+            waited = True
+            time.sleep(min(sleep_for, 1.0))
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return round(self._tokens, 2)
+
+
+class AIMDConcurrencyLimiter:
+    """
+    Concurrency limit that grows by ~1 per round of fast successful calls and
+    is cut multiplicatively on errors (timeouts, 429, 5xx) or when latency
+    goes over the target. Decreases are rate limited to one per cooldown so a
+    single burst of failures does not collapse the limit to the minimum.
+    """
+
+    DECREASE_FACTOR = 0.7
+    DECREASE_COOLDOWN_SECONDS = 1.0
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, min_limit: int, max_limit: int, latency_target_ms: float):
+        self.min_limit = max(int(min_limit), 1)
+        self.max_limit = max(int(max_limit), self.min_limit)
+        self.latency_target_ms = float(latency_target_ms)
+        self.limit = float(self.min_limit)
+        self.in_flight = 0
+        self.latency_ewma_ms = None
+        self._last_decrease = 0.0
+        self._cond = Condition()
+
+        self.increases = 0
+        self.decreases = 0
+        self.waits = 0
+
+    def configure(self, min_limit: int, max_limit: int, latency_target_ms: float):
+        with self._cond:
+            self.min_limit = max(int(min_limit), 1)
+            self.max_limit = max(int(max_limit), self.min_limit)
+            self.latency_target_ms = float(latency_target_ms)
+            self.limit = min(max(self.limit, self.min_limit), self.max_limit)
+            self._cond.notify_all()
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                self.waits += 1
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def cancel(self):
+        """Give back a slot that was taken but never used for a call (no AIMD feedback)."""
+        with self._cond:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self._cond.notify()
+
+    def release(self, latency_ms: float, overloaded: bool):
+        """
+        Args:
+            latency_ms: Observed call latency
+            overloaded: True for timeouts, connection errors, 429 and 5xx
+        """
+        with self._cond:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if self.latency_ewma_ms is None:
+                self.latency_ewma_ms = latency_ms
+            else:
+                self.latency_ewma_ms += self.EWMA_ALPHA * (latency_ms - self.latency_ewma_ms)
+
+            now = time.monotonic()
+            if overloaded or latency_ms > self.latency_target_ms:
+                if now - self._last_decrease >= self.DECREASE_COOLDOWN_SECONDS:
+                    new_limit = max(self.min_limit, self.limit * self.DECREASE_FACTOR)
+                    if new_limit < self.limit:
+                        self.decreases += 1
+                        logger.info(
+                            f"📉 Splynx concurrency {self.limit:.1f} -> {new_limit:.1f} "
+                            f"({'error' if overloaded else f'latency {latency_ms:.0f}ms'})"
+                        )
+                    self.limit = new_limit
+                    self._last_decrease = now
+            elif self.limit < self.max_limit:
+                # +1 per "window" of `limit` successful calls
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.increases += 1
+
+            self._cond.notify_all()
+
+
+class SplynxGovernor:
+    """
+    Rate + concurrency governor used by SplynxServicesSingleton._make_request.
+
+    SystemConfig keys:
+        SPLYNX_RATE_LIMIT_ENABLED, SPLYNX_RATE_LIMIT_PER_SECOND,
+        SPLYNX_RATE_LIMIT_BURST, SPLYNX_MIN_CONCURRENCY,
+        SPLYNX_MAX_CONCURRENCY, SPLYNX_LATENCY_TARGET_MS
+    """
+
+    RELOAD_INTERVAL_SECONDS = 60
+
+    DEFAULTS = {
+        'SPLYNX_RATE_LIMIT_ENABLED': True,
+        'SPLYNX_RATE_LIMIT_PER_SECOND': 10,
+        'SPLYNX_RATE_LIMIT_BURST': 20,
+        'SPLYNX_MIN_CONCURRENCY': 2,
+        'SPLYNX_MAX_CONCURRENCY': 16,
+        'SPLYNX_LATENCY_TARGET_MS': 2000,
+    }
+
+    def __init__(self):
+        d = self.DEFAULTS
+        self.enabled = d['SPLYNX_RATE_LIMIT_ENABLED']
+        self.bucket = TokenBucket(d['SPLYNX_RATE_LIMIT_PER_SECOND'], d['SPLYNX_RATE_LIMIT_BURST'])
+        self.limiter = AIMDConcurrencyLimiter(
+            d['SPLYNX_MIN_CONCURRENCY'], d['SPLYNX_MAX_CONCURRENCY'], d['SPLYNX_LATENCY_TARGET_MS']
+        )
+        self._last_reload = 0.0
+        self._reload_lock = Lock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.overloaded = 0
+        self.rate_limited_429 = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.current_rate = 0.0
+
+    def reload_if_due(self):
+        """Re-read limits from SystemConfig at most once per RELOAD_INTERVAL_SECONDS."""
+        now = time.monotonic()
+        if now - self._last_reload < self.RELOAD_INTERVAL_SECONDS or not has_app_context():
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            from app.utils.config_helper import ConfigHelper
+
+            d = self.DEFAULTS
+            self.enabled = ConfigHelper.get_bool('SPLYNX_RATE_LIMIT_ENABLED', d['SPLYNX_RATE_LIMIT_ENABLED'])
+            self.bucket.configure(
+                ConfigHelper.get_int('SPLYNX_RATE_LIMIT_PER_SECOND', d['SPLYNX_RATE_LIMIT_PER_SECOND']),
+                ConfigHelper.get_int('SPLYNX_RATE_LIMIT_BURST', d['SPLYNX_RATE_LIMIT_BURST'])
+            )
+            self.limiter.configure(
+                ConfigHelper.get_int('SPLYNX_MIN_CONCURRENCY', d['SPLYNX_MIN_CONCURRENCY']),
+                ConfigHelper.get_int('SPLYNX_MAX_CONCURRENCY', d['SPLYNX_MAX_CONCURRENCY']),
+                ConfigHelper.get_int('SPLYNX_LATENCY_TARGET_MS', d['SPLYNX_LATENCY_TARGET_MS'])
+            )
+            self._last_reload = now
+        except Exception as e:
+            logger.warning(f"⚠️ Could not reload Splynx rate limits: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Wait for a concurrency slot and a rate token, or raise SplynxThrottledError.
+
+        Returns:
+            True if a concurrency slot was taken; pass it to release() so the
+            slot is given back even if SPLYNX_RATE_LIMIT_ENABLED changes meanwhile.
+        """
+        self.reload_if_due()
+        if not self.enabled:
+            return False
+
+        # Slot first: a token is never spent on a call that then times out waiting for a slot
+        if not self.limiter.acquire(timeout):
+            self.throttled += 1
+            raise SplynxThrottledError(f"Splynx concurrency limit: no slot within {timeout}s")
+        if not self.bucket.acquire(timeout):
+            self.limiter.cancel()
+            self.throttled += 1
+            raise SplynxThrottledError(f"Splynx rate limit: no token within {timeout}s")
+        return True
+
+    def release(self, started: float, response: Optional[requests.Response] = None,
+                error: Optional[BaseException] = None, acquired: bool = True):
+        """Feed the outcome of a call back into the limiter (`acquired` as returned by acquire())."""
+        now = time.monotonic()
+        self.requests += 1
+        self._window_count += 1
+        if now - self._window_start >= 10:
+            self.current_rate = round(self._window_count / (now - self._window_start), 2)
+            self._window_start = now
+            self._window_count = 0
+
+        if not acquired:
+            return
+
+        status = response.status_code if response is not None else None
+        overloaded = (
+            isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+            or status == 429
+            or (status is not None and status >= 500)
+        )
+        if overloaded:
+            self.overloaded += 1
+        if status == 429:
+            self.rate_limited_429 += 1
+            retry_after = response.headers.get('Retry-After', '1')
+            try:
+                self.bucket.pause(min(float(retry_after), 60.0))
+            except ValueError:
+                self.bucket.pause(1.0)
+
+        self.limiter.release((now - started) * 1000, overloaded)
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'rate_limit_per_second': self.bucket.rate,
+            'burst': self.bucket.burst,
+            'tokens_available': self.bucket.available(),
+            'current_rate_per_second': self.current_rate,
+            'concurrency_limit': round(self.limiter.limit, 2),
+            'min_concurrency': self.limiter.min_limit,
+            'max_concurrency': self.limiter.max_limit,
+            'in_flight': self.limiter.in_flight,
+            'latency_target_ms': self.limiter.latency_target_ms,
+            'latency_ewma_ms': round(self.limiter.latency_ewma_ms, 1) if self.limiter.latency_ewma_ms is not None else None,
+            'requests': self.requests,
+            'rate_waits': self.bucket.waits,
+            'concurrency_waits': self.limiter.waits,
+            'throttled': self.throttled,
+            'overloaded_responses': self.overloaded,
+            'http_429': self.rate_limited_429,
+            'limit_increases': self.limiter.increases,
+            'limit_decreases': self.limiter.decreases,
+        }
@@ -3,15 +3,68 @@ Singleton version of SplynxServices to avoid multiple logins
 """
 
 import os
+import time
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.exceptions import InsecureRequestWarning
+from app.utils import job_metrics
 from app.utils.logger import get_logger
-from threading import Lock
+from app.utils.ttl_cache import TTLCache
+from app.services.splynx_token_store import SplynxTokenStore
+from app.services.splynx_rate_limiter import SplynxGovernor
+from app.services.splynx_circuit_breaker import SplynxCircuitBreaker
+from threading import Event, Lock, Thread
 
 logger = get_logger(__name__)
 
 
+class _Flight:
+    """An in-flight GET shared by concurrent callers."""
+
+    __slots__ = ('done', 'snapshot', 'error')
+
+    def __init__(self):
+        self.done = Event()
+        self.snapshot = None
+        self.error = None
+
+
+def _snapshot_response(response):
+    """Read a response into plain values so it can be shared between callers."""
+    if response is None:
+        return None
+    return (response.status_code, dict(response.headers), response.content,
+            response.url, response.encoding, response.reason)
+
+
+def _response_from_snapshot(snapshot):
+    """Build a fresh Response for one caller from a shared snapshot."""
+    if snapshot is None:
+        return None
+    response = requests.Response()
+    status_code, headers, content, url, encoding, reason = snapshot
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.url = url
+    response.encoding = encoding
+    response.reason = reason
+    return response
+
+
+def _follower_error(error):
+    """A new exception for each follower of a failed flight (same type when possible)."""
+    if isinstance(error, requests.exceptions.RequestException):
+        try:
+            return type(error)(*error.args, response=error.response, request=error.request)
+        except TypeError:
+            pass
+        return requests.exceptions.RequestException(*error.args, response=error.response, request=error.request)
+    return requests.exceptions.RequestException(f"Coalesced Splynx GET failed: {error}")
+
+
 class SplynxServicesSingleton:
     """
     Singleton class for Splynx services.
@@ -48,19 +101,126 @@ class SplynxServicesSingleton:
             self.verify_ssl = verify_ssl
 
         self.token = None
+        self.token_expires_at = 0.0
         self._token_lock = Lock()
 
+        # Token shared by every process on the host (file + flock). Refreshed
+        # in the background SPLYNX_TOKEN_REFRESH_MARGIN seconds before expiry
+        self.token_store = SplynxTokenStore(os.getenv('SPLYNX_TOKEN_STORE', '/tmp/splynx_token.json'))
+        self.token_refresh_margin = int(os.getenv('SPLYNX_TOKEN_REFRESH_MARGIN', '300'))
+        self.token_default_ttl = int(os.getenv('SPLYNX_TOKEN_TTL', '1800'))
+        self._refresher_stop = Event()
+        self._refresher = None
+        self.token_stats = {"logins": 0, "store_reuses": 0, "background_refreshes": 0, "refresh_errors": 0}
+
+        # Connection pool sizing: number of host pools kept alive and
+        # max keep-alive connections per host (one per concurrent worker thread)
+        self.pool_connections = int(os.getenv('SPLYNX_POOL_CONNECTIONS', '4'))
+        self.pool_maxsize = int(os.getenv('SPLYNX_POOL_MAXSIZE', '16'))
+        self.pool_block = os.getenv('SPLYNX_POOL_BLOCK', 'False').lower() == 'true'
+        self._session_lock = Lock()
+        self.session = self._build_session()
+
+        # Token bucket + AIMD concurrency limit shared by every thread
+        self.governor = SplynxGovernor()
+
+        # Fail fast while Splynx is down instead of waiting out every timeout
+        self.breaker = SplynxCircuitBreaker()
+
+        # Single-flight for GETs: identical concurrent GETs share one request and
+        # the response is reused for SPLYNX_GET_COALESCE_SECONDS (0 = share only
+        # in-flight requests). Any write clears the reuse window.
+        self._flights = {}
+        self._flight_lock = Lock()
+        self._write_generation = 0
+        self.recent_gets = TTLCache(
+            maxsize=int(os.getenv('SPLYNX_GET_COALESCE_MAXSIZE', '256')),
+            ttl=float(os.getenv('SPLYNX_GET_COALESCE_SECONDS', '10')),
+            negative_ttl=0,
+            name='splynx_recent_gets'
+        )
+        self.coalesce_stats = {"leaders": 0, "joined": 0, "reused": 0, "invalidations": 0}
+
+        # Customer lookups only feed display names; cache them (LRU + TTL) and
+        # remember missing customers for a shorter time (negative caching)
+        self.customer_cache = TTLCache(
+            maxsize=int(os.getenv('SPLYNX_CUSTOMER_CACHE_SIZE', '5000')),
+            ttl=int(os.getenv('SPLYNX_CUSTOMER_CACHE_TTL', '3600')),
+            negative_ttl=int(os.getenv('SPLYNX_CUSTOMER_CACHE_NEGATIVE_TTL', '300')),
+            name='splynx_customers'
+        )
+
         # Disable SSL warnings if SSL verification is disabled
         if not self.verify_ssl:
             urllib3.disable_warnings(InsecureRequestWarning)
             logger.warning("⚠️ SSL verification is disabled. This is insecure for production!")
 
-        # Get initial token
-        self.token = self.login_token()
+        # Get initial token (reuses the shared one when still valid)
+        self._ensure_token()
+        self._start_token_refresher()
         self._initialized = True
 
         logger.info("🔐 SplynxServicesSingleton initialized (singleton)")
 
+    def _build_session(self):
+        """
+        Build the shared keep-alive session used for every Splynx call.
+        requests.Session is safe to share across threads for plain requests;
+        the HTTPAdapter pool hands out one connection per concurrent caller.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.verify = self.verify_ssl
+        logger.info(
+            f"🔌 Splynx HTTP session pool: {self.pool_connections} hosts x "
+            f"{self.pool_maxsize} connections (block={self.pool_block})"
+        )
+        return session
+
+    def get_pool_stats(self):
+        """
+        Return keep-alive pool statistics aggregated over all host pools.
+
+        A request that reuses an idle connection counts as a hit; every new
+        TCP+TLS connection opened by urllib3 counts as a miss (handshake).
+        """
+        requests_count = 0
+        connections_count = 0
+        hosts = []
+
+        with self._session_lock:
+            adapters = {id(a): a for a in self.session.adapters.values()}.values()
+            for adapter in adapters:
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_count += pool.num_requests
+                    connections_count += pool.num_connections
+                    hosts.append({
+                        "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                        "requests": pool.num_requests,
+                        "connections_opened": pool.num_connections
+                    })
+
+        hits = max(requests_count - connections_count, 0)
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "requests": requests_count,
+            "hits": hits,
+            "misses": connections_count,
+            "hit_rate": round(hits / requests_count, 4) if requests_count else 0.0,
+            "hosts": hosts
+        }
+
     def login_token(self):
         """
         Login to Splynx and get authentication token.
@@ -78,10 +238,14 @@ class SplynxServicesSingleton:
             }
 
             try:
-                response = requests.post(url, headers=headers, json=body, verify=self.verify_ssl, timeout=10)
+                response = self.session.post(url, headers=headers, json=body, verify=self.verify_ssl, timeout=10)
                 response.raise_for_status()
                 token_data = response.json()
                 token = token_data["access_token"]
+                self.token_expires_at = float(
+                    token_data.get("access_token_expiration") or time.time() + self.token_default_ttl
+                )
+                self.token_stats["logins"] += 1
                 logger.info("✅ Splynx token obtained successfully")
                 return token
             except requests.exceptions.SSLError as e:
@@ -92,17 +256,192 @@ class SplynxServicesSingleton:
                 logger.error(f"Request Error during login: {e}")
                 raise
 
-    def _refresh_token_if_needed(self, response):
-        """Check if token expired and refresh if needed"""
+    def _ensure_token(self, margin=0, rejected_token=None):
+        """
+        Make sure self.token is usable for at least `margin` seconds.
+
+        Order: in-memory token, then the shared store, then a login. The login
+        runs under the store's exclusive lock and re-reads the store first, so
+        when several processes need a new token only one of them logs in.
+
+        Args:
+            margin: Seconds of remaining validity required
+            rejected_token: Token Splynx just answered 401 for; never reused
+        """
+        if (self.token and self.token != rejected_token
+                and self.token_expires_at - margin > time.time()):
+            return self.token
+
+        def _usable(entry):
+            return (SplynxTokenStore.is_valid(entry, self.base_url, self.user, margin)
+                    and entry['access_token'] != rejected_token)
+
+        try:
+            entry = self.token_store.read()
+            if _usable(entry):
+                return self._adopt_token(entry)
+
+            with self.token_store.exclusive():
+                entry = self.token_store.read(locked=True)
+                if _usable(entry):
+                    return self._adopt_token(entry)
+
+                self.token = self.login_token()
+                self.token_store.write({
+                    "access_token": self.token,
+                    "expires_at": self.token_expires_at,
+                    "base_url": self.base_url,
+                    "user": self.user,
+                    "obtained_at": time.time(),
+                    "pid": os.getpid()
+                }, locked=True)
+                return self.token
+        except OSError as e:
+            # Store not usable (permissions, read-only FS): fall back to a private token
+            logger.warning(f"⚠️ Splynx token store unavailable ({e}), logging in without it")
+            self.token = self.login_token()
+            return self.token
+
+    def _adopt_token(self, entry):
+        self.token = entry['access_token']
+        self.token_expires_at = float(entry['expires_at'])
+        self.token_stats["store_reuses"] += 1
+        logger.debug("🔑 Reusing shared Splynx token from store")
+        return self.token
+
+    def _start_token_refresher(self):
+        """Start the daemon thread that renews the token before it expires."""
+        if os.getenv('SPLYNX_TOKEN_REFRESH_ENABLED', 'True').lower() != 'true':
+            return
+        self._refresher = Thread(target=self._token_refresher_loop, name='splynx-token-refresher', daemon=True)
+        self._refresher.start()
+
+    def _token_refresher_loop(self):
+        while not self._refresher_stop.is_set():
+            wait = self.token_expires_at - self.token_refresh_margin - time.time()
+            if wait > 0 and self._refresher_stop.wait(min(wait, 60)):
+                return
+            if self.token_expires_at - self.token_refresh_margin > time.time():
+                continue
+            try:
+                self._ensure_token(margin=self.token_refresh_margin)
+                self.token_stats["background_refreshes"] += 1
+                logger.info("🔄 Splynx token refreshed ahead of expiry")
+            except Exception as e:
+                self.token_stats["refresh_errors"] += 1
+                logger.error(f"❌ Background Splynx token refresh failed: {e}")
+                if self._refresher_stop.wait(30):
+                    return
+
+    def get_token_stats(self):
+        """Token lifecycle counters and remaining validity."""
+        return {
+            **self.token_stats,
+            "expires_in_seconds": max(int(self.token_expires_at - time.time()), 0),
+            "refresher_running": bool(self._refresher and self._refresher.is_alive())
+        }
+
+    def _refresh_token_if_needed(self, response, sent_token):
+        """
+        Check if token expired and refresh if needed.
+
+        Args:
+            response: Response to inspect
+            sent_token: Token the request was sent with (only that one is rejected,
+                        so a fresh token adopted meanwhile by another thread is reused)
+
+        Returns:
+            The token to retry with, or None if the response was not a 401
+        """
         if response.status_code == 401:
             logger.warning("⚠️ Token expired, refreshing...")
-            self.token = self.login_token()
-            return True
-        return False
+            return self._ensure_token(rejected_token=sent_token)
+        return None
 
     def _make_request(self, method, url, **kwargs):
         """
         Generic request method with automatic token refresh.
+        GETs are coalesced (see _coalesced_get); any other method invalidates
+        the recently fetched GET responses.
+
+        Args:
+            method: HTTP method ('get', 'post', 'put', 'delete')
+            url: Full URL for the request
+            **kwargs: Additional arguments for requests
+
+        Returns:
+            Response object or None if error
+        """
+        if method.lower() == 'get':
+            return self._coalesced_get(url, **kwargs)
+
+        try:
+            return self._send_request(method, url, **kwargs)
+        finally:
+            with self._flight_lock:
+                self._write_generation += 1
+                if self.recent_gets.clear():
+                    self.coalesce_stats["invalidations"] += 1
+
+    def _coalesced_get(self, url, **kwargs):
+        """
+        Single-flight GET: the first caller for a URL (including query params)
+        performs the request, concurrent callers wait for it and get their own
+        copy of its response, or their own exception chained to its error.
+        """
+        key = requests.Request('GET', url, params=kwargs.get('params')).prepare().url
+
+        found, snapshot = self.recent_gets.get(key)
+        if found:
+            with self._flight_lock:
+                self.coalesce_stats["reused"] += 1
+            return _response_from_snapshot(snapshot)
+
+        with self._flight_lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                generation = self._write_generation
+                self.coalesce_stats["leaders"] += 1
+            else:
+                self.coalesce_stats["joined"] += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise _follower_error(flight.error) from flight.error
+            if flight.snapshot is None:
+                # Leader interrupted (KeyboardInterrupt, SystemExit): nothing to share
+                raise requests.exceptions.RequestException("Coalesced Splynx GET was interrupted")
+            return _response_from_snapshot(flight.snapshot)
+
+        try:
+            response = self._send_request('get', url, **kwargs)
+            flight.snapshot = _snapshot_response(response)
+            with self._flight_lock:
+                # Do not keep a response that may predate a write made meanwhile
+                if generation == self._write_generation:
+                    self.recent_gets.set(key, flight.snapshot)
+            return response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flight_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def get_coalesce_stats(self):
+        """Single-flight counters plus the reuse-window cache stats."""
+        with self._flight_lock:
+            stats = {**self.coalesce_stats, "in_flight": len(self._flights)}
+        return {**stats, "recent": self.recent_gets.stats()}
+
+    def _send_request(self, method, url, **kwargs):
+        """
+        Perform one request through the circuit breaker and rate governor.
 
         Args:
             method: HTTP method ('get', 'post', 'put', 'delete')
@@ -112,32 +451,79 @@ class SplynxServicesSingleton:
         Returns:
             Response object or None if error
         """
-        headers = kwargs.get('headers', {})
-        headers["Authorization"] = f"Splynx-EA (access_token={self.token})"
-        kwargs['headers'] = headers
         kwargs['verify'] = self.verify_ssl
         kwargs.setdefault('timeout', 30)
 
+        self.breaker.before_call()
+        response = None
+        error = None
         try:
-            response = getattr(requests, method)(url, **kwargs)
-
-            # Check if token expired and retry once
-            if self._refresh_token_if_needed(response):
-                headers["Authorization"] = f"Splynx-EA (access_token={self.token})"
-                response = getattr(requests, method)(url, **kwargs)
+            # The token this request sends; self.token may change under other threads
+            sent_token = self._ensure_token()
+            headers = kwargs.get('headers', {})
+            headers["Authorization"] = f"Splynx-EA (access_token={sent_token})"
+            kwargs['headers'] = headers
+
+            acquired = self.governor.acquire(timeout=kwargs['timeout'])
+            started = time.monotonic()
+            job_metrics.count(job_metrics.SPLYNX_CALLS)
+            try:
+                response = self.session.request(method.upper(), url, **kwargs)
+
+                # Check if token expired and retry once
+                new_token = self._refresh_token_if_needed(response, sent_token)
+                if new_token:
+                    sent_token = new_token
+                    headers["Authorization"] = f"Splynx-EA (access_token={sent_token})"
+                    job_metrics.count(job_metrics.SPLYNX_CALLS)
+                    response = self.session.request(method.upper(), url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                error = e
+                raise
+            finally:
+                self.governor.release(started, response, error, acquired)
 
             response.raise_for_status()
             return response
 
         except requests.exceptions.RequestException as e:
+            error = e
             logger.error(f"Request error ({method.upper()} {url}): {e}")
             raise
+        finally:
+            self.breaker.record(response, error)
+
+    def is_circuit_open(self) -> bool:
+        """True while Splynx calls are being short-circuited (jobs should skip)."""
+        return self.breaker.is_open()
+
+    def search_customer(self, customer_id: str, use_cache: bool = True):
+        """
+        Search customer by ID.
+
+        Served from the customer cache when possible. A 404 is cached as a
+        negative entry and returned as None; other errors are not cached.
+        """
+        key = str(customer_id)
+        if use_cache:
+            found, customer = self.customer_cache.get(key)
+            if found:
+                return customer
 
-    def search_customer(self, customer_id: str):
-        """Search customer by ID"""
         url = f"{self.base_url}/api/2.0/admin/customers/customer/{customer_id}"
-        response = self._make_request('get', url)
-        return response.json() if response else None
+        try:
+            response = self._make_request('get', url)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.warning(f"Customer {customer_id} not found")
+                self.customer_cache.set(key, None)
+                return None
+            raise
+
+        customer = response.json() if response else None
+        if customer:
+            self.customer_cache.set(key, customer)
+        return customer
 
     def get_ticket_data_status(self, ticket_id: str):
         """Get the status of a ticket by its ID"""
@@ -156,6 +542,99 @@ class SplynxServicesSingleton:
             logger.error(f"Unexpected error checking ticket {ticket_id}: {e}")
             return None
 
+    def get_tickets_by_ids(self, ticket_ids, chunk_size=None):
+        """
+        Fetch many tickets in a few requests using the list endpoint with an
+        `id IN (...)` filter.
+
+        Args:
+            ticket_ids: Iterable of Splynx ticket IDs
+            chunk_size: IDs per request (defaults to SPLYNX_BULK_CHUNK_SIZE)
+
+        Returns:
+            dict: {ticket_id (str): ticket data}. Tickets not returned by Splynx
+            (deleted / not found) are simply absent.
+        """
+        if chunk_size is None:
+            chunk_size = int(os.getenv('SPLYNX_BULK_CHUNK_SIZE', '100'))
+
+        wanted = list(dict.fromkeys(str(tid) for tid in ticket_ids if tid))
+        url = f"{self.base_url}/api/2.0/admin/support/tickets"
+        tickets_by_id = {}
+
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+            params = [("main_attributes[id][0]", "IN")]
+            params += [("main_attributes[id][1][]", tid) for tid in chunk]
+
+            try:
+                response = self._make_request('get', url, params=params)
+                tickets = response.json() if response else []
+                chunk_set = set(chunk)
+                for ticket in tickets:
+                    tid = str(ticket.get('id', ''))
+                    # Ignore anything outside the requested chunk (defensive if the filter is not applied)
+                    if tid in chunk_set:
+                        tickets_by_id[tid] = ticket
+            except Exception as e:
+                logger.warning(f"⚠️ Bulk ticket fetch failed for {len(chunk)} tickets, falling back to single GETs: {e}")
+                for tid in chunk:
+                    ticket = self.get_ticket_data_status(tid)
+                    if ticket:
+                        tickets_by_id[tid] = ticket
+
+        requests_made = (len(wanted) + chunk_size - 1) // chunk_size
+        logger.info(f"✅ Bulk fetched {len(tickets_by_id)} of {len(wanted)} tickets in {requests_made} request(s)")
+        return tickets_by_id
+
+    def get_tickets_updated_since(self, since: str, group_id=None):
+        """
+        Get tickets whose updated_at is at or after `since` (delta sync).
+
+        Args:
+            since: Splynx datetime string (YYYY-MM-DD HH:MM:SS)
+            group_id: Optional group filter
+
+        Returns:
+            list: Tickets changed since the given moment (closed ones included)
+        """
+        url = f"{self.base_url}/api/2.0/admin/support/tickets"
+        params = [
+            ("main_attributes[updated_at][0]", ">="),
+            ("main_attributes[updated_at][1]", since),
+        ]
+        if group_id is not None:
+            params.append(("main_attributes[group_id]", str(group_id)))
+
+        response = self._make_request('get', url, params=params)
+        tickets = response.json() if response else []
+
+        if group_id is not None:
+            tickets = [t for t in tickets if str(t.get('group_id')) == str(group_id)]
+
+        logger.info(f"✅ Found {len(tickets)} tickets updated since {since}" + (f" in group {group_id}" if group_id is not None else ""))
+        return tickets
+
+    def get_open_tickets(self, group_id="4"):
+        """
+        Get every open ticket (assigned or not) of a group.
+        Unlike get_assigned_tickets/get_unassigned_tickets, errors propagate so
+        callers can tell "no tickets" from "Splynx failed" (mirror reconcile).
+        """
+        url = f"{self.base_url}/api/2.0/admin/support/tickets"
+        params = {"group_id": group_id}
+
+        response = self._make_request('get', url, params=params)
+        all_tickets = response.json() if response else []
+
+        open_tickets = [
+            ticket for ticket in all_tickets
+            if ticket.get('closed') not in ['1', 1]
+            and str(ticket.get('group_id')) == str(group_id)
+        ]
+        logger.info(f"✅ Found {len(open_tickets)} open tickets from {len(all_tickets)} total in group {group_id}")
+        return open_tickets
+
     def get_unassigned_tickets(self, group_id="4"):
         """Get all unassigned tickets from a specific group, excluding closed tickets"""
         url = f"{self.base_url}/api/2.0/admin/support/tickets"
@@ -300,5 +779,9 @@ class SplynxServicesSingleton:
     def reset_instance(cls):
         """Reset singleton instance (useful for testing)"""
         with cls._lock:
+            if cls._instance is not None and getattr(cls._instance, '_refresher_stop', None) is not None:
+                cls._instance._refresher_stop.set()
+            if cls._instance is not None and getattr(cls._instance, 'session', None) is not None:
+                cls._instance.session.close()
             cls._instance = None
             logger.info("🔄 SplynxServicesSingleton instance reset")
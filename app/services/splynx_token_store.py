@@ -0,0 +1,104 @@
+"""
+Shared Splynx token store.
+Keeps the access token and its expiry in a small JSON file guarded by an
+flock, so every process/worker on the host reuses the same token instead of
+logging in on its own.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SplynxTokenStore:
+    """
+    File-backed token store.
+
+    Readers take a shared lock on `<path>.lock`; writers and the process that
+    performs a login take the exclusive lock, so concurrent refreshes collapse
+    into a single login. The file is replaced atomically on write.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    @contextmanager
+    def _flock(self, mode):
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, mode)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the store exclusively (e.g. while logging in)."""
+        with self._flock(fcntl.LOCK_EX):
+            yield
+
+    def _read_unlocked(self) -> Optional[dict]:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Unreadable Splynx token store {self.path}: {e}")
+            return None
+        return data if isinstance(data, dict) and data.get('access_token') else None
+
+    def read(self, locked: bool = False) -> Optional[dict]:
+        """
+        Return the stored token entry or None.
+
+        Args:
+            locked: True when the caller already holds exclusive()
+        """
+        if locked:
+            return self._read_unlocked()
+        with self._flock(fcntl.LOCK_SH):
+            return self._read_unlocked()
+
+    def write(self, entry: dict, locked: bool = False):
+        """Atomically replace the stored token entry."""
+        def _write():
+            directory = os.path.dirname(self.path) or '.'
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.splynx_token_')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entry, f)
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        if locked:
+            _write()
+        else:
+            with self._flock(fcntl.LOCK_EX):
+                _write()
+
+    @staticmethod
+    def is_valid(entry: Optional[dict], base_url: str, user: str, margin_seconds: float = 0) -> bool:
+        """True if the entry belongs to this Splynx/user and is not about to expire."""
+        if not entry:
+            return False
+        if entry.get('base_url') != base_url or entry.get('user') != user:
+            return False
+        return float(entry.get('expires_at', 0)) - margin_seconds > time.time()
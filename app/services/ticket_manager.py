@@ -6,10 +6,14 @@ OPTIMIZADO: Usa SplynxServicesSingleton para evitar múltiples logins
 
 
 from app.services.splynx_services_singleton import SplynxServicesSingleton
+from app.services.splynx_async_client import AsyncSplynxClient, fetch_customer_names
 from app.services.whatsapp_service import WhatsAppService
 from app.interface.interfaces import TicketResponseMetricsInterface, IncidentsInterface
 from app.utils.schedule_helper import ScheduleHelper
+from app.utils.sync_ticket_mirror import get_open_tickets, record_assignment, record_created
 from app.utils.config_helper import ConfigHelper
+from app.utils.job_context import JobContext
+from app.utils.date_utils import parse_ticket_date
 from datetime import datetime
 import pytz
 from app.utils.logger import get_logger
@@ -32,7 +36,7 @@ class TicketManager:
         self.splynx = splynx_service
         self.whatsapp = WhatsAppService()
     
-    def get_next_assignee(self, ticket_note: str = None) -> int:
+    def get_next_assignee(self, ticket_note: str = None, ctx: JobContext = None) -> int:
         """Obtiene la siguiente persona a asignar según horarios de BD (schedule_type='assignment').
         
         Usa los horarios configurados en operator_schedule con schedule_type='assignment'.
@@ -42,22 +46,23 @@ class TicketManager:
         
         Args:
             ticket_note: Nota del ticket para verificar etiquetas [TT] o [TD]
+            ctx: Contexto de la corrida (si es None se arma uno para esta llamada)
         
         Returns:
             int: ID de la persona a asignar según el horario de asignación de BD
         """
         from app.interface.interfaces import AssignmentTrackerInterface
         from app.utils.constants import TURNO_TARDE_IDS, TURNO_DIA_IDS
-        from app.utils.config_helper import ConfigHelper
         
-        # Obtener configuración de fin de semana desde BD
-        PERSONA_GUARDIA_FINDE = ConfigHelper.get_int('PERSONA_GUARDIA_FINDE', 10)
-        FINDE_HORA_INICIO = ConfigHelper.get_int('FINDE_HORA_INICIO', 9)
-        FINDE_HORA_FIN = ConfigHelper.get_int('FINDE_HORA_FIN', 21)
+        if ctx is None:
+            ctx = JobContext.build()
+        
+        # Configuración de fin de semana del contexto
+        PERSONA_GUARDIA_FINDE = ctx.thresholds['weekend_guard']
+        FINDE_HORA_INICIO = ctx.thresholds['weekend_start_hour']
+        FINDE_HORA_FIN = ctx.thresholds['weekend_end_hour']
         
-        # Obtener hora actual en Argentina
-        tz_argentina = pytz.timezone('America/Argentina/Buenos_Aires')
-        now = datetime.now(tz_argentina)
+        now = ctx.now
         current_hour = now.hour
         current_minute = now.minute
         day_of_week = now.weekday()  # 0=Lunes, 6=Domingo
@@ -89,11 +94,7 @@ class TicketManager:
         logger.info(f"🔍 Buscando operadores disponibles según horarios de asignación de BD...")
         
         # Obtener operadores disponibles según horarios de BD
-        available_persons = ScheduleHelper.get_available_operators(
-            self.ASSIGNABLE_PERSONS,
-            schedule_type='assignment',
-            current_time=now
-        )
+        available_persons = ctx.available_operators(self.ASSIGNABLE_PERSONS, schedule_type='assignment')
         
         # Si no hay nadie disponible, usar fallback (round-robin entre todos)
         if not available_persons:
@@ -110,15 +111,18 @@ class TicketManager:
         
         return person_id
 
-    def assign_ticket_fairly(self) -> int:
+    def assign_ticket_fairly(self, ctx: JobContext = None) -> int:
         """Asigna un ticket según el horario de trabajo e incrementa el contador.
         
+        Args:
+            ctx: Contexto de la corrida (ver get_next_assignee)
+        
         Returns:
             int: ID de la persona asignada según el horario
         """
         from app.interface.interfaces import AssignmentTrackerInterface
         
-        person_id = self.get_next_assignee()
+        person_id = self.get_next_assignee(ctx=ctx)
         AssignmentTrackerInterface.increment_count(person_id)
         logger.info(f"🎫 Ticket asignado a persona ID: {person_id}")
         return person_id
@@ -136,10 +140,13 @@ class TicketManager:
         return ""
 
     @staticmethod
-    def _check_ticket_bd() -> dict:
+    def _check_ticket_bd(incident_ids=None) -> dict:
         """
         Consulta los tickets que tienen is_created_splynx en falso o 0
 
+        Args:
+            incident_ids: Limitar a estos incidentes (None = todos los pendientes)
+
         Returns:
             dict: Diccionario con los tickets pendientes de crear en Splynx y estadísticas
         """
@@ -152,7 +159,10 @@ class TicketManager:
 
         try:
             # Consultar directamente los incidentes pendientes de crear en Splynx
-            pending = IncidentsDetection.query.filter_by(is_created_splynx=False).all()
+            query = IncidentsDetection.query.filter_by(is_created_splynx=False)
+            if incident_ids is not None:
+                query = query.filter(IncidentsDetection.id.in_(list(incident_ids)))
+            pending = query.all()
 
             # Convertir los objetos a diccionarios
             pending_tickets = []
@@ -241,14 +251,33 @@ class TicketManager:
             logger.error(f"Error al actualizar Ticket ID en la base de datos: {e}")
             return False
 
-    def create_ticket(self):
+    def create_ticket(self, incident_ids=None):
         """Crea un ticket en Splynx y actualiza la base de datos con el ID devuelto
 
+        Corre bajo un lock con nombre entre procesos: el scheduler y el pipeline
+        de tickets nunca crean el mismo incidente dos veces.
+
+        Args:
+            incident_ids: Crear solo estos incidentes (None = todos los pendientes)
+
         Returns:
             list: Lista de IDs de tickets creados o lista vacía si hubo error
         """
-        data = self._check_ticket_bd()
+        # Splynx caído: los incidentes quedan pendientes en BD y se crean en la próxima corrida
+        if self._splynx_circuit_open('create_ticket'):
+            return []
+
+        from app.utils.leader_election import db_named_lock
+        with db_named_lock('splynx_create_ticket', timeout=30) as acquired:
+            if not acquired:
+                logger.info("Otro proceso está creando tickets en Splynx - omitiendo")
+                return []
+            return self._create_pending_tickets(incident_ids)
+
+    def _create_pending_tickets(self, incident_ids=None):
+        data = self._check_ticket_bd(incident_ids)
         created_tickets = []  # Lista para almacenar los IDs de tickets creados
+        ctx = JobContext.build() if data["pending_tickets"] else None
 
         for ticket_data in data["pending_tickets"]:
             cliente = ticket_data.get("Cliente", "")
@@ -275,7 +304,7 @@ class TicketManager:
                 assigned_person_id = int(previous_assigned_to)
                 logger.info(f"♻️  Manteniendo operador original: {assigned_person_id}")
             else:
-                assigned_person_id = self.assign_ticket_fairly()
+                assigned_person_id = self.assign_ticket_fairly(ctx=ctx)
             
             # Usar el nombre del cliente desde la base de datos
             customer_name = cliente_nombre if cliente_nombre else "Cliente"
@@ -335,6 +364,30 @@ class TicketManager:
                     fecha_creacion=ticket_data["Fecha_Creacion"],
                     ticket_id=ticket_id
                 )
+
+                from app.utils.constants import SPLYNX_SUPPORT_GROUP_ID
+
+                # Al espejo local ya mismo: el delta filtra por updated_at y este
+                # ticket queda con la fecha original de GR (DD-MM-YYYY, el espejo
+                # guarda el formato de Splynx)
+                fecha_gr = parse_ticket_date(ticket_data["Fecha_Creacion"])
+                if fecha_gr is None:
+                    logger.warning(f"⚠️ Fecha_Creacion inválida para el espejo del ticket {ticket_id}: {ticket_data['Fecha_Creacion']!r}")
+                fecha_splynx = fecha_gr.strftime('%Y-%m-%d %H:%M:%S') if fecha_gr else ''
+                record_created({
+                    'group_id': SPLYNX_SUPPORT_GROUP_ID,
+                    'status_id': '1',
+                    'closed': '0',
+                    'assign_to': assigned_person_id,
+                    'customer_id': ticket_data["Cliente"],
+                    'subject': ticket_data["Asunto"],
+                    'priority': ticket_data["Prioridad"],
+                    'note': ticket_data["note"],
+                    'created_at': fecha_splynx,
+                    'updated_at': fecha_splynx,
+                    **response,
+                    'id': ticket_id,
+                })
                 
                 # Registrar asignación en historial
                 TicketResponseMetricsInterface.add_assignment_to_history(
@@ -345,9 +398,7 @@ class TicketManager:
 
                 # Registrar en historial de reasignaciones
                 from app.interface.reassignment_history import ReassignmentHistoryInterface
-                from app.interface.interfaces import OperatorConfigInterface
-                op_config = OperatorConfigInterface.get_by_person_id(assigned_person_id)
-                op_name = op_config.name if op_config else f'Operador {assigned_person_id}'
+                op_name = ctx.operator_name(assigned_person_id)
                 reassignment_type = 'ticket_recreation' if should_recreate else 'ticket_creation'
                 ReassignmentHistoryInterface.create({
                     'ticket_id': str(ticket_id),
@@ -411,7 +462,33 @@ class TicketManager:
         # Retornar la lista de tickets creados al final de la función
         return created_tickets if created_tickets else None
 
-    def check_and_alert_overdue_tickets(self, threshold_minutes=None):
+    def check_and_alert_overdue_tickets(self, threshold_minutes=None, only_ticket_ids=None, ctx=None):
+        """Verifica tickets asignados que superen el tiempo límite y envía alertas por WhatsApp.
+
+        Corre bajo un lock con nombre entre procesos: el barrido completo
+        (alert_overdue) y el disparo por vencimiento (alert_deadlines) nunca
+        revisan en paralelo, así el anti-spam de IncidentsDetection ve las
+        alertas que acaba de enviar la otra corrida.
+
+        Ver _check_and_alert_overdue_tickets para argumentos y resultado.
+        """
+        from app.utils.leader_election import db_named_lock
+        with db_named_lock('alert_overdue', timeout=60) as acquired:
+            if not acquired:
+                logger.info("Otra corrida de alertas de tickets vencidos está en curso - omitiendo")
+                return {
+                    "total_tickets_revisados": 0,
+                    "tickets_vencidos": 0,
+                    "tickets_pre_alerta": 0,
+                    "alertas_enviadas": 0,
+                    "pre_alertas_enviadas": 0,
+                    "errores": 0,
+                    "detalles": [],
+                    "skipped": "lock_busy",
+                }
+            return self._check_and_alert_overdue_tickets(threshold_minutes, only_ticket_ids, ctx)
+
+    def _check_and_alert_overdue_tickets(self, threshold_minutes=None, only_ticket_ids=None, ctx=None):
         """Verifica tickets asignados que superen el tiempo límite y envía alertas por WhatsApp.
         También envía pre-alertas para tickets próximos a vencerse.
         Agrupa todos los tickets por operador y envía un solo mensaje con la lista completa.
@@ -424,28 +501,35 @@ class TicketManager:
 
         Args:
             threshold_minutes: Tiempo límite en minutos (si es None, lee de BD)
+            only_ticket_ids: Revisar solo estos tickets (disparo por vencimiento);
+                             si es None se barren todos los asignados
+            ctx: Contexto de la corrida (JobContext); si es None se arma uno
 
         Returns:
             dict: Resumen de la operación con estadísticas
         """
         from app.utils.config_helper import ConfigHelper
+        from app.services.alert_deadlines import deadline_queue
         from app.utils.constants import (
             SPLYNX_SUPPORT_GROUP_ID,
-            TIMEZONE
+            OUTHOUSE_STATUS_ID
         )
         from app.services.whatsapp_service import WhatsAppService
         from app.interface.interfaces import IncidentsInterface
         from app.utils.config import db
         from datetime import datetime, timedelta
         from collections import defaultdict
-        import pytz
+
+        # Configuración, operadores y horarios: una sola lectura por corrida
+        if ctx is None:
+            ctx = JobContext.build()
 
         # Leer configuración desde BD si no se especifica
         if threshold_minutes is None:
-            threshold_minutes = ConfigHelper.get_ticket_alert_threshold()
+            threshold_minutes = ctx.thresholds['alert']
 
-        TICKET_RENOTIFICATION_INTERVAL_MINUTES = ConfigHelper.get_renotification_interval()
-        pre_alert_minutes = ConfigHelper.get_pre_alert_minutes()
+        TICKET_RENOTIFICATION_INTERVAL_MINUTES = ctx.thresholds['renotification']
+        pre_alert_minutes = ctx.thresholds['pre_alert']
         pre_alert_threshold = threshold_minutes - pre_alert_minutes
 
         resultado = {
@@ -458,14 +542,26 @@ class TicketManager:
             "detalles": []
         }
 
+        if self._splynx_circuit_open('check_and_alert_overdue_tickets'):
+            resultado["skipped"] = "splynx_circuit_open"
+            return resultado
+
         try:
             # Inicializar servicio de WhatsApp
             whatsapp_service = WhatsAppService()
 
-            # Obtener todos los tickets asignados del grupo de Soporte Técnico
-            tickets = self.splynx.get_assigned_tickets(group_id=SPLYNX_SUPPORT_GROUP_ID)
+            # Obtener todos los tickets asignados del grupo de Soporte Técnico (espejo local si está fresco)
+            tickets = get_open_tickets(self.splynx, SPLYNX_SUPPORT_GROUP_ID, assigned=True)
+            if only_ticket_ids is not None:
+                only_ticket_ids = {str(tid) for tid in only_ticket_ids}
+                tickets = [t for t in tickets if str(t.get('id')) in only_ticket_ids]
             resultado["total_tickets_revisados"] = len(tickets)
 
+            # Reprogramar el próximo vencimiento de cada ticket revisado
+            if deadline_queue.running:
+                deadline_queue.load_config()
+                deadline_queue.schedule_tickets(tickets, full=only_ticket_ids is None, evaluated=True)
+
             if not tickets:
                 logger.info("No hay tickets asignados para revisar")
                 return resultado
@@ -476,9 +572,11 @@ class TicketManager:
             logger.info(f"⏰ Pre-alerta: {pre_alert_threshold} minutos (aviso {pre_alert_minutes} min antes)")
             logger.info("="*60)
 
-            # Obtener hora actual en Argentina
-            tz_argentina = pytz.timezone(TIMEZONE)
-            now = datetime.now(tz_argentina)
+            tz_argentina = ctx.tz
+            now = ctx.now
+
+            # Tickets locales para anti-spam, en una sola consulta
+            local_tickets = IncidentsInterface.find_by_ticket_ids(t.get('id') for t in tickets)
 
             # Diccionarios para agrupar tickets por operador
             tickets_por_operador = defaultdict(list)       # Tickets vencidos
@@ -518,8 +616,7 @@ class TicketManager:
                     minutes_elapsed = int(time_since_creation.total_seconds() / 60)
 
                     # Verificar si el ticket está en estado OutHouse (ID 6)
-                    from app.utils.constants import OUTHOUSE_STATUS_ID
-                    OUTHOUSE_NO_ALERT_MINUTES = ConfigHelper.get_outhouse_no_alert_minutes()
+                    OUTHOUSE_NO_ALERT_MINUTES = ctx.thresholds['outhouse_no_alert']
                     if status_id == OUTHOUSE_STATUS_ID:
                         if minutes_since_update < OUTHOUSE_NO_ALERT_MINUTES:
                             logger.info(f"🏠 Ticket {ticket_id} en estado OutHouse - No se alerta hasta {OUTHOUSE_NO_ALERT_MINUTES} minutos ({minutes_since_update} min transcurridos)")
@@ -527,21 +624,19 @@ class TicketManager:
 
                     # Verificar si el operador está en su horario de alertas
                     # En fin de semana, usar lógica de guardia (misma que asignación)
-                    is_weekend = now.weekday() >= 5
+                    is_weekend = ctx.is_weekend
                     operator_in_alert_schedule = False
 
                     if is_weekend:
-                        PERSONA_GUARDIA_FINDE = ConfigHelper.get_int('PERSONA_GUARDIA_FINDE', 10)
-                        FINDE_HORA_INICIO = ConfigHelper.get_int('FINDE_HORA_INICIO', 9)
-                        FINDE_HORA_FIN = ConfigHelper.get_int('FINDE_HORA_FIN', 21)
+                        PERSONA_GUARDIA_FINDE = ctx.weekend_guard
 
-                        if assigned_to == PERSONA_GUARDIA_FINDE and FINDE_HORA_INICIO <= now.hour < FINDE_HORA_FIN:
+                        if assigned_to == PERSONA_GUARDIA_FINDE and ctx.weekend_guard_on_duty():
                             operator_in_alert_schedule = True
                             logger.info(f"📅 Fin de semana - Operador de guardia {assigned_to} en horario ({now.hour}:{now.minute:02d})")
                         else:
                             logger.info(f"⏰ Fin de semana - Ticket {ticket_id} asignado a {assigned_to} (guardia: {PERSONA_GUARDIA_FINDE}) - omitido")
                     else:
-                        operator_in_alert_schedule = ScheduleHelper.is_operator_available(assigned_to, schedule_type='alert', current_time=now)
+                        operator_in_alert_schedule = ctx.is_available(assigned_to, schedule_type='alert')
 
                     if not operator_in_alert_schedule:
                         if not is_weekend:
@@ -549,7 +644,7 @@ class TicketManager:
                         continue
 
                     # Buscar ticket local para anti-spam
-                    local_ticket = IncidentsInterface.find_by_ticket_id(str(ticket_id))
+                    local_ticket = local_tickets.get(str(ticket_id))
 
                     # --- ALERTA DE TICKET VENCIDO ---
                     if minutes_since_update >= threshold_minutes:
@@ -586,22 +681,20 @@ class TicketManager:
                         if not should_notify:
                             continue
 
-                        # Obtener información del cliente
-                        customer_info = self.splynx.search_customer(str(customer_id))
-                        customer_name = customer_info.get('name', 'Cliente desconocido') if customer_info else 'Cliente desconocido'
-
-                        operator_name = whatsapp_service.get_operator_name(assigned_to)
+                        operator_name = ctx.operator_name(assigned_to)
 
+                        # customer_name se resuelve en paralelo después del loop
                         ticket_data = {
                             'id': ticket_id,
                             'subject': subject,
-                            'customer_name': customer_name,
+                            'customer_id': customer_id,
+                            'customer_name': None,
                             'created_at': created_at_str,
                             'minutes_elapsed': minutes_elapsed,
                             'operator_name': operator_name
                         }
 
-                        if whatsapp_service.get_operator_phone(assigned_to):
+                        if ctx.operator_phone(assigned_to):
                             tickets_por_operador[assigned_to].append(ticket_data)
                             logger.info(f"📋 Ticket {ticket_id} agregado a lista vencidos de {operator_name} - {minutes_elapsed} min")
                         else:
@@ -620,21 +713,19 @@ class TicketManager:
                         if local_ticket and local_ticket.pre_alert_sent_at is None:
                             resultado["tickets_pre_alerta"] += 1
 
-                            customer_info = self.splynx.search_customer(str(customer_id))
-                            customer_name = customer_info.get('name', 'Cliente desconocido') if customer_info else 'Cliente desconocido'
-
-                            operator_name = whatsapp_service.get_operator_name(assigned_to)
+                            operator_name = ctx.operator_name(assigned_to)
 
                             ticket_data = {
                                 'id': ticket_id,
                                 'subject': subject,
-                                'customer_name': customer_name,
+                                'customer_id': customer_id,
+                                'customer_name': None,
                                 'created_at': created_at_str,
                                 'minutes_elapsed': minutes_since_update,
                                 'operator_name': operator_name
                             }
 
-                            if whatsapp_service.get_operator_phone(assigned_to):
+                            if ctx.operator_phone(assigned_to):
                                 pre_alert_por_operador[assigned_to].append(ticket_data)
                                 logger.info(f"⏰ Ticket {ticket_id} agregado a pre-alerta de {operator_name} - {minutes_since_update} min (vence en ~{threshold_minutes - minutes_since_update} min)")
                             else:
@@ -651,6 +742,11 @@ class TicketManager:
                     logger.error(f"❌ Error procesando ticket {ticket_id}: {e}")
                     resultado["errores"] += 1
 
+            # Resolver nombres de clientes en paralelo (una llamada por cliente distinto)
+            self._fill_customer_names(
+                list(pre_alert_por_operador.values()) + list(tickets_por_operador.values())
+            )
+
             # Enviar alertas agrupadas por operador (si WhatsApp está habilitado)
             if ConfigHelper.is_whatsapp_enabled():
                 logger.info("="*60)
@@ -668,7 +764,7 @@ class TicketManager:
                         # Actualizar pre_alert_sent_at en cada ticket local
                         for ticket_data in tickets_list:
                             tid = str(ticket_data['id'])
-                            local_t = IncidentsInterface.find_by_ticket_id(tid)
+                            local_t = local_tickets.get(tid)
                             if local_t:
                                 local_t.pre_alert_sent_at = datetime.now(tz_argentina).replace(tzinfo=None)
                                 db.session.commit()
@@ -703,7 +799,7 @@ class TicketManager:
                         # Actualizar last_alert_sent_at en IncidentsDetection
                         for ticket_data in tickets_list:
                             tid = str(ticket_data['id'])
-                            local_t = IncidentsInterface.find_by_ticket_id(tid)
+                            local_t = local_tickets.get(tid)
                             if local_t:
                                 now_naive = datetime.now(tz_argentina).replace(tzinfo=None)
                                 if not local_t.first_alert_sent_at:
@@ -756,9 +852,10 @@ class TicketManager:
         except Exception as e:
             logger.error(f"❌ Error general en revisión de tickets: {e}")
             resultado["errores"] = resultado["total_tickets_revisados"]
+            resultado["error"] = str(e)
             return resultado
 
-    def send_end_of_shift_notifications(self):
+    def send_end_of_shift_notifications(self, person_ids=None):
         """Envía notificaciones de resumen 1 hora antes del fin de turno
         
         Verifica si algún operador está a 1 hora de terminar su turno y le envía
@@ -766,6 +863,11 @@ class TicketManager:
         
         Solo se ejecuta de lunes a viernes.
         
+        Args:
+            person_ids: Operadores del trigger de turno que disparó la corrida. Con
+                        filtro se acepta una demora de hasta MISFIRE_GRACE_SECONDS
+                        (el trigger puede correr tarde); sin filtro, ±2 minutos.
+        
         Returns:
             dict: Resumen de la operación con estadísticas
         """
@@ -784,6 +886,10 @@ class TicketManager:
             "detalles": []
         }
         
+        if self._splynx_circuit_open('send_end_of_shift_notifications'):
+            resultado["skipped"] = "splynx_circuit_open"
+            return resultado
+        
         try:
             # Obtener hora actual en Argentina
             tz_argentina = pytz.timezone(TIMEZONE)
@@ -809,6 +915,10 @@ class TicketManager:
             # Obtener todos los operadores activos desde BD (incluyendo pausados, ya que necesitan notificación de fin de turno)
             from app.interface.interfaces import OperatorConfigInterface
             operators = [op for op in OperatorConfigInterface.get_all() if op.is_active]
+            if person_ids is not None:
+                operators = [op for op in operators if op.person_id in person_ids]
+            from app.utils.shift_triggers import MISFIRE_GRACE_SECONDS
+            late_tolerance = MISFIRE_GRACE_SECONDS // 60 if person_ids is not None else 2
             
             # Verificar cada operador
             for operator in operators:
@@ -856,17 +966,17 @@ class TicketManager:
                     logger.debug(f"   {operator_name}: Turno {start_time_str}-{end_time_str}, notificar a las {notification_hour:02d}:{notification_minute:02d}")
                     logger.debug(f"   En turno: {is_in_shift}, Hora actual: {current_hour:02d}:{current_minute:02d}")
                     
-                    # Verificar si es el momento exacto de enviar la notificación (con margen de ±2 minutos)
-                    time_diff = abs(current_minutes - notification_minutes)
+                    # Verificar si es el momento de enviar la notificación (2 minutos antes, hasta late_tolerance después)
+                    time_diff = current_minutes - notification_minutes
                     
                     logger.debug(f"   Diferencia: {time_diff} minutos")
                     
                     # IMPORTANTE: Solo notificar si está en turno Y es el momento correcto
-                    if is_in_shift and time_diff <= 2:  # Margen de 2 minutos
+                    if is_in_shift and -2 <= time_diff <= late_tolerance:
                         logger.info(f"🔔 Es momento de notificar a {operator_name} (turno termina a las {end_time_str})")
                         
                         # Obtener todos los tickets asignados a este operador
-                        all_tickets = self.splynx.get_assigned_tickets(group_id=SPLYNX_SUPPORT_GROUP_ID)
+                        all_tickets = get_open_tickets(self.splynx, SPLYNX_SUPPORT_GROUP_ID, assigned=True)
                         operator_tickets = [
                             ticket for ticket in all_tickets 
                             if int(ticket.get('assign_to', 0)) == person_id
@@ -874,17 +984,19 @@ class TicketManager:
                         
                         logger.info(f"📋 {operator_name} tiene {len(operator_tickets)} ticket(s) asignado(s)")
                         
-                        # Preparar datos de tickets para el mensaje
+                        # Preparar datos de tickets para el mensaje (clientes resueltos en paralelo)
+                        customer_names = fetch_customer_names(
+                            (ticket.get('customer_id', 'N/A') for ticket in operator_tickets),
+                            self.splynx
+                        )
                         tickets_data = []
                         for ticket in operator_tickets:
-                            customer_id = ticket.get('customer_id', 'N/A')
-                            customer_info = self.splynx.search_customer(str(customer_id))
-                            customer_name = customer_info.get('name', 'Cliente desconocido') if customer_info else 'Cliente desconocido'
+                            customer_id = str(ticket.get('customer_id', 'N/A'))
                             
                             tickets_data.append({
                                 'id': ticket.get('id'),
                                 'subject': ticket.get('subject', 'Sin asunto'),
-                                'customer_name': customer_name,
+                                'customer_name': customer_names.get(customer_id, 'Cliente desconocido'),
                                 'status': ticket.get('status', 'Abierto')
                             })
                         
@@ -958,6 +1070,10 @@ class TicketManager:
             "detalles": []
         }
         
+        if self._splynx_circuit_open('assign_unassigned_tickets'):
+            resultado["skipped"] = "splynx_circuit_open"
+            return resultado
+        
         try:
             # Obtener tickets no asignados del grupo
             tickets = self.splynx.get_unassigned_tickets(group_id)
@@ -971,6 +1087,18 @@ class TicketManager:
             logger.info(f"🎫 ASIGNANDO {len(tickets)} TICKETS NO ASIGNADOS")
             logger.info("="*60)
             
+            ctx = JobContext.build()
+            
+            # Las asignaciones se hacen en orden (el round-robin depende del contador
+            # actualizado), pero los nombres de clientes se resuelven en paralelo antes
+            from app.utils.config_helper import ConfigHelper
+            customer_names = {}
+            if ConfigHelper.is_whatsapp_enabled():
+                customer_names = fetch_customer_names(
+                    (ticket.get('customer_id') for ticket in tickets),
+                    self.splynx
+                )
+            
             for ticket in tickets:
                 ticket_id = ticket.get('id')
                 subject = ticket.get('subject', 'Sin asunto')
@@ -982,7 +1110,7 @@ class TicketManager:
                     
                     # Obtener la siguiente persona a asignar SIN incrementar el contador
                     # Pasar la nota para verificar etiquetas [TT] o [TD]
-                    assigned_person_id = self.get_next_assignee(ticket_note=note)
+                    assigned_person_id = self.get_next_assignee(ticket_note=note, ctx=ctx)
                     
                     # Actualizar el ticket en Splynx
                     response = self.splynx.update_ticket_assignment(ticket_id, assigned_person_id)
@@ -990,6 +1118,7 @@ class TicketManager:
                     if response:
                         # Solo incrementar el contador si la asignación fue exitosa
                         AssignmentTrackerInterface.increment_count(assigned_person_id)
+                        record_assignment(ticket_id, assigned_person_id)
 
                         # Registrar asignación en historial
                         TicketResponseMetricsInterface.add_assignment_to_history(
@@ -1000,9 +1129,7 @@ class TicketManager:
 
                         # Registrar en historial de reasignaciones
                         from app.interface.reassignment_history import ReassignmentHistoryInterface
-                        from app.interface.interfaces import OperatorConfigInterface
-                        op_config = OperatorConfigInterface.get_by_person_id(assigned_person_id)
-                        op_name = op_config.name if op_config else f'Operador {assigned_person_id}'
+                        op_name = ctx.operator_name(assigned_person_id)
                         ReassignmentHistoryInterface.create({
                             'ticket_id': str(ticket_id),
                             'from_operator_id': None,
@@ -1020,9 +1147,8 @@ class TicketManager:
                         notificacion_enviada = False
                         
                         if ConfigHelper.is_whatsapp_enabled():
-                            # Obtener información del cliente para la notificación
-                            customer_info = self.splynx.search_customer(str(customer_id))
-                            customer_name = customer_info.get('name', 'Cliente desconocido') if customer_info else 'Cliente desconocido'
+                            # Nombre del cliente pre-cargado antes del loop
+                            customer_name = customer_names.get(str(customer_id), 'Cliente desconocido')
                             
                             # Obtener prioridad del ticket
                             priority = ticket.get('priority', 'medium')
@@ -1097,6 +1223,10 @@ class TicketManager:
             "detalles": []
         }
         
+        if self._splynx_circuit_open('auto_unassign_after_shift'):
+            resultado["skipped"] = "splynx_circuit_open"
+            return resultado
+        
         try:
             # Obtener hora actual en Argentina
             tz_argentina = pytz.timezone('America/Argentina/Buenos_Aires')
@@ -1110,7 +1240,7 @@ class TicketManager:
             
             # Obtener todos los tickets asignados (status != 3 = no cerrados)
             from app.utils.constants import SPLYNX_SUPPORT_GROUP_ID
-            tickets = self.splynx.get_assigned_tickets(group_id=SPLYNX_SUPPORT_GROUP_ID)
+            tickets = get_open_tickets(self.splynx, SPLYNX_SUPPORT_GROUP_ID, assigned=True)
             
             if not tickets:
                 logger.info("ℹ️  No hay tickets asignados para revisar")
@@ -1119,6 +1249,7 @@ class TicketManager:
             resultado["tickets_revisados"] = len(tickets)
             logger.info(f"📋 Revisando {len(tickets)} tickets asignados")
             
+            to_unassign = []
             for ticket in tickets:
                 ticket_id = ticket.get('id')
                 assigned_to = ticket.get('assign_to') or ticket.get('assigned_to')
@@ -1166,58 +1297,70 @@ class TicketManager:
                             break
                 
                 if should_unassign:
-                    # Desasignar ticket (assigned_to = 0 o NULL)
-                    response = self.splynx.update_ticket_assignment(ticket_id, 0)
+                    to_unassign.append((ticket_id, assigned_to, subject, operator_name, shift_end_time))
+            
+            # Desasignar en Splynx en paralelo (assigned_to = 0 o NULL)
+            client = AsyncSplynxClient(self.splynx)
+            responses = client.fan_out(
+                'update_ticket_assignment',
+                [(ticket_id, 0) for ticket_id, *_ in to_unassign]
+            )
+            
+            for (ticket_id, assigned_to, subject, operator_name, shift_end_time), response in zip(to_unassign, responses):
+                if isinstance(response, Exception):
+                    logger.warning(f"   ⚠️ Splynx falló al desasignar ticket {ticket_id}: {response}")
+                    response = None
+                
+                if response:
+                    resultado["tickets_desasignados"] += 1
+                    record_assignment(ticket_id, 0)
                     
-                    if response:
-                        resultado["tickets_desasignados"] += 1
-                        
-                        # Registrar en el nuevo historial de reasignaciones
-                        from app.interface.reassignment_history import ReassignmentHistoryInterface
-                        ReassignmentHistoryInterface.create({
-                            'ticket_id': str(ticket_id),
-                            'from_operator_id': assigned_to,
-                            'from_operator_name': operator_name,
-                            'to_operator_id': None,
-                            'to_operator_name': 'Sin asignar',
-                            'reason': f'Desasignación automática 1 hora después del fin de turno ({shift_end_time})',
-                            'reassignment_type': 'auto_unassign_after_shift',
-                            'created_by': 'system'
-                        })
-                        
-                        # Enviar mensaje de WhatsApp al operador notificando la desasignación
-                        try:
-                            from app.interface.interfaces import OperatorConfigInterface
-                            operator_config = OperatorConfigInterface.get_by_person_id(assigned_to)
-                            if operator_config and operator_config.whatsapp_number:
-                                from app.services.whatsapp_service import WhatsAppService
-                                whatsapp = WhatsAppService()
-                                
-                                message = f"🔄 *Ticket Desasignado Automáticamente*\n\n"
-                                message += f"📋 Ticket #{ticket_id}\n"
-                                message += f"📝 Asunto: {subject}\n"
-                                message += f"⏰ Tu turno terminó a las {shift_end_time}\n"
-                                message += f"🔄 El ticket ha sido devuelto al pool de tickets sin asignar\n"
-                                message += f"✅ Será reasignado en el próximo turno"
-                                
-                                whatsapp.send_message(operator_config.whatsapp_number, message)
-                                logger.info(f"   📱 Mensaje de desasignación enviado a {operator_name}")
-                        except Exception as e:
-                            logger.warning(f"   ⚠️ No se pudo enviar mensaje de WhatsApp: {e}")
-                        
-                        logger.info(f"   ✅ Ticket {ticket_id} desasignado de {operator_name}")
-                        
-                        resultado["detalles"].append({
-                            "ticket_id": ticket_id,
-                            "subject": subject,
-                            "previous_assigned_to": assigned_to,
-                            "operator_name": operator_name,
-                            "shift_end_time": shift_end_time,
-                            "estado": "DESASIGNADO"
-                        })
-                    else:
-                        resultado["errores"] += 1
-                        logger.error(f"   ❌ Error al desasignar ticket {ticket_id}")
+                    # Registrar en el nuevo historial de reasignaciones
+                    from app.interface.reassignment_history import ReassignmentHistoryInterface
+                    ReassignmentHistoryInterface.create({
+                        'ticket_id': str(ticket_id),
+                        'from_operator_id': assigned_to,
+                        'from_operator_name': operator_name,
+                        'to_operator_id': None,
+                        'to_operator_name': 'Sin asignar',
+                        'reason': f'Desasignación automática 1 hora después del fin de turno ({shift_end_time})',
+                        'reassignment_type': 'auto_unassign_after_shift',
+                        'created_by': 'system'
+                    })
+                    
+                    # Enviar mensaje de WhatsApp al operador notificando la desasignación
+                    try:
+                        from app.interface.interfaces import OperatorConfigInterface
+                        operator_config = OperatorConfigInterface.get_by_person_id(assigned_to)
+                        if operator_config and operator_config.whatsapp_number:
+                            from app.services.whatsapp_service import WhatsAppService
+                            whatsapp = WhatsAppService()
+                            
+                            message = f"🔄 *Ticket Desasignado Automáticamente*\n\n"
+                            message += f"📋 Ticket #{ticket_id}\n"
+                            message += f"📝 Asunto: {subject}\n"
+                            message += f"⏰ Tu turno terminó a las {shift_end_time}\n"
+                            message += f"🔄 El ticket ha sido devuelto al pool de tickets sin asignar\n"
+                            message += f"✅ Será reasignado en el próximo turno"
+                            
+                            whatsapp.send_message(operator_config.whatsapp_number, message)
+                            logger.info(f"   📱 Mensaje de desasignación enviado a {operator_name}")
+                    except Exception as e:
+                        logger.warning(f"   ⚠️ No se pudo enviar mensaje de WhatsApp: {e}")
+                    
+                    logger.info(f"   ✅ Ticket {ticket_id} desasignado de {operator_name}")
+                    
+                    resultado["detalles"].append({
+                        "ticket_id": ticket_id,
+                        "subject": subject,
+                        "previous_assigned_to": assigned_to,
+                        "operator_name": operator_name,
+                        "shift_end_time": shift_end_time,
+                        "estado": "DESASIGNADO"
+                    })
+                else:
+                    resultado["errores"] += 1
+                    logger.error(f"   ❌ Error al desasignar ticket {ticket_id}")
             
             logger.info("="*60)
             logger.info(f"✅ DESASIGNACIÓN AUTOMÁTICA COMPLETADA")
@@ -1234,6 +1377,27 @@ class TicketManager:
             logger.error(traceback.format_exc())
             return resultado
     
+    def _splynx_circuit_open(self, job_name: str) -> bool:
+        """True si el circuit breaker de Splynx está abierto: el job se omite en lugar de esperar timeouts"""
+        if self.splynx.is_circuit_open():
+            logger.warning(f"🔴 Splynx no disponible (circuito abierto) - {job_name} omitido hasta la próxima corrida")
+            return True
+        return False
+
+    def _fill_customer_names(self, ticket_groups):
+        """Completa 'customer_name' de los ticket_data pendientes resolviendo todos los clientes en paralelo
+
+        Args:
+            ticket_groups: Iterable de listas de ticket_data con 'customer_id'
+        """
+        pending = [t for group in ticket_groups for t in group if t.get('customer_name') is None]
+        if not pending:
+            return
+
+        customer_names = fetch_customer_names((t.get('customer_id') for t in pending), self.splynx)
+        for ticket_data in pending:
+            ticket_data['customer_name'] = customer_names.get(str(ticket_data.get('customer_id')), 'Cliente desconocido')
+
     def get_operator_name(self, person_id: int) -> str:
         """Obtiene el nombre del operador por su ID desde la BD"""
         from app.interface.interfaces import OperatorConfigInterface
@@ -0,0 +1,251 @@
+"""
+Pipeline de tickets nuevos: webhook -> incidente -> ticket en Splynx.
+
+Sin el pipeline, un ticket de Gestión Real espera al job process_webhooks
+(cada 3 minutos) y luego a create_tickets. Con TICKET_PIPELINE_ENABLED
+(opt-in, deshabilitado por defecto), el endpoint /api/hooks/nuevo-ticket deja
+el id del hook en la cola de la etapa 'webhook'; cada etapa tiene su hilo, arma
+un lote con su cola y entrega su salida directamente a la cola de la siguiente:
+
+1. webhook:       process_pending_webhooks() -> ids de incidentes nuevos
+2. splynx_create: TicketManager.create_ticket(incident_ids=...) crea el ticket,
+                  lo asigna (assign_ticket_fairly) y notifica por WhatsApp
+
+La etapa 'webhook' usa debounce: arranca cuando pasan TICKET_PIPELINE_QUIET_MS
+sin llegadas nuevas, cuando junta TICKET_PIPELINE_MAX_BATCH webhooks o cuando
+el más viejo lleva TICKET_PIPELINE_MAX_WAIT_MS esperando (lo que ocurra
+primero). Una ráfaga de Gestión Real se procesa en una sola pasada.
+
+Ambas etapas corren bajo los mismos locks con nombre que los jobs programados,
+que siguen corriendo como red de seguridad: lo que el pipeline no pudo crear
+(Splynx caído, fuera de horario) queda pendiente en BD para ellos.
+
+Se mide la latencia de cada etapa desde la recepción del webhook
+(webhook_to_incident, incident_to_splynx y end_to_end = recepción -> ID de
+Splynx) y se expone en /api/system/pipeline.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.utils.job_metrics import percentile
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_SAMPLES = 500
+DEFAULT_QUIET_MS = 500
+DEFAULT_MAX_BATCH = 20
+DEFAULT_MAX_WAIT_MS = 3000
+LATENCY_METRICS = ('webhook_to_incident', 'incident_to_splynx', 'end_to_end')
+
+
+class TicketPipeline:
+    """Dos etapas con colas en memoria y un hilo por etapa"""
+
+    def __init__(self):
+        self._webhooks: "queue.Queue[tuple]" = queue.Queue()
+        self._incidents: "queue.Queue[tuple]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._app = None
+        self._threads: List[threading.Thread] = []
+        self._latencies: Dict[str, deque] = {m: deque(maxlen=LATENCY_SAMPLES) for m in LATENCY_METRICS}
+
+        self.received = 0
+        self.incidents_created = 0
+        self.tickets_created = 0
+        self.left_pending = 0
+        self.skipped_off_hours = 0
+        self.errors = 0
+        self.batches = {'webhook': 0, 'splynx_create': 0}
+        self.last_batch_size = {'webhook': 0, 'splynx_create': 0}
+        self.debounce = {
+            'quiet_ms': DEFAULT_QUIET_MS,
+            'max_batch': DEFAULT_MAX_BATCH,
+            'max_wait_ms': DEFAULT_MAX_WAIT_MS,
+        }
+        self.last_completed_at: Optional[datetime] = None
+
+    # --- ciclo de vida -------------------------------------------------
+
+    def start(self, app):
+        with self._lock:
+            if self._threads:
+                return
+            self._app = app
+            for name, target in (('webhook', self._webhook_loop), ('splynx_create', self._create_loop)):
+                thread = threading.Thread(target=target, name=f'pipeline-{name}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info("🚀 Pipeline de tickets iniciado")
+
+    def submit_webhook(self, app, hook_id: int, received_at: Optional[float] = None):
+        """Entrega un hook recién guardado a la etapa 'webhook' (no bloquea)"""
+        self.start(app)
+        with self._lock:
+            self.received += 1
+        self._webhooks.put((hook_id, received_at or time.monotonic()))
+
+    # --- etapas --------------------------------------------------------
+
+    @staticmethod
+    def _drain(source: queue.Queue, first, limit: int) -> list:
+        batch = [first]
+        while len(batch) < limit:
+            try:
+                batch.append(source.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _load_debounce(self):
+        from app.utils.config_helper import ConfigHelper
+        try:
+            with self._app.app_context():
+                settings = {
+                    'quiet_ms': max(ConfigHelper.get_int('TICKET_PIPELINE_QUIET_MS', DEFAULT_QUIET_MS), 0),
+                    'max_batch': max(ConfigHelper.get_int('TICKET_PIPELINE_MAX_BATCH', DEFAULT_MAX_BATCH), 1),
+                    'max_wait_ms': max(ConfigHelper.get_int('TICKET_PIPELINE_MAX_WAIT_MS', DEFAULT_MAX_WAIT_MS), 0),
+                }
+        except Exception as e:
+            logger.warning(f"⚠️ Pipeline: no se pudo leer la configuración de debounce, se usa la anterior: {e}")
+            return dict(self.debounce)
+        with self._lock:
+            self.debounce = settings
+        return settings
+
+    def _debounce(self, first) -> list:
+        """Junta webhooks hasta el período de silencio, el tamaño máximo o la latencia máxima"""
+        settings = self._load_debounce()
+        quiet = settings['quiet_ms'] / 1000
+        deadline = first[1] + settings['max_wait_ms'] / 1000
+        batch = [first]
+        while len(batch) < settings['max_batch']:
+            timeout = min(quiet, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._webhooks.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _record(self, metric: str, seconds: float):
+        with self._lock:
+            self._latencies[metric].append(seconds)
+
+    def _webhook_loop(self):
+        from app.services.webhook_processor import process_pending_webhooks
+        from app.utils.job_registry import is_business_hours
+
+        while True:
+            batch = self._debounce(self._webhooks.get())
+            try:
+                if not is_business_hours(self._app):
+                    # Mismo criterio que el job programado: fuera de horario no se crean tickets
+                    with self._lock:
+                        self.skipped_off_hours += len(batch)
+                    logger.info(f"🌙 Pipeline: {len(batch)} webhook(s) fuera de horario laboral - quedan para el scheduler")
+                    continue
+
+                with self._app.app_context():
+                    result = process_pending_webhooks()
+                done = time.monotonic()
+                hook_incidents = dict(result.get('hook_incidents') or {})
+                with self._lock:
+                    self.batches['webhook'] += 1
+                    self.last_batch_size['webhook'] = len(batch)
+                    self.incidents_created += len(hook_incidents)
+
+                for hook_id, received in batch:
+                    incident_id = hook_incidents.pop(hook_id, None)
+                    if incident_id is not None:
+                        self._record('webhook_to_incident', done - received)
+                        self._incidents.put((incident_id, received, done))
+                # Hooks viejos procesados en la misma corrida también siguen de largo
+                for incident_id in hook_incidents.values():
+                    self._incidents.put((incident_id, None, done))
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error(f"❌ Pipeline: error en etapa webhook: {e}")
+
+    def _create_loop(self):
+        from app.models.models import IncidentsDetection
+        from app.routes.thread_functions import get_splynx_service
+        from app.services.ticket_manager import TicketManager
+
+        while True:
+            batch = self._drain(self._incidents, self._incidents.get(), self.debounce['max_batch'])
+            incident_ids = [incident_id for incident_id, _, _ in batch]
+            try:
+                with self._app.app_context():
+                    TicketManager(get_splynx_service()).create_ticket(incident_ids=incident_ids)
+                    created = {
+                        row.id for row in IncidentsDetection.query.with_entities(IncidentsDetection.id).filter(
+                            IncidentsDetection.id.in_(incident_ids),
+                            IncidentsDetection.is_created_splynx.is_(True),
+                        )
+                    }
+                done = time.monotonic()
+
+                for incident_id, received, stage_done in batch:
+                    if incident_id not in created:
+                        continue
+                    self._record('incident_to_splynx', done - stage_done)
+                    if received is not None:
+                        self._record('end_to_end', done - received)
+
+                with self._lock:
+                    self.batches['splynx_create'] += 1
+                    self.last_batch_size['splynx_create'] = len(batch)
+                    self.tickets_created += len(created)
+                    self.left_pending += len(incident_ids) - len(created)
+                    self.last_completed_at = datetime.now()
+                if len(created) < len(incident_ids):
+                    logger.warning(f"⚠️ Pipeline: {len(incident_ids) - len(created)} incidente(s) sin crear - quedan para create_tickets")
+                logger.info(f"⚡ Pipeline: {len(created)}/{len(incident_ids)} ticket(s) creados en Splynx")
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error(f"❌ Pipeline: error en etapa splynx_create: {e}")
+
+    # --- métricas ------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = {}
+            for metric, samples in self._latencies.items():
+                values = sorted(samples)
+                latencies[metric] = {
+                    'samples': len(values),
+                    'last_ms': round(samples[-1] * 1000) if samples else None,
+                    'p50_ms': round(percentile(values, 50) * 1000) if values else None,
+                    'p95_ms': round(percentile(values, 95) * 1000) if values else None,
+                    'max_ms': round(values[-1] * 1000) if values else None,
+                }
+            return {
+                'running': bool(self._threads),
+                'queue_depth': {
+                    'webhook': self._webhooks.qsize(),
+                    'splynx_create': self._incidents.qsize(),
+                },
+                'received': self.received,
+                'incidents_created': self.incidents_created,
+                'tickets_created': self.tickets_created,
+                'left_pending': self.left_pending,
+                'skipped_off_hours': self.skipped_off_hours,
+                'errors': self.errors,
+                'batches': dict(self.batches),
+                'last_batch_size': dict(self.last_batch_size),
+                'debounce': dict(self.debounce),
+                'latency': latencies,
+                'last_completed_at': self.last_completed_at.isoformat() if self.last_completed_at else None,
+            }
+
+
+ticket_pipeline = TicketPipeline()
@@ -7,6 +7,7 @@ se reabre automáticamente en Splynx y se notifica al operador.
 from app.utils.config import db
 from app.models.models import IncidentsDetection
 from app.services.splynx_services_singleton import SplynxServicesSingleton
+from app.services.splynx_async_client import AsyncSplynxClient
 from app.utils.config_helper import ConfigHelper
 from app.utils.logger import get_logger
 from app.interface.webhook_interface import HookCierreTicketInterface
@@ -40,8 +41,11 @@ def check_and_reopen_tickets():
         logger.info(f"🔍 Verificando {len(tickets_in_window)} tickets en ventana de reapertura (ventana: {window_minutes} min)")
 
         now = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+        # Cierres de GR de todos los tickets en ventana, en una sola consulta
+        gr_closed = HookCierreTicketInterface.get_closed_numeros(t.numero_ticket_gr for t in tickets_in_window)
         reopened_count = 0
         closed_count = 0
+        to_reopen = []
 
         for ticket in tickets_in_window:
             try:
@@ -66,9 +70,7 @@ def check_and_reopen_tickets():
                     continue
 
                 # Ventana expirada - verificar si hay cierre de GR
-                gr_closure = HookCierreTicketInterface.find_by_numero_ticket(ticket.numero_ticket_gr)
-
-                if gr_closure:
+                if ticket.numero_ticket_gr in gr_closed:
                     # Caso 2: Cierre de GR llegó durante la ventana → cerrar normalmente
                     ticket.is_closed = True
                     ticket.closed_at = datetime.now()
@@ -80,14 +82,28 @@ def check_and_reopen_tickets():
                     closed_count += 1
                     logger.info(f"✅ Ticket {ticket.Ticket_ID} cerrado normalmente (cierre GR encontrado dentro de ventana)")
                 else:
-                    # Caso 1: Sin cierre de GR → reabrir en Splynx
-                    _reopen_ticket(ticket)
-                    reopened_count += 1
+                    # Caso 1: Sin cierre de GR → reabrir en Splynx (en paralelo, abajo)
+                    to_reopen.append(ticket)
 
             except Exception as e:
                 logger.error(f"❌ Error procesando ticket {ticket.Ticket_ID} en reopen checker: {e}")
                 continue
 
+        if to_reopen and SplynxServicesSingleton().is_circuit_open():
+            # Sin Splynx no se puede reabrir: quedan en ventana y se reintenta en la próxima corrida
+            logger.warning(f"🔴 Splynx no disponible (circuito abierto) - {len(to_reopen)} reaperturas diferidas")
+            to_reopen = []
+
+        if to_reopen:
+            client = AsyncSplynxClient(SplynxServicesSingleton())
+            results = client.fan_out('reopen_ticket', [(t.Ticket_ID,) for t in to_reopen])
+            for ticket, result in zip(to_reopen, results):
+                try:
+                    if _reopen_ticket(ticket, result):
+                        reopened_count += 1
+                except Exception as e:
+                    logger.error(f"❌ Error procesando ticket {ticket.Ticket_ID} en reopen checker: {e}")
+
         db.session.commit()
         logger.info(f"🔄 Reopen checker completado: {reopened_count} reabiertos, {closed_count} cerrados normalmente")
 
@@ -103,17 +119,16 @@ def check_and_reopen_tickets():
         return {'checked': 0, 'reopened': 0, 'closed': 0, 'error': str(e)}
 
 
-def _reopen_ticket(ticket):
-    """Reabre un ticket en Splynx y notifica al operador."""
+def _reopen_ticket(ticket, result) -> bool:
+    """
+    Aplica el resultado de la reapertura en Splynx: actualiza el ticket local y
+    notifica al operador. `result` es la respuesta de reopen_ticket (o la excepción).
+    """
     ticket_id = ticket.Ticket_ID
 
-    # Reabrir en Splynx
-    splynx = SplynxServicesSingleton()
-    result = splynx.reopen_ticket(ticket_id)
-
-    if not result:
+    if isinstance(result, Exception) or not result:
         logger.error(f"❌ No se pudo reabrir ticket {ticket_id} en Splynx")
-        return
+        return False
 
     # Actualizar estado local
     ticket.recreado = (ticket.recreado or 0) + 1
@@ -133,3 +148,5 @@ def _reopen_ticket(ticket):
             )
         except Exception as e:
             logger.warning(f"⚠️ No se pudo enviar notificación de reapertura para ticket {ticket_id}: {e}")
+
+    return True
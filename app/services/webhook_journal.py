@@ -0,0 +1,378 @@
+"""
+Journal local de webhooks con group commit.
+
+Con WEBHOOK_INGEST_MODE = 'journal', /api/hooks/nuevo-ticket y
+/api/hooks/cierre-ticket no abren una transacción por request: agregan el
+payload normalizado a un journal en disco (una línea JSON + fsync) y
+responden. Un hilo de fondo inserta lo acumulado en hook_nuevo_ticket /
+hook_cierre_ticket en una sola transacción cuando se juntan
+WEBHOOK_GROUP_COMMIT_SIZE payloads o el más viejo espera
+WEBHOOK_GROUP_COMMIT_MAX_MS.
+
+Archivos: un segmento por proceso (journal-<pid>-<n>.jsonl) con flock
+exclusivo mientras el proceso vive. En cada flush se cierra el segmento actual
+y se borra cuando la transacción hace commit. Si el proceso muere, el lock se
+libera y otro proceso reinserta el segmento al arrancar (recover); cada línea
+lleva un id único (journal_id en la tabla) y las ya guardadas se omiten.
+
+WEBHOOK_JOURNAL_DIR tiene que ser una ruta absoluta en un volumen persistente
+(en Docker, /app/data/webhook_journal); sin ella el modo journal no se activa,
+porque lo ya respondido con 200 se perdería al recrear el contenedor.
+
+Si la transacción del lote falla se reintenta fila por fila: las filas que la
+BD rechaza (datos inválidos) pasan a dead-letter.jsonl con el error y las que
+fallan por la conexión vuelven al journal, así una fila mala no frena al resto.
+
+Los nuevos tickets guardados por el flusher siguen al pipeline de tickets con
+su hora de recepción original.
+"""
+
+import atexit
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.constants import WEBHOOK_JOURNAL_DIR
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KINDS = ('nuevo', 'cierre')
+RETRY_SECONDS = 5
+DEAD_LETTER_FILE = 'dead-letter.jsonl'
+
+
+def _open_locked(path: str):
+    """Abre un segmento con flock exclusivo; None si otro proceso vivo lo tiene"""
+    handle = open(path, 'ab')
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def _journal_line(entry: dict) -> bytes:
+    return json.dumps(
+        {'id': entry['id'], 'kind': entry['kind'], 'data': entry['data'],
+         'received_at': entry['received_at'].isoformat()},
+        ensure_ascii=False, default=str
+    ).encode() + b'\n'
+
+
+def _read_segment(path: str) -> List[dict]:
+    entries = []
+    with open(path, 'rb') as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+                entry['received_at'] = datetime.fromisoformat(entry['received_at'])
+            except (ValueError, KeyError, TypeError):
+                # Línea cortada por una caída a mitad de escritura: nunca se respondió OK
+                logger.warning(f"⚠️ Journal {os.path.basename(path)}: línea inválida descartada")
+                continue
+            if entry.get('kind') in KINDS:
+                entries.append(entry)
+    return entries
+
+
+class WebhookJournal:
+    """Journal por proceso + flusher con group commit"""
+
+    def __init__(self, directory: str = WEBHOOK_JOURNAL_DIR):
+        self.directory = directory
+        self._lock = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._app = None
+        self._thread: Optional[threading.Thread] = None
+        self._segment: Optional[Tuple[str, Any]] = None
+        self._sealed: List[Tuple[str, Any]] = []
+        self._segment_no = 0
+        self._pending: List[dict] = []
+        self._size = 50
+        self._max_wait = 0.2
+
+        self.journaled = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.recovered = 0
+        self.errors = 0
+        self.dead_lettered = 0
+        self.last_batch = 0
+        self.last_flush_at: Optional[datetime] = None
+
+    # --- escritura -----------------------------------------------------
+
+    def append(self, app, kind: str, data: dict, received_mono: Optional[float] = None):
+        """
+        Agrega un payload normalizado al journal (durable al volver).
+
+        Requiere app context (lee la configuración de group commit).
+        """
+        from app.utils.config_helper import ConfigHelper
+
+        size = max(ConfigHelper.get_int('WEBHOOK_GROUP_COMMIT_SIZE', 50), 1)
+        max_wait = max(ConfigHelper.get_int('WEBHOOK_GROUP_COMMIT_MAX_MS', 200), 0) / 1000
+        received_at = datetime.now().replace(microsecond=0)
+        entry_id = uuid.uuid4().hex
+        line = _journal_line({'id': entry_id, 'kind': kind, 'data': data, 'received_at': received_at})
+
+        with self._lock:
+            self._ensure_process(app)
+            if self._segment is None:
+                self._open_segment()
+            handle = self._segment[1]
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+            self._size, self._max_wait = size, max_wait
+            self._pending.append({
+                'id': entry_id,
+                'kind': kind,
+                'data': data,
+                'received_at': received_at,
+                'received_mono': received_mono or time.monotonic(),
+            })
+            self.journaled += 1
+            self._lock.notify()
+
+    def _ensure_process(self, app):
+        """Arranca el flusher en este proceso (y lo re-arma después de un fork)"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._app = app
+        self._segment = None
+        self._sealed = []
+        self._pending = []
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._flush_loop, name='webhook-journal', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+        logger.info(f"📒 Journal de webhooks activo en {self.directory} (pid {self._pid})")
+
+    def _open_segment(self):
+        self._segment_no += 1
+        path = os.path.join(self.directory, f'journal-{self._pid}-{self._segment_no}.jsonl')
+        handle = _open_locked(path)
+        if handle is None:
+            raise RuntimeError(f"No se pudo bloquear el journal {path}")
+        self._segment = (path, handle)
+
+    # --- flush ---------------------------------------------------------
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._lock.wait()
+                # Group commit: esperar a completar el lote o a que venza la latencia máxima
+                while len(self._pending) < self._size:
+                    remaining = self._pending[0]['received_mono'] + self._max_wait - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._lock.wait(remaining)
+            if not self.flush():
+                time.sleep(RETRY_SECONDS)
+
+    def flush(self) -> bool:
+        """
+        Inserta todo lo pendiente en una transacción (o fila por fila si falla).
+
+        Returns:
+            False si quedaron webhooks sin guardar por un error transitorio (siguen en el journal)
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending or self._app is None:
+                    return True
+                batch, self._pending = self._pending, []
+                segments = self._sealed + ([self._segment] if self._segment else [])
+                self._sealed, self._segment = [], None
+
+            saved, retry = self._persist(self._app, batch)
+
+            if len(retry) == len(batch):
+                # Nada se movió (BD caída): el lote queda igual, con sus segmentos
+                with self._lock:
+                    self._pending = batch + self._pending
+                    self._sealed = segments + self._sealed
+                    self.errors += 1
+                logger.error(f"❌ Journal: no se pudieron guardar {len(batch)} webhook(s) - se reintenta en {RETRY_SECONDS}s")
+                return False
+
+            with self._lock:
+                if retry:
+                    self.errors += 1
+                    try:
+                        # Los que faltan pasan a un segmento nuevo para poder borrar los viejos
+                        self._write_lines(b''.join(_journal_line(entry) for entry in retry))
+                    except (OSError, RuntimeError) as e:
+                        logger.error(f"❌ Journal: no se pudo re-escribir {len(retry)} webhook(s), se conservan los segmentos: {e}")
+                        self._sealed = segments + self._sealed
+                        segments = []
+                    self._pending = retry + self._pending
+                self.flushed += len(saved)
+                self.flushes += 1
+                self.last_batch = len(saved)
+                self.last_flush_at = datetime.now()
+
+            for path, handle in segments:
+                os.remove(path)
+                handle.close()
+        logger.debug(f"📒 Journal: {len(saved)} webhook(s) guardados")
+        self._hand_off(saved)
+        return not retry
+
+    def _write_lines(self, lines: bytes):
+        """Escribe líneas en el segmento actual con fsync (llamar con self._lock tomado)"""
+        if self._segment is None:
+            self._open_segment()
+        handle = self._segment[1]
+        handle.write(lines)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    def _persist(self, app, entries: List[dict]) -> Tuple[List[Tuple[dict, int]], List[dict]]:
+        """
+        Guarda entradas del journal: un lote y, si falla, fila por fila.
+
+        Las filas rechazadas por la BD van a dead-letter.
+        Returns: ([(entrada, id del registro)] guardadas, entradas a reintentar)
+        """
+        from app.interface.webhook_interface import WebhookJournalInterface
+
+        # Los ids se leen dentro del app context: al salir la sesión se cierra
+        with app.app_context():
+            records = WebhookJournalInterface.insert_batch(entries)
+            if records is not None:
+                return [(entry, record.id) for entry, record in zip(entries, records)], []
+            saved, rejected, retry = WebhookJournalInterface.insert_each(entries)
+            saved = [(entry, record.id) for entry, record in saved]
+
+        if rejected:
+            try:
+                self._dead_letter(rejected)
+            except OSError as e:
+                logger.error(f"❌ Journal: no se pudo escribir dead-letter, {len(rejected)} webhook(s) quedan para reintentar: {e}")
+                retry += [entry for entry, _ in rejected]
+        return saved, retry
+
+    def _dead_letter(self, rejected: List[Tuple[dict, str]]):
+        """Aparta en dead-letter.jsonl los webhooks que la BD rechaza, con el error"""
+        lines = b''.join(
+            json.dumps(
+                {'id': entry.get('id'), 'kind': entry['kind'], 'data': entry['data'],
+                 'received_at': entry['received_at'].isoformat(), 'error': error[:500], 'failed_at': datetime.now().isoformat()},
+                ensure_ascii=False, default=str
+            ).encode() + b'\n'
+            for entry, error in rejected
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, DEAD_LETTER_FILE), 'ab') as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+        with self._lock:
+            self.dead_lettered += len(rejected)
+        logger.error(f"☠️ Journal: {len(rejected)} webhook(s) rechazados por la BD movidos a {DEAD_LETTER_FILE}")
+
+    def _hand_off(self, saved: List[Tuple[dict, int]]):
+        """Los nuevos tickets guardados siguen al pipeline como si vinieran del endpoint"""
+        from app.services.ticket_pipeline import ticket_pipeline
+        from app.utils.config_helper import ConfigHelper
+
+        nuevos = [(entry, record_id) for entry, record_id in saved if entry['kind'] == 'nuevo']
+        if not nuevos:
+            return
+        with self._app.app_context():
+            if not ConfigHelper.is_ticket_pipeline_enabled():
+                return
+        for entry, record_id in nuevos:
+            ticket_pipeline.submit_webhook(self._app, record_id, entry['received_mono'])
+
+    # --- recuperación --------------------------------------------------
+
+    def recover(self, app) -> int:
+        """
+        Reinserta segmentos de procesos que murieron sin hacer flush.
+
+        Un segmento cuyo flock se puede tomar no tiene dueño vivo.
+        Returns: cantidad de webhooks reinsertados.
+        """
+        from app.interface.webhook_interface import WebhookJournalInterface
+
+        if not self.directory:
+            return 0
+        total = 0
+        for path in sorted(glob.glob(os.path.join(self.directory, 'journal-*.jsonl'))):
+            with self._lock:
+                own = [seg[0] for seg in self._sealed + ([self._segment] if self._segment else [])]
+            if path in own:
+                continue
+            handle = _open_locked(path)
+            if handle is None:
+                continue
+            try:
+                entries = _read_segment(path)
+                with app.app_context():
+                    existing_ids = WebhookJournalInterface.existing_ids(e.get('id') for e in entries)
+                    # Líneas escritas antes de que el journal llevara id
+                    legacy = [e for e in entries if not e.get('id')]
+                    existing = WebhookJournalInterface.existing_keys(legacy) if legacy else set()
+                    missing = [
+                        e for e in entries
+                        if (e['id'] not in existing_ids if e.get('id')
+                            else (e['kind'], e['data'].get('numero_ticket'), e['received_at']) not in existing)
+                    ]
+                if missing and self._persist(app, missing)[1]:
+                    logger.error(f"❌ Journal: no se pudo recuperar {os.path.basename(path)} completo - se reintenta en el próximo arranque")
+                    continue
+                os.remove(path)
+                total += len(missing)
+                logger.info(
+                    f"📒 Journal {os.path.basename(path)} recuperado: {len(missing)} webhook(s) reinsertados, "
+                    f"{len(entries) - len(missing)} ya estaban guardados"
+                )
+            except OSError as e:
+                logger.error(f"❌ Journal: error leyendo {os.path.basename(path)}: {e}")
+            finally:
+                handle.close()
+        with self._lock:
+            self.recovered += total
+        return total
+
+    # --- métricas ------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            oldest = self._pending[0]['received_mono'] if self._pending else None
+            return {
+                'active': self._pid == os.getpid(),
+                'directory': self.directory,
+                'pending': len(self._pending),
+                'oldest_pending_ms': round((time.monotonic() - oldest) * 1000) if oldest else None,
+                'group_commit_size': self._size,
+                'group_commit_max_ms': round(self._max_wait * 1000),
+                'journaled': self.journaled,
+                'flushed': self.flushed,
+                'flushes': self.flushes,
+                'avg_batch': round(self.flushed / self.flushes, 1) if self.flushes else None,
+                'last_batch': self.last_batch,
+                'recovered': self.recovered,
+                'errors': self.errors,
+                'dead_lettered': self.dead_lettered,
+                'last_flush_at': self.last_flush_at.isoformat() if self.last_flush_at else None,
+            }
+
+
+webhook_journal = WebhookJournal()
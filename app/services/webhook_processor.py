@@ -5,6 +5,7 @@ Webhook Processor - Processes pending webhook records into tickets.
 from app.interface.webhook_interface import HookNuevoTicketInterface
 from app.interface.interfaces import IncidentsInterface
 from app.utils.config_helper import ConfigHelper
+from app.utils.leader_election import db_named_lock
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,69 +15,119 @@ def process_pending_webhooks():
     """
     Process all unprocessed webhook records from hook_nuevo_ticket.
     Maps webhook fields to IncidentsDetection and creates new incident records.
+    Runs under a cross-process named lock so the scheduler and the ticket
+    pipeline never process the same hooks at the same time.
 
     Returns:
-        dict: Statistics about the processing run.
+        dict: Statistics about the processing run, plus the new incident ids
+        ('incident_ids') and the hook -> incident mapping ('hook_incidents').
+    """
+    with db_named_lock('process_pending_webhooks', timeout=30) as acquired:
+        if not acquired:
+            logger.info("Otro proceso está procesando webhooks - omitiendo")
+            return {'processed': 0, 'duplicates': 0, 'skipped': 0, 'errors': 0,
+                    'incident_ids': [], 'hook_incidents': {}}
+        return _process_pending_webhooks()
+
+
+def _incident_row(hook) -> dict:
+    """Map a hook_nuevo_ticket record to a tickets_detection row."""
+    return {
+        'Cliente': hook.numero_cliente,
+        # Build display name: prefer nombre_usuario, fall back to nombre_empresa
+        'Cliente_Nombre': hook.nombre_usuario or hook.nombre_empresa or "Cliente",
+        'Asunto': hook.motivo_contacto or "Sin motivo",
+        'Fecha_Creacion': hook.fecha_creado,
+        'Ticket_ID': None,  # Will be filled when create_ticket() runs
+        'Estado': 'PENDING',
+        'Prioridad': 'medium',
+        'is_created_splynx': False,
+        'last_update': hook.received_at,
+        'numero_ticket_gr': hook.numero_ticket,  # ID del ticket en Gestión Real
+    }
+
+
+def _process_pending_webhooks():
+    """
+    Set-based pass over the pending hooks: filter and dedup in memory, one
+    INSERT IGNORE for the incidents, one SELECT for their ids and one UPDATE
+    to flag every handled hook.
     """
     unprocessed = HookNuevoTicketInterface.get_unprocessed()
 
     if not unprocessed:
         logger.info("No hay webhooks pendientes de procesar")
-        return {'processed': 0, 'duplicates': 0, 'skipped': 0, 'errors': 0}
+        return {'processed': 0, 'duplicates': 0, 'skipped': 0, 'errors': 0,
+                'incident_ids': [], 'hook_incidents': {}}
 
     logger.info(f"Procesando {len(unprocessed)} webhooks pendientes...")
 
-    processed = 0
+    # Solo procesar tickets del motivo permitido para crear en Splynx (configurable desde BD)
+    motivo_permitido = ConfigHelper.get_config('WEBHOOK_MOTIVO_PERMITIDO', 'General Soporte').strip().lower()
+
+    # Todo se copia a valores simples: los commits de abajo expiran los objetos ORM
+    handled = []          # ids de hooks a marcar como procesados
+    candidates = {}       # Fecha_Creacion -> (hook id, fila) del primero de cada fecha
+    without_key = []      # (hook id, fila) sin Fecha_Creacion: no se pueden deduplicar en lote
     duplicates = 0
     skipped = 0
     errors = 0
 
-    # Solo procesar tickets del motivo permitido para crear en Splynx (configurable desde BD)
-    motivo_permitido = ConfigHelper.get_config('WEBHOOK_MOTIVO_PERMITIDO', 'General Soporte')
-
     for hook in unprocessed:
-        try:
-            motivo = hook.motivo_contacto or ""
-
-            # Filtrar: solo el motivo permitido se crea en Splynx
-            if motivo.strip().lower() != motivo_permitido.strip().lower():
-                skipped += 1
-                logger.info(f"Webhook {hook.id} omitido: motivo_contacto='{motivo}' (solo se procesa '{motivo_permitido}')")
-                HookNuevoTicketInterface.mark_processed(hook.id)
-                continue
-
-            # Build display name: prefer nombre_usuario, fall back to nombre_empresa
-            display_name = hook.nombre_usuario or hook.nombre_empresa or "Cliente"
-
-            incident_data = {
-                'Cliente': hook.numero_cliente,
-                'Cliente_Nombre': display_name,
-                'Asunto': hook.motivo_contacto or "Sin motivo",
-                'Fecha_Creacion': hook.fecha_creado,
-                'Ticket_ID': None,  # Will be filled when create_ticket() runs
-                'Estado': 'PENDING',
-                'Prioridad': 'medium',
-                'is_created_splynx': False,
-                'last_update': hook.received_at,
-                'numero_ticket_gr': hook.numero_ticket,  # ID del ticket en Gestión Real
-            }
-
-            result = IncidentsInterface.create(incident_data)
-
-            if result is not None:
-                processed += 1
-                logger.info(f"Webhook {hook.id} procesado -> incident id={result.id}")
-            else:
-                # create() returns None for duplicates (IntegrityError on Fecha_Creacion)
-                duplicates += 1
-                logger.info(f"Webhook {hook.id} duplicado (Fecha_Creacion={hook.fecha_creado})")
-
-            # Mark as processed regardless (duplicate is still "handled")
-            HookNuevoTicketInterface.mark_processed(hook.id)
-
-        except Exception as e:
+        motivo = hook.motivo_contacto or ""
+        if motivo.strip().lower() != motivo_permitido:
+            skipped += 1
+            handled.append(hook.id)
+            logger.debug(f"Webhook {hook.id} omitido: motivo_contacto='{motivo}'")
+            continue
+        if not hook.fecha_creado:
+            without_key.append((hook.id, _incident_row(hook)))
+        elif hook.fecha_creado in candidates:
+            duplicates += 1
+            handled.append(hook.id)
+        else:
+            candidates[hook.fecha_creado] = (hook.id, _incident_row(hook))
+
+    hook_incidents = {}
+    processed = 0
+
+    existing = IncidentsInterface.existing_fechas(list(candidates))
+    for fecha in existing:
+        duplicates += 1
+        handled.append(candidates.pop(fecha)[0])
+
+    if candidates:
+        inserted = IncidentsInterface.insert_ignore([row for _, row in candidates.values()])
+        if inserted is None:
+            # Quedan sin marcar: se reintentan en la próxima corrida
+            errors += len(candidates)
+            candidates = {}
+        else:
+            # Filas ignoradas por la BD (insertadas por otro proceso entre el SELECT y el INSERT)
+            processed += inserted
+            duplicates += len(candidates) - inserted
+            ids = IncidentsInterface.ids_by_fecha(list(candidates))
+            for fecha, (hook_id, _) in candidates.items():
+                handled.append(hook_id)
+                if fecha in ids:
+                    hook_incidents[hook_id] = ids[fecha]
+            if inserted < len(candidates):
+                # El hook igual queda apuntando al incidente existente de su fecha
+                logger.warning(f"⚠️ {len(candidates) - inserted} incidente(s) ya existían al insertar")
+
+    # Sin Fecha_Creacion no hay clave única: alta individual como antes
+    for hook_id, row in without_key:
+        result = IncidentsInterface.create(row)
+        handled.append(hook_id)
+        if result is not None:
+            processed += 1
+            hook_incidents[hook_id] = result.id
+        else:
             errors += 1
-            logger.error(f"Error procesando webhook {hook.id}: {e}")
+
+    marked = HookNuevoTicketInterface.mark_processed_bulk(handled)
+    if marked < len(handled):
+        logger.warning(f"⚠️ Solo {marked}/{len(handled)} webhooks marcados como procesados - se reintentan")
 
     logger.info(
         f"Procesamiento completado: {processed} nuevos, {duplicates} duplicados, {skipped} omitidos (otro motivo), {errors} errores"
@@ -87,4 +138,6 @@ def process_pending_webhooks():
         'duplicates': duplicates,
         'skipped': skipped,
         'errors': errors,
+        'incident_ids': list(hook_incidents.values()),
+        'hook_incidents': hook_incidents,
     }
@@ -0,0 +1,186 @@
+"""
+Intervalos adaptativos para los jobs de sincronización, alertas e importación.
+
+Los IntervalTrigger fijos gastan llamadas a Splynx de noche y se quedan cortos
+en las mañanas con mucho movimiento. Después de cada corrida del scheduler de
+un job adaptativo se decide el próximo intervalo con lo que devolvió el job:
+
+- fuera de horario laboral       -> máximo
+- error / omitido (circuito)     -> se mantiene
+- reconciliación completa        -> se mantiene
+- eventos push de Splynx activos -> máximo (sync queda como red de seguridad)
+- cambios o backlog altos        -> la mitad (sin bajar del mínimo)
+- sin cambios ni backlog         -> x1.5 (sin pasar del máximo)
+- resto                          -> se mantiene
+
+Los límites viven en system_config (<PREFIJO>_INTERVAL_MIN_MINUTES /
+<PREFIJO>_INTERVAL_MAX_MINUTES) y los umbrales en ADAPTIVE_BUSY_CHANGES /
+ADAPTIVE_BUSY_BACKLOG. El intervalo elegido y el motivo quedan en los detalles
+del job_run de esa corrida.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+GROW_FACTOR = 1.5
+SHRINK_FACTOR = 0.5
+
+
+def _int(data: dict, *keys) -> int:
+    return sum(data.get(k) for k in keys if isinstance(data.get(k), int) and not isinstance(data.get(k), bool))
+
+
+@dataclass
+class AdaptivePolicy:
+    job_id: str
+    config_prefix: str
+    default_min_minutes: int
+    default_max_minutes: int
+    # resultado del job -> (cambios, backlog)
+    signals: Callable[[dict], Tuple[int, int]]
+    # True si los eventos push de Splynx cubren este job (queda como red de seguridad)
+    push_fed: bool = False
+
+
+POLICIES: Dict[str, AdaptivePolicy] = {
+    'sync_tickets_status': AdaptivePolicy(
+        'sync_tickets_status_job', 'SYNC_STATUS', 2, 15,
+        lambda r: (_int(r, 'splynx_changed'), _int(r, 'exceeded_count')),
+        push_fed=True,
+    ),
+    'import_existing_tickets': AdaptivePolicy(
+        'import_existing_tickets_job', 'IMPORT_TICKETS', 2, 20,
+        lambda r: (_int(r, 'imported'), 0),
+    ),
+    'alert_overdue': AdaptivePolicy(
+        'alert_overdue_job', 'ALERT_SCAN', 2, 30,
+        lambda r: (_int(r, 'alertas_enviadas', 'pre_alertas_enviadas'), _int(r, 'tickets_vencidos', 'tickets_pre_alerta')),
+    ),
+}
+
+
+class AdaptiveIntervals:
+    """Intervalo actual por job adaptativo y reprogramación en el scheduler del líder"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scheduler = None
+        self._current: Dict[str, float] = {}
+        self._decisions: Dict[str, dict] = {}
+
+    def attach(self, scheduler, initial_seconds: Dict[str, float]):
+        """Lo llama start_scheduler con los intervalos con que agregó cada job"""
+        with self._lock:
+            self._scheduler = scheduler
+            self._current = dict(initial_seconds)
+            self._decisions = {}
+
+    def detach(self):
+        with self._lock:
+            self._scheduler = None
+
+    @staticmethod
+    def bounds(name: str) -> Tuple[int, int]:
+        """Límites (segundos) de system_config; requiere app context"""
+        from app.utils.config_helper import ConfigHelper
+        policy = POLICIES[name]
+        low = ConfigHelper.get_int(f'{policy.config_prefix}_INTERVAL_MIN_MINUTES', policy.default_min_minutes)
+        high = ConfigHelper.get_int(f'{policy.config_prefix}_INTERVAL_MAX_MINUTES', policy.default_max_minutes)
+        low = max(low, 1)
+        return low * 60, max(high, low) * 60
+
+    @staticmethod
+    def clamp(name: str, seconds: float) -> float:
+        low, high = AdaptiveIntervals.bounds(name)
+        return min(max(seconds, low), high)
+
+    def decide(self, name: str, current: float, result: Any, outcome: str, business_hours: bool) -> Tuple[float, str]:
+        """Próximo intervalo (segundos) y motivo; requiere app context"""
+        from app.utils.config_helper import ConfigHelper
+        low, high = self.bounds(name)
+
+        if not business_hours:
+            return high, 'fuera_de_horario'
+        if outcome != 'success':
+            return min(max(current, low), high), f'sin_cambio_por_{outcome}'
+
+        if POLICIES[name].push_fed:
+            from app.interface.webhook_interface import HookSplynxEventInterface
+            if HookSplynxEventInterface.received_since(ConfigHelper.get_int('SPLYNX_EVENTS_ACTIVE_MINUTES', 15)):
+                return high, 'eventos_splynx_activos'
+
+        data = result if isinstance(result, dict) else {}
+        if data.get('mode') == 'full':
+            # La reconciliación completa trae todo: no dice nada del ritmo de cambios
+            return min(max(current, low), high), 'reconciliacion_completa'
+
+        changes, backlog = POLICIES[name].signals(data)
+        busy_changes = ConfigHelper.get_int('ADAPTIVE_BUSY_CHANGES', 5)
+        busy_backlog = ConfigHelper.get_int('ADAPTIVE_BUSY_BACKLOG', 20)
+
+        if changes >= busy_changes or backlog >= busy_backlog:
+            return max(current * SHRINK_FACTOR, low), f'alta_actividad (cambios={changes}, backlog={backlog})'
+        if changes == 0 and backlog == 0:
+            return min(current * GROW_FACTOR, high), 'sin_actividad'
+        return min(max(current, low), high), f'estable (cambios={changes}, backlog={backlog})'
+
+    def on_run_finished(self, app, name: str, trigger: str, result: Any, outcome: str) -> Optional[Dict[str, Any]]:
+        """
+        Ajusta el intervalo después de una corrida del scheduler.
+
+        Returns:
+            dict con interval_seconds / interval_reason para los detalles del
+            job_run, o None si el job no es adaptativo o no corre en el scheduler.
+        """
+        if name not in POLICIES or trigger != 'scheduler':
+            return None
+        with self._lock:
+            scheduler = self._scheduler
+            current = self._current.get(name)
+        if scheduler is None or current is None:
+            return None
+
+        from app.utils.job_registry import is_business_hours
+        with app.app_context():
+            from app.utils.config_helper import ConfigHelper
+            if not ConfigHelper.get_bool('ADAPTIVE_INTERVALS_ENABLED', True):
+                return None
+            interval, reason = self.decide(name, current, result, outcome, is_business_hours(app))
+
+        interval = round(interval)
+        if interval != round(current):
+            from apscheduler.triggers.interval import IntervalTrigger
+            try:
+                scheduler.reschedule_job(POLICIES[name].job_id, trigger=IntervalTrigger(seconds=interval))
+                logger.info(f"📐 {name}: intervalo {round(current)}s -> {interval}s ({reason})")
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo reprogramar {name}: {e}")
+                return {'interval_seconds': round(current), 'interval_reason': f'error_reprogramando: {e}'}
+
+        with self._lock:
+            self._current[name] = interval
+            self._decisions[name] = {
+                'interval_seconds': interval,
+                'reason': reason,
+                'decided_at': datetime.now().isoformat(),
+            }
+        return {'interval_seconds': interval, 'interval_reason': reason}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    'interval_seconds': round(seconds),
+                    'last_decision': self._decisions.get(name),
+                }
+                for name, seconds in self._current.items()
+            }
+
+
+adaptive_intervals = AdaptiveIntervals()
@@ -2,6 +2,7 @@
 Helper para leer configuración del sistema desde la base de datos
 """
 
+import os
 from typing import Optional, Union
 from app.models.models import SystemConfig
 from app.utils.logger import get_logger
@@ -117,3 +118,33 @@ class ConfigHelper:
     def is_auto_unassign_enabled() -> bool:
         """Verifica si la desasignación automática post-turno está habilitada"""
         return ConfigHelper.get_bool('AUTO_UNASSIGN_AFTER_SHIFT_ENABLED', False)
+
+    @staticmethod
+    def is_ticket_pipeline_enabled() -> bool:
+        """Verifica si los webhooks nuevos pasan directo a Splynx por el pipeline de tickets"""
+        return ConfigHelper.get_bool('TICKET_PIPELINE_ENABLED', False)
+
+    @staticmethod
+    def get_webhook_ingest_mode() -> str:
+        """Modo de ingesta de webhooks: 'direct' (commit por request) o 'journal' (group commit)"""
+        mode = str(ConfigHelper.get_str('WEBHOOK_INGEST_MODE', 'direct')).strip().lower()
+        if mode == 'journal' and not ConfigHelper.journal_dir_usable():
+            return 'direct'
+        return mode if mode in ('direct', 'journal') else 'direct'
+
+    _journal_dir_warned = False
+
+    @staticmethod
+    def journal_dir_usable() -> bool:
+        """El modo journal requiere WEBHOOK_JOURNAL_DIR absoluto (volumen montado)"""
+        from app.utils.constants import WEBHOOK_JOURNAL_DIR
+
+        if WEBHOOK_JOURNAL_DIR and os.path.isabs(WEBHOOK_JOURNAL_DIR):
+            return True
+        if not ConfigHelper._journal_dir_warned:
+            ConfigHelper._journal_dir_warned = True
+            logger.warning(
+                "WEBHOOK_INGEST_MODE='journal' requiere WEBHOOK_JOURNAL_DIR con una ruta absoluta "
+                f"en un volumen persistente (actual: {WEBHOOK_JOURNAL_DIR!r}) - se usa 'direct'"
+            )
+        return False
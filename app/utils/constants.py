@@ -94,3 +94,11 @@ DB_USER = os.getenv('DB_USER', 'mysql')
 DB_PASSWORD = os.getenv('DB_PASSWORD')
 
 DEVICE_ANALYSIS_API_URL = os.getenv('DEVICE_ANALYSIS_API_URL', 'http://190.7.234.37:7444')
+
+# ============================================================================
+# JOURNAL LOCAL DE WEBHOOKS (WEBHOOK_INGEST_MODE = 'journal')
+# ============================================================================
+
+# Ruta absoluta en un volumen persistente (docker-compose monta /app/data/webhook_journal);
+# vacía o relativa = el modo journal queda deshabilitado y se guarda directo en BD
+WEBHOOK_JOURNAL_DIR = os.getenv('WEBHOOK_JOURNAL_DIR', '')
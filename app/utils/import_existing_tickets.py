@@ -5,14 +5,17 @@ OPTIMIZADO: Usa SplynxServicesSingleton para evitar múltiples logins
 """
 
 from app.utils.config import db
-from app.models.models import IncidentsDetection
 from app.services.splynx_services_singleton import SplynxServicesSingleton
 from app.utils.date_utils import parse_splynx_date
 from app.utils.logger import get_logger
+from app.utils.sync_watermark import SyncWatermark
 from datetime import datetime
 
 logger = get_logger(__name__)
 
+# Nombre de la marca de agua de este job en system_config
+WATERMARK_NAME = 'IMPORT'
+
 def import_existing_tickets_from_splynx():
     """
     Importa todos los tickets activos (no cerrados) del grupo 4 de Splynx a la BD.
@@ -20,19 +23,38 @@ def import_existing_tickets_from_splynx():
     """
     try:
         splynx = SplynxServicesSingleton()
+        if splynx.is_circuit_open():
+            logger.warning("🔴 Splynx no disponible (circuito abierto) - importación omitida")
+            return {'success': False, 'skipped': 'splynx_circuit_open'}
         
-        # Obtener tickets asignados y no asignados del grupo 4
-        logger.info("📥 Importando tickets existentes del grupo 4 desde Splynx...")
-        
-        unassigned_tickets = splynx.get_unassigned_tickets(group_id="4")
-        assigned_tickets = splynx.get_assigned_tickets(group_id="4")
-        
-        all_tickets = unassigned_tickets + assigned_tickets
+        full_reconcile = SyncWatermark.needs_full_reconcile(WATERMARK_NAME)
+
+        if full_reconcile:
+            # Todos los tickets abiertos del grupo 4 (asignados y no asignados)
+            logger.info("📥 Importando tickets existentes del grupo 4 desde Splynx (pasada completa)...")
+
+            # get_open_tickets propaga los errores: un fallo de Splynx no pasa por "0 tickets"
+            # ni deja la pasada completa marcada como hecha
+            all_tickets = splynx.get_open_tickets(group_id="4")
+            seen_tickets = all_tickets
+        else:
+            # Solo tickets del grupo 4 creados o modificados desde la última pasada
+            since = SyncWatermark.get_since(WATERMARK_NAME)
+            logger.info(f"📥 Importando tickets del grupo 4 actualizados desde {since} (incremental)...")
+
+            seen_tickets = splynx.get_tickets_updated_since(since, group_id="4")
+            all_tickets = [t for t in seen_tickets if t.get('closed') not in ['1', 1]]
+
         logger.info(f"📊 Encontrados {len(all_tickets)} tickets activos en Splynx (grupo 4)")
         
         imported_count = 0
         skipped_count = 0
         error_count = 0
+        failed_tickets = []
+
+        # Tickets ya importados, en una sola consulta por Ticket_ID
+        from app.interface.interfaces import IncidentsInterface
+        known_ids = set(IncidentsInterface.find_by_ticket_ids(t.get('id') for t in all_tickets))
         
         for ticket in all_tickets:
             try:
@@ -41,8 +63,7 @@ def import_existing_tickets_from_splynx():
                     continue
                 
                 # Verificar si el ticket ya existe en BD
-                existing = IncidentsDetection.query.filter_by(Ticket_ID=ticket_id).first()
-                if existing:
+                if ticket_id in known_ids:
                     skipped_count += 1
                     continue
                 
@@ -101,25 +122,33 @@ def import_existing_tickets_from_splynx():
                     'is_closed': is_closed
                 }
                 
-                from app.interface.interfaces import IncidentsInterface
                 incident = IncidentsInterface.create(incident_data)
                 
                 if incident:
                     imported_count += 1
+                    known_ids.add(ticket_id)
                     logger.info(f"✅ Ticket {ticket_id} importado: {customer_name} - {subject}")
                 else:
                     error_count += 1
+                    failed_tickets.append(ticket)
                     logger.warning(f"⚠️ No se pudo importar ticket {ticket_id}")
                     
             except Exception as e:
                 error_count += 1
+                failed_tickets.append(ticket)
                 logger.error(f"❌ Error importando ticket {ticket.get('id', 'N/A')}: {e}")
                 continue
         
+        # No pasar de los tickets que fallaron: el próximo delta los vuelve a traer
+        SyncWatermark.advance(WATERMARK_NAME, seen_tickets, failed_tickets)
+        if full_reconcile and not failed_tickets:
+            SyncWatermark.mark_full_reconcile(WATERMARK_NAME)
+
         logger.info(f"✅ Importación completada: {imported_count} importados, {skipped_count} ya existían, {error_count} errores")
         
         return {
             'success': True,
+            'mode': 'full' if full_reconcile else 'delta',
             'imported': imported_count,
             'skipped': skipped_count,
             'errors': error_count,
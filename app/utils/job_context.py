@@ -0,0 +1,143 @@
+"""
+Contexto de evaluación por corrida para los jobs de tickets.
+
+check_and_alert_overdue_tickets y get_next_assignee consultaban configuración,
+horarios y operadores una vez por ticket. JobContext.build() toma una foto al
+inicio de la corrida (hora actual, umbrales, operadores con sus pausas,
+horarios compilados a rangos de minutos, nombres y teléfonos) y el resto de la
+corrida resuelve todo con búsquedas en diccionarios.
+
+La foto vale para una corrida: un cambio de horario o una pausa hecha a mitad
+de corrida se aplica en la siguiente.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+from app.utils.constants import TIMEZONE
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TZ_ARGENTINA = pytz.timezone(TIMEZONE)
+
+
+@dataclass(frozen=True)
+class OperatorSnapshot:
+    person_id: int
+    name: str
+    whatsapp_number: Optional[str]
+    is_active: bool
+    is_paused: bool
+    assignment_paused: bool
+    notifications_enabled: bool
+
+
+def _to_minutes(hhmm: str) -> Optional[int]:
+    try:
+        hour, minute = map(int, hhmm.split(':'))
+        return hour * 60 + minute
+    except (AttributeError, ValueError):
+        return None
+
+
+class JobContext:
+    """Foto de configuración, operadores y horarios para una corrida"""
+
+    def __init__(self, now: datetime, thresholds: Dict[str, int],
+                 operators: Dict[int, OperatorSnapshot],
+                 schedules: Dict[Tuple[int, str, int], List[Tuple[int, int]]]):
+        self.tz = TZ_ARGENTINA
+        self.now = now
+        self.thresholds = thresholds
+        self.operators = operators
+        self.schedules = schedules
+
+    @classmethod
+    def build(cls, now: Optional[datetime] = None) -> 'JobContext':
+        """Arma el contexto con tres consultas (requiere app context)"""
+        from app.models.models import OperatorConfig, OperatorSchedule
+        from app.utils.config_helper import ConfigHelper
+
+        thresholds = {
+            'alert': ConfigHelper.get_ticket_alert_threshold(),
+            'renotification': ConfigHelper.get_renotification_interval(),
+            'pre_alert': ConfigHelper.get_pre_alert_minutes(),
+            'outhouse_no_alert': ConfigHelper.get_outhouse_no_alert_minutes(),
+            'weekend_guard': ConfigHelper.get_int('PERSONA_GUARDIA_FINDE', 10),
+            'weekend_start_hour': ConfigHelper.get_int('FINDE_HORA_INICIO', 9),
+            'weekend_end_hour': ConfigHelper.get_int('FINDE_HORA_FIN', 21),
+        }
+
+        operators = {
+            op.person_id: OperatorSnapshot(
+                person_id=op.person_id,
+                name=op.name,
+                whatsapp_number=op.whatsapp_number,
+                is_active=bool(op.is_active),
+                is_paused=bool(op.is_paused),
+                assignment_paused=bool(op.assignment_paused),
+                notifications_enabled=op.notifications_enabled is not False,
+            )
+            for op in OperatorConfig.query.all()
+        }
+
+        schedules: Dict[Tuple[int, str, int], List[Tuple[int, int]]] = defaultdict(list)
+        for schedule in OperatorSchedule.query.filter_by(is_active=True).all():
+            start = _to_minutes(schedule.start_time)
+            end = _to_minutes(schedule.end_time)
+            if start is None or end is None:
+                continue
+            # 00:00 como fin = medianoche (misma regla que ScheduleHelper)
+            if end == 0:
+                end = 24 * 60
+            schedules[(schedule.person_id, schedule.schedule_type, schedule.day_of_week)].append((start, end))
+
+        return cls(now or datetime.now(TZ_ARGENTINA), thresholds, operators, dict(schedules))
+
+    # --- fin de semana -------------------------------------------------
+
+    @property
+    def is_weekend(self) -> bool:
+        return self.now.weekday() >= 5
+
+    @property
+    def weekend_guard(self) -> int:
+        return self.thresholds['weekend_guard']
+
+    def weekend_guard_on_duty(self) -> bool:
+        return self.thresholds['weekend_start_hour'] <= self.now.hour < self.thresholds['weekend_end_hour']
+
+    # --- horarios y operadores -----------------------------------------
+
+    def is_available(self, person_id: int, schedule_type: str = 'assignment') -> bool:
+        """Equivalente a ScheduleHelper.is_operator_available con la hora del contexto"""
+        current = self.now.hour * 60 + self.now.minute
+        ranges = self.schedules.get((person_id, schedule_type, self.now.weekday()), ())
+        return any(start <= current < end for start, end in ranges)
+
+    def available_operators(self, person_ids: Iterable[int], schedule_type: str = 'assignment') -> List[int]:
+        """Equivalente a ScheduleHelper.get_available_operators (pausas + horario)"""
+        available = []
+        for person_id in person_ids:
+            operator = self.operators.get(person_id)
+            if operator:
+                if operator.is_paused or not operator.is_active:
+                    continue
+                if schedule_type == 'assignment' and operator.assignment_paused:
+                    continue
+            if self.is_available(person_id, schedule_type):
+                available.append(person_id)
+        return available
+
+    def operator_name(self, person_id: int) -> str:
+        operator = self.operators.get(person_id)
+        return operator.name if operator else f"Operador {person_id}"
+
+    def operator_phone(self, person_id: int) -> Optional[str]:
+        operator = self.operators.get(person_id)
+        return operator.whatsapp_number if operator else None
@@ -0,0 +1,163 @@
+"""
+Pool de workers acotado para los jobs de tickets.
+
+Reemplaza los threading.Thread sueltos de los endpoints y del scheduler:
+- Como máximo JOB_EXECUTOR_MAX_WORKERS jobs corren a la vez.
+- Cada job corre en una sola instancia: si llega un disparo mientras corre
+  (o está en cola), se deja como máximo UNA re-ejecución pendiente y el resto
+  de los disparos se coalescen en ella.
+- Si hay más de JOB_EXECUTOR_MAX_QUEUE ejecuciones esperando worker, el
+  disparo se rechaza.
+
+Profundidad de cola, coalescidos y rechazados se exponen en /api/system/jobs.
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from app.utils.job_registry import get_job, run_job
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Resultados de submit()
+STARTED = 'started'        # encolado para correr ahora
+QUEUED_RERUN = 'queued'    # ya estaba corriendo: queda una re-ejecución pendiente
+COALESCED = 'coalesced'    # ya había una re-ejecución pendiente: se descarta
+REJECTED = 'rejected'      # cola llena
+
+
+class _JobState:
+    def __init__(self):
+        self.active = False          # en cola del pool o corriendo
+        self.rerun_pending = False
+        self.trigger = None
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.reruns = 0
+
+
+class JobExecutor:
+    """ThreadPoolExecutor acotado con guard de instancia única por job"""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._states: Dict[str, _JobState] = {}
+        self._waiting = 0   # enviados al pool y todavía sin worker
+        self._running = 0
+        self._peak_waiting = 0
+
+    def _state(self, name: str) -> _JobState:
+        state = self._states.get(name)
+        if state is None:
+            state = self._states[name] = _JobState()
+        return state
+
+    def submit(self, app, name: str, trigger: str = 'manual') -> str:
+        """
+        Dispara un job sin bloquear.
+
+        Returns:
+            str: STARTED, QUEUED_RERUN, COALESCED o REJECTED
+        """
+        if get_job(name) is None:
+            raise KeyError(f"Job desconocido: {name}")
+
+        with self._lock:
+            state = self._state(name)
+            if state.active:
+                if state.rerun_pending:
+                    state.coalesced += 1
+                    logger.debug(f"🔁 {name}: ya corriendo con re-ejecución pendiente - disparo coalescido")
+                    return COALESCED
+                state.rerun_pending = True
+                state.trigger = trigger
+                logger.info(f"🔁 {name}: ya está corriendo - queda una re-ejecución pendiente")
+                return QUEUED_RERUN
+
+            if self._waiting >= self.max_queue:
+                state.rejected += 1
+                logger.warning(f"⚠️ {name}: cola de jobs llena ({self._waiting}) - disparo rechazado")
+                return REJECTED
+
+            state.active = True
+            self._enqueue(app, name, trigger, state)
+            return STARTED
+
+    def _enqueue(self, app, name: str, trigger: str, state: _JobState):
+        # Llamar con self._lock tomado
+        state.submitted += 1
+        self._waiting += 1
+        self._peak_waiting = max(self._peak_waiting, self._waiting)
+        self._pool.submit(self._run, app, name, trigger)
+
+    def _run(self, app, name: str, trigger: str):
+        with self._lock:
+            self._waiting -= 1
+            self._running += 1
+        try:
+            run_job(app, name, trigger)
+        finally:
+            with self._lock:
+                self._running -= 1
+                state = self._state(name)
+                if state.rerun_pending:
+                    # La re-ejecución no compite por la cola: ya ocupaba el lugar del job
+                    state.rerun_pending = False
+                    state.reruns += 1
+                    self._enqueue(app, name, state.trigger or trigger, state)
+                else:
+                    state.active = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_depth': self._waiting,
+                'peak_queue_depth': self._peak_waiting,
+                'running': self._running,
+                'jobs': {
+                    name: {
+                        'active': state.active,
+                        'rerun_pending': state.rerun_pending,
+                        'submitted': state.submitted,
+                        'reruns': state.reruns,
+                        'coalesced': state.coalesced,
+                        'rejected': state.rejected,
+                    }
+                    for name, state in self._states.items()
+                },
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> JobExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = JobExecutor(
+                    max_workers=int(os.getenv('JOB_EXECUTOR_MAX_WORKERS', '4')),
+                    max_queue=int(os.getenv('JOB_EXECUTOR_MAX_QUEUE', '16')),
+                )
+                atexit.register(_executor.shutdown)
+    return _executor
+
+
+def submit_job(app, name: str, trigger: str = 'manual') -> str:
+    """Dispara un job en el pool compartido (ver JobExecutor.submit)"""
+    return get_executor().submit(app, name, trigger)
@@ -0,0 +1,69 @@
+"""
+Contadores por ejecución de job (llamadas a Splynx, sentencias SQL, envíos de WhatsApp).
+
+run_job() abre un JobRunCounters en un contextvar; los puntos instrumentados
+llaman a count() y suman al job que esté corriendo en ese contexto. Fuera de un
+job count() no hace nada.
+"""
+
+import math
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SPLYNX_CALLS = 'splynx_calls'
+DB_STATEMENTS = 'db_statements'
+WHATSAPP_SENDS = 'whatsapp_sends'
+
+
+def percentile(sorted_values: List[Union[int, float]], pct: float) -> Optional[Union[int, float]]:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class JobRunCounters:
+    """Contadores de una ejecución; thread-safe porque el fan-out a Splynx usa varios hilos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.values: Dict[str, int] = {SPLYNX_CALLS: 0, DB_STATEMENTS: 0, WHATSAPP_SENDS: 0}
+
+    def add(self, name: str, amount: int = 1):
+        with self._lock:
+            self.values[name] = self.values.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.values)
+
+
+_current_run: ContextVar[Optional[JobRunCounters]] = ContextVar('job_run_counters', default=None)
+
+
+@contextmanager
+def track_job_run():
+    """Abre los contadores de una ejecución para el contexto actual"""
+    counters = JobRunCounters()
+    token = _current_run.set(counters)
+    try:
+        yield counters
+    finally:
+        _current_run.reset(token)
+
+
+def count(name: str, amount: int = 1):
+    counters = _current_run.get()
+    if counters is not None:
+        counters.add(name, amount)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_db_statement(conn, cursor, statement, parameters, context, executemany):
+    count(DB_STATEMENTS)
@@ -0,0 +1,261 @@
+"""
+Registro de jobs de tickets.
+
+El scheduler ejecuta los jobs directamente dentro del proceso (sin pasar por
+http://localhost:7842/api/tickets/...) y los endpoints HTTP quedan como
+disparadores manuales sobre este mismo registro. Cada ejecución mide su
+duración real, deja estadísticas en memoria para /api/system/jobs y se guarda
+en la tabla job_run con sus contadores (ver app.utils.job_metrics).
+"""
+
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import pytz
+
+from app.utils import job_metrics
+from app.utils.adaptive_intervals import adaptive_intervals
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TZ_ARGENTINA = pytz.timezone('America/Argentina/Buenos_Aires')
+HOST_IDENTITY = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobSpec:
+    """Definición de un job registrado"""
+
+    def __init__(self, name: str, func: Callable, description: str, business_hours: bool = False,
+                 items_key: Optional[str] = None):
+        self.name = name
+        self.func = func
+        self.description = description
+        # Si es True, las ejecuciones del scheduler se saltan fuera del horario laboral
+        self.business_hours = business_hours
+        # Clave del resultado que cuenta los ítems procesados (para job_run)
+        self.items_key = items_key
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.running = 0
+        self.last_started_at: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.max_duration: Optional[float] = None
+        self.last_trigger: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'description': self.description,
+            'business_hours': self.business_hours,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'running': self.running,
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_duration_seconds': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'max_duration_seconds': round(self.max_duration, 3) if self.max_duration is not None else None,
+            'last_trigger': self.last_trigger,
+            'last_error': self.last_error,
+        }
+
+
+_jobs: Dict[str, JobSpec] = {}
+_jobs_lock = threading.RLock()
+_builtins_loaded = False
+
+
+def register_job(name: str, func: Callable, description: str, business_hours: bool = False,
+                 items_key: Optional[str] = None) -> JobSpec:
+    """Registra (o reemplaza) un job. `func` recibe la app de Flask."""
+    spec = JobSpec(name, func, description, business_hours, items_key)
+    with _jobs_lock:
+        _jobs[name] = spec
+    return spec
+
+
+def _register_builtin_jobs():
+    from app.routes import thread_functions as tf
+
+    register_job('process_webhooks', tf.thread_process_webhooks,
+                 'Procesar webhooks pendientes y crear tickets en Splynx', business_hours=True,
+                 items_key='processed')
+    register_job('create_tickets', tf.thread_create_tickets,
+                 'Crear en Splynx los incidentes pendientes', items_key='tickets_creados')
+    register_job('assign_unassigned', tf.thread_assign_unassigned_tickets,
+                 'Asignar tickets sin asignar', items_key='asignados_exitosamente')
+    register_job('alert_overdue', tf.thread_alert_overdue_tickets,
+                 'Alertar tickets vencidos', items_key='total_tickets_revisados')
+    register_job('alert_deadlines', tf.thread_alert_due_tickets,
+                 'Alertar tickets cuyo vencimiento llegó (cola de vencimientos)',
+                 items_key='total_tickets_revisados')
+    register_job('end_of_shift_notifications', tf.thread_end_of_shift_notifications,
+                 'Notificaciones de fin de turno', items_key='operadores_notificados')
+    register_job('auto_unassign_after_shift', tf.thread_auto_unassign_after_shift_if_enabled,
+                 'Desasignar tickets después del fin de turno', items_key='tickets_desasignados')
+    register_job('sync_tickets_status', tf.thread_sync_tickets_status,
+                 'Sincronizar estado de tickets con Splynx', items_key='total_checked')
+    register_job('ticket_mirror_sync', tf.thread_sync_ticket_mirror,
+                 'Sincronizar espejo local de tickets Splynx', items_key='splynx_changed')
+    register_job('import_existing_tickets', tf.thread_import_existing_tickets,
+                 'Importar tickets existentes del grupo 4', items_key='imported')
+    register_job('ticket_reopen_checker', tf.thread_ticket_reopen_checker,
+                 'Verificar reapertura de tickets', business_hours=True, items_key='checked')
+    register_job('process_splynx_events', tf.thread_process_splynx_events,
+                 'Procesar eventos de tickets enviados por Splynx', items_key='processed')
+    register_job('reset_assignment_counters', tf.thread_reset_assignment_counters,
+                 'Reset de contadores de asignación al inicio de turno')
+    register_job('purge_job_runs', tf.thread_purge_job_runs,
+                 'Purgar registro de ejecuciones de jobs', items_key='purged')
+
+
+def _ensure_registry():
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+    with _jobs_lock:
+        if not _builtins_loaded:
+            _register_builtin_jobs()
+            _builtins_loaded = True
+
+
+def get_job(name: str) -> Optional[JobSpec]:
+    _ensure_registry()
+    return _jobs.get(name)
+
+
+def list_jobs() -> Dict[str, JobSpec]:
+    _ensure_registry()
+    return dict(_jobs)
+
+
+def is_business_hours(app) -> bool:
+    """True si la hora actual (Argentina) está dentro del horario laboral configurado en BD"""
+    with app.app_context():
+        from app.utils.config_helper import ConfigHelper
+
+        FINDE_HORA_INICIO = ConfigHelper.get_int('FINDE_HORA_INICIO', 9)
+        FINDE_HORA_FIN = ConfigHelper.get_int('FINDE_HORA_FIN', 21)
+        SEMANA_HORA_INICIO = ConfigHelper.get_int('SEMANA_HORA_INICIO', 8)
+        SEMANA_HORA_FIN = ConfigHelper.get_int('SEMANA_HORA_FIN', 23)
+
+    now = datetime.now(TZ_ARGENTINA)
+    if now.weekday() >= 5:  # Sábado o Domingo
+        return FINDE_HORA_INICIO <= now.hour < FINDE_HORA_FIN
+    return SEMANA_HORA_INICIO <= now.hour < SEMANA_HORA_FIN
+
+
+def run_job(app, name: str, trigger: str = 'manual') -> Any:
+    """
+    Ejecuta un job registrado en el hilo actual.
+
+    Args:
+        app: Aplicación Flask
+        name: Nombre del job en el registro
+        trigger: 'scheduler' o 'manual'; solo las ejecuciones del scheduler
+                 respetan el horario laboral
+
+    Returns:
+        El resultado del job, o None si se omitió o falló
+    """
+    spec = get_job(name)
+    if spec is None:
+        logger.error(f"❌ Job desconocido: {name}")
+        return None
+
+    if trigger == 'scheduler' and spec.business_hours and not is_business_hours(app):
+        spec.skipped += 1
+        logger.info(f"⏭️ {name}: fuera de horario laboral ({datetime.now(TZ_ARGENTINA).hour}:00) - saltando ejecución")
+        return None
+
+    with _jobs_lock:
+        spec.running += 1
+        spec.last_started_at = datetime.now(TZ_ARGENTINA)
+        spec.last_trigger = trigger
+    started_at = datetime.now()
+    started = time.monotonic()
+    result = None
+    error = None
+    with job_metrics.track_job_run() as counters:
+        try:
+            result = spec.func(app)
+            return result
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ Error en job {name}: {e}")
+            return None
+        finally:
+            elapsed = time.monotonic() - started
+            with _jobs_lock:
+                spec.running -= 1
+                spec.runs += 1
+                spec.failures += 1 if error else 0
+                spec.last_error = error
+                spec.last_duration = elapsed
+                spec.max_duration = elapsed if spec.max_duration is None else max(spec.max_duration, elapsed)
+            logger.info(f"⏱️ Job {name} ({trigger}) terminado en {elapsed:.2f}s")
+            summary = _summarize_result(spec, result, error)
+            try:
+                interval = adaptive_intervals.on_run_finished(app, name, trigger, result, summary['outcome'])
+            except Exception as e:
+                interval = None
+                logger.warning(f"⚠️ No se pudo ajustar el intervalo de {name}: {e}")
+            if interval:
+                summary['details'] = {**(summary['details'] or {}), **interval}
+            _record_run(app, spec, trigger, started_at, elapsed, summary, counters.snapshot())
+
+
+def _summarize_result(spec: JobSpec, result: Any, error: Optional[str]) -> Dict[str, Any]:
+    """Deriva resultado, ítems y errores de lo que devolvió el job"""
+    data = result if isinstance(result, dict) else {}
+    errors = data.get('errores', data.get('errors', 0))
+    errors = errors if isinstance(errors, int) else 0
+    items = data.get(spec.items_key, 0) if spec.items_key else 0
+
+    if error or data.get('error') or (data.get('success') is False and not isinstance(data.get('skipped'), str)):
+        outcome = 'error'
+        error = error or data.get('error')
+    elif isinstance(data.get('skipped'), str):
+        outcome = 'skipped'
+    else:
+        outcome = 'success'
+
+    return {
+        'outcome': outcome,
+        'items_processed': items if isinstance(items, int) else 0,
+        'errors': max(errors, 1 if outcome == 'error' else 0),
+        'error_message': str(error)[:2000] if error else None,
+        # Solo los valores escalares del resultado (los detalles por ticket quedan en los logs)
+        'details': {k: v for k, v in data.items() if isinstance(v, (str, int, float, bool)) or v is None} or None,
+    }
+
+
+def _record_run(app, spec: JobSpec, trigger: str, started_at: datetime, elapsed: float,
+                summary: Dict[str, Any], counters: Dict[str, int]):
+    try:
+        with app.app_context():
+            from app.interface.job_runs import JobRunInterface
+            JobRunInterface.record({
+                'job_name': spec.name,
+                'trigger': trigger,
+                'host': HOST_IDENTITY,
+                'started_at': started_at,
+                'finished_at': datetime.now(),
+                'duration_ms': int(elapsed * 1000),
+                'splynx_calls': counters.get(job_metrics.SPLYNX_CALLS, 0),
+                'db_statements': counters.get(job_metrics.DB_STATEMENTS, 0),
+                'whatsapp_sends': counters.get(job_metrics.WHATSAPP_SENDS, 0),
+                **summary,
+            })
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo registrar la ejecución del job {spec.name}: {e}")
+
+
+def get_jobs_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: spec.stats() for name, spec in list_jobs().items()}
@@ -0,0 +1,206 @@
+"""
+Elección de líder del scheduler con locks con nombre de MySQL (GET_LOCK).
+
+Cada proceso (workers de Gunicorn, réplicas) levanta un hilo de elección; el que
+obtiene el lock corre el APScheduler y el resto solo atiende requests. El lock
+vive en una conexión dedicada (fuera del pool): si el proceso líder muere, MySQL
+cierra su sesión y libera el lock, y un seguidor lo toma en el siguiente sondeo
+(SCHEDULER_LEADER_POLL_SECONDS, default 5s). El líder hace heartbeat sobre la
+misma conexión; si la pierde, deja de ser líder y detiene el scheduler.
+
+Con bases que no son MySQL (desarrollo con SQLite) el proceso asume el
+liderazgo directamente.
+"""
+
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.utils.config import db
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LOCK_NAME = os.getenv('SCHEDULER_LEADER_LOCK_NAME', 'splynx_tickets_scheduler')
+
+
+class SchedulerLeaderElection:
+    """Mantiene el lock de líder y avisa cuando este proceso gana o pierde el liderazgo"""
+
+    def __init__(self, app, on_elected: Callable[[], None], on_demoted: Callable[[], None],
+                 lock_name: str = LOCK_NAME, poll_seconds: Optional[float] = None):
+        self.app = app
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lock_name = lock_name
+        self.poll_seconds = poll_seconds or float(os.getenv('SCHEDULER_LEADER_POLL_SECONDS', '5'))
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.is_leader = False
+        self.leader_since: Optional[datetime] = None
+        self.last_heartbeat: Optional[datetime] = None
+        self.elections = 0
+        self.mode = None
+
+        self._engine = None
+        self._conn = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self.app.app_context():
+            url = db.engine.url
+            self.mode = 'mysql' if db.engine.dialect.name == 'mysql' else 'local'
+
+        if self.mode != 'mysql':
+            logger.warning(f"⚠️ Base de datos {url.get_backend_name()} sin GET_LOCK - este proceso asume el liderazgo del scheduler")
+            self._become_leader()
+            return
+
+        connect_args = (self.app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}).get('connect_args', {})
+        # Conexión dedicada: el lock pertenece a la sesión y no debe volver al pool
+        self._engine = create_engine(url, poolclass=NullPool, connect_args=connect_args)
+        self._thread = threading.Thread(target=self._loop, name='scheduler-leader', daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.is_leader:
+                    self._heartbeat()
+                else:
+                    self._try_acquire()
+            except Exception as e:
+                logger.error(f"❌ Error en elección de líder del scheduler: {e}")
+                if self.is_leader:
+                    self._step_down()
+                self._close_connection()
+            self._stop.wait(self.poll_seconds)
+
+    def _try_acquire(self):
+        if self._conn is None:
+            self._conn = self._engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        acquired = self._conn.execute(
+            text("SELECT GET_LOCK(:name, 0)"), {'name': self.lock_name}
+        ).scalar()
+        if acquired == 1:
+            self._become_leader()
+
+    def _heartbeat(self):
+        owner = self._conn.execute(
+            text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {'name': self.lock_name}
+        ).scalar()
+        if owner != 1:
+            raise RuntimeError("el lock de líder ya no pertenece a esta conexión")
+        self.last_heartbeat = datetime.now()
+
+    def _become_leader(self):
+        self.is_leader = True
+        self.elections += 1
+        self.leader_since = datetime.now()
+        self.last_heartbeat = self.leader_since
+        logger.info(f"👑 {self.identity} elegido líder del scheduler (lock '{self.lock_name}')")
+        try:
+            self.on_elected()
+        except Exception as e:
+            logger.error(f"❌ Error iniciando scheduler como líder: {e}")
+            self._step_down()
+            self._close_connection()
+
+    def _step_down(self):
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        self.leader_since = None
+        logger.warning(f"⚠️ {self.identity} dejó de ser líder del scheduler")
+        try:
+            self.on_demoted()
+        except Exception as e:
+            logger.error(f"❌ Error deteniendo scheduler: {e}")
+
+    def _close_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def stop(self):
+        """Libera el liderazgo (al apagar el proceso) para que otro lo tome de inmediato"""
+        self._stop.set()
+        was_leader = self.is_leader
+        self._step_down()
+        if self._conn is not None and was_leader:
+            try:
+                self._conn.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': self.lock_name})
+            except Exception:
+                pass
+        self._close_connection()
+
+    def status(self) -> dict:
+        return {
+            'identity': self.identity,
+            'mode': self.mode,
+            'is_leader': self.is_leader,
+            'leader_since': self.leader_since.isoformat() if self.leader_since else None,
+            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            'elections': self.elections,
+            'lock_name': self.lock_name,
+            'poll_seconds': self.poll_seconds,
+        }
+
+
+_local_named_locks = {}
+_local_named_locks_guard = threading.Lock()
+
+
+@contextmanager
+def db_named_lock(name: str, timeout: int = 0):
+    """
+    Lock con nombre compartido entre procesos (MySQL GET_LOCK) para secciones
+    que no deben correr en paralelo en dos workers.
+
+    Uso:
+        with db_named_lock('create_ticket') as acquired:
+            if not acquired:
+                return
+
+    Debe usarse dentro de un app context. Con bases que no son MySQL usa un
+    lock local del proceso.
+    """
+    if db.engine.dialect.name != 'mysql':
+        with _local_named_locks_guard:
+            lock = _local_named_locks.setdefault(name, threading.Lock())
+        acquired = lock.acquire(timeout=timeout) if timeout > 0 else lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    conn = db.engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+    acquired = False
+    try:
+        acquired = conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"), {'name': name, 'timeout': timeout}
+        ).scalar() == 1
+        if not acquired:
+            logger.info(f"🔒 Lock '{name}' tomado por otro proceso")
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': name})
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo liberar lock '{name}': {e}")
+        conn.close()
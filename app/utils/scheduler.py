@@ -1,162 +1,89 @@
 """
 Scheduler para tareas programadas
-Ejecuta el flujo completo de tickets cada 10 minutos
+Ejecuta el flujo completo de tickets cada 10 minutos.
+Los jobs se ejecutan dentro del proceso a través del registro de jobs
+(app.utils.job_registry), sin llamar a los endpoints HTTP locales, y pasan por
+el pool acotado de app.utils.job_executor para que no se solapen.
+Con varios procesos, solo el líder elegido (app.utils.leader_election) corre
+el scheduler.
 """
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-import requests
+from apscheduler.util import undefined
 from datetime import datetime
 import pytz
 import os
 import atexit
+from app.utils.adaptive_intervals import adaptive_intervals
+from app.utils.job_executor import submit_job
+from app.utils.shift_triggers import shift_triggers
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 # Variable global para evitar múltiples schedulers
 _scheduler_instance = None
-_scheduler_lock_file = '/tmp/splynx_scheduler.lock'
+_leader_election = None
 
 
-def run_process_webhooks_job(app):
-    """Procesa webhooks pendientes y crea tickets en Splynx llamando al endpoint HTTP"""
-    with app.app_context():
-        from app.utils.config_helper import ConfigHelper
-
-        # Obtener configuración de horarios desde BD
-        FINDE_HORA_INICIO = ConfigHelper.get_int('FINDE_HORA_INICIO', 9)
-        FINDE_HORA_FIN = ConfigHelper.get_int('FINDE_HORA_FIN', 21)
-        SEMANA_HORA_INICIO = ConfigHelper.get_int('SEMANA_HORA_INICIO', 8)
-        SEMANA_HORA_FIN = ConfigHelper.get_int('SEMANA_HORA_FIN', 23)
-
-    # Obtener hora actual en Argentina
-    tz_argentina = pytz.timezone('America/Argentina/Buenos_Aires')
-    now = datetime.now(tz_argentina)
-    day_of_week = now.weekday()  # 0=Lunes, 6=Domingo
-    current_hour = now.hour
-
-    # HORARIO LABORAL: configurable desde BD (lunes a viernes / fin de semana)
-    if day_of_week >= 5:  # Sábado o Domingo
-        if not (FINDE_HORA_INICIO <= current_hour < FINDE_HORA_FIN):
-            logger.info(f"FIN DE SEMANA FUERA DE HORARIO ({current_hour}:00) - Saltando ejecución")
-            return
-    else:  # Lunes a Viernes
-        if not (SEMANA_HORA_INICIO <= current_hour < SEMANA_HORA_FIN):
-            logger.info(f"FUERA DE HORARIO LABORAL ({current_hour}:00) - Saltando ejecución")
-            return
-
-    logger.info("="*60)
-    logger.info(f"CRON JOB process_webhooks INICIADO - {now.strftime('%Y-%m-%d %H:%M:%S')} (Argentina)")
-    logger.info(f"PID: {os.getpid()}")
-    logger.info("="*60)
-
-    try:
-        logger.info("Llamando al endpoint /api/tickets/process_webhooks...")
-        response = requests.post('http://localhost:7842/api/tickets/process_webhooks', timeout=300)
-
-        if response.status_code == 200:
-            response_data = response.json()
-            logger.info("Endpoint process_webhooks ejecutado exitosamente")
-            logger.info(f"Respuesta: {response_data}")
-        else:
-            logger.error(f"Endpoint process_webhooks FALLO con codigo: {response.status_code}")
-            logger.error(f"Respuesta: {response.text}")
-
-        logger.info("="*60)
-        logger.info(f"CRON JOB COMPLETADO - {datetime.now(tz_argentina).strftime('%Y-%m-%d %H:%M:%S')}")
-        logger.info("="*60)
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error al llamar al endpoint: {str(e)}")
-        logger.info("="*60)
-    except Exception as e:
-        logger.error(f"Error en cron job: {str(e)}")
-        logger.info("="*60)
-
-
-def run_ticket_reopen_checker_job(app):
-    """Verifica tickets en ventana de reapertura y reabre si no hay cierre de GR."""
-    with app.app_context():
-        from app.utils.config_helper import ConfigHelper
-
-        # Obtener configuración de horarios desde BD
-        FINDE_HORA_INICIO = ConfigHelper.get_int('FINDE_HORA_INICIO', 9)
-        FINDE_HORA_FIN = ConfigHelper.get_int('FINDE_HORA_FIN', 21)
-        SEMANA_HORA_INICIO = ConfigHelper.get_int('SEMANA_HORA_INICIO', 8)
-        SEMANA_HORA_FIN = ConfigHelper.get_int('SEMANA_HORA_FIN', 23)
-
-    tz_argentina = pytz.timezone('America/Argentina/Buenos_Aires')
-    now = datetime.now(tz_argentina)
-    day_of_week = now.weekday()
-    current_hour = now.hour
-
-    if day_of_week >= 5:
-        if not (FINDE_HORA_INICIO <= current_hour < FINDE_HORA_FIN):
-            return
-    else:
-        if not (SEMANA_HORA_INICIO <= current_hour < SEMANA_HORA_FIN):
-            return
-
-    logger.info(f"🔍 REOPEN CHECKER INICIADO - {now.strftime('%Y-%m-%d %H:%M:%S')}")
-
-    try:
-        with app.app_context():
-            from app.services.ticket_reopen_checker import check_and_reopen_tickets
-            result = check_and_reopen_tickets()
-            logger.info(f"🔍 Reopen checker resultado: {result}")
-    except Exception as e:
-        logger.error(f"❌ Error en reopen checker job: {e}")
-
-
-def run_reset_assignment_counters_job(app):
-    """Resetea los contadores de asignación al inicio de cada turno configurado.
+def init_scheduler(app):
+    """
+    Inicializa la elección de líder del scheduler.
 
-    Lee ASSIGNMENT_RESET_HOURS de system_config (CSV de horas, ej: "8,16").
-    Se ejecuta cada minuto y verifica si la hora actual coincide con una hora
-    de reset (minuto 0, con margen de ±2 minutos).
+    Todos los procesos atienden requests; solo el que obtiene el lock de líder
+    (MySQL GET_LOCK) corre los jobs programados. Si el líder muere, otro proceso
+    toma el lock en segundos y arranca su scheduler.
     """
-    with app.app_context():
-        from app.utils.config_helper import ConfigHelper
-        from app.interface.interfaces import AssignmentTrackerInterface
+    global _leader_election
 
-        tz_argentina = pytz.timezone('America/Argentina/Buenos_Aires')
-        now = datetime.now(tz_argentina)
+    if _leader_election is not None:
+        logger.warning("⚠️ Elección de líder del scheduler ya iniciada en este proceso, omitiendo...")
+        return _leader_election
 
-        # Leer horas de reset desde DB (default: "8,16")
-        reset_hours_str = ConfigHelper.get_str('ASSIGNMENT_RESET_HOURS', '8,16')
-        try:
-            reset_hours = [int(h.strip()) for h in reset_hours_str.split(',') if h.strip()]
-        except ValueError:
-            logger.error(f"❌ ASSIGNMENT_RESET_HOURS inválido: '{reset_hours_str}', usando default 8,16")
-            reset_hours = [8, 16]
+    from app.utils.leader_election import SchedulerLeaderElection
 
-        # Verificar si estamos dentro de la ventana de reset (hora exacta, minuto 0-2)
-        if now.hour in reset_hours and now.minute <= 2:
-            logger.info("=" * 60)
-            logger.info(f"⚖️ RESET DE CONTADORES DE ASIGNACIÓN - Turno {now.hour}:00")
+    _leader_election = SchedulerLeaderElection(
+        app,
+        on_elected=lambda: start_scheduler(app),
+        on_demoted=stop_scheduler,
+    )
+    atexit.register(_leader_election.stop)
+    _leader_election.start()
+    return _leader_election
 
-            success = AssignmentTrackerInterface.reset_all_counts()
-            if success:
-                logger.info(f"⚖️ Contadores de asignación reseteados (turno {now.hour}:00)")
-            else:
-                logger.error(f"❌ Error al resetear contadores de asignación (turno {now.hour}:00)")
 
-            logger.info("=" * 60)
+def get_scheduler_status():
+    """Estado de liderazgo y del scheduler de este proceso"""
+    from apscheduler.schedulers.base import STATE_RUNNING
+    return {
+        'leader': _leader_election.status() if _leader_election else None,
+        'running': bool(_scheduler_instance and _scheduler_instance.state == STATE_RUNNING),
+        'jobs': [job.id for job in _scheduler_instance.get_jobs()] if _scheduler_instance else [],
+        'adaptive_intervals': adaptive_intervals.stats(),
+        'shift_triggers': shift_triggers.stats(),
+    }
 
 
-def _cleanup_lock():
-    """Limpia el archivo de lock al salir"""
+def stop_scheduler():
+    """Detiene el scheduler de este proceso (al perder el liderazgo)"""
+    global _scheduler_instance
+    from app.services.alert_deadlines import deadline_queue
+    if deadline_queue.running:
+        deadline_queue.stop()
+    adaptive_intervals.detach()
+    shift_triggers.detach()
+    if _scheduler_instance is None:
+        return
     try:
-        if os.path.exists(_scheduler_lock_file):
-            os.remove(_scheduler_lock_file)
-            logger.info("🧹 Lock file removido")
-    except Exception as e:
-        logger.warning(f"⚠️ Error al remover lock file: {e}")
+        _scheduler_instance.shutdown(wait=False)
+    finally:
+        _scheduler_instance = None
+        logger.info("⏹️ Scheduler detenido en este proceso")
 
 
-def init_scheduler(app):
-    """Inicializa el scheduler con la tarea programada"""
+def start_scheduler(app):
+    """Arranca el scheduler con las tareas programadas (solo en el proceso líder)"""
     global _scheduler_instance
 
     # Verificar si ya existe una instancia viva en este proceso
@@ -169,44 +96,30 @@ def init_scheduler(app):
             logger.warning("⚠️ Scheduler instance existe pero no está corriendo (state=%s), reinicializando...", _scheduler_instance.state)
             _scheduler_instance = None
 
-    # Verificar lock file para evitar múltiples schedulers entre procesos
-    if os.path.exists(_scheduler_lock_file):
-        try:
-            with open(_scheduler_lock_file, 'r') as f:
-                existing_pid = int(f.read().strip())
+    # Con la cola de vencimientos las alertas salen al llegar cada vencimiento y el
+    # barrido completo queda como red de seguridad con menor frecuencia
+    with app.app_context():
+        from app.utils.config_helper import ConfigHelper
+        deadline_queue_enabled = ConfigHelper.get_bool('ALERT_DEADLINE_QUEUE_ENABLED', True)
+        alert_scan_minutes = ConfigHelper.get_int('ALERT_FULL_SCAN_MINUTES', 15) if deadline_queue_enabled else 3
+
+        # Sincronización, alertas e importación arrancan en su intervalo base dentro de
+        # los límites de system_config; después de cada corrida se ajustan según la actividad
+        adaptive = ConfigHelper.get_bool('ADAPTIVE_INTERVALS_ENABLED', True)
+        base_seconds = {
+            'sync_tickets_status': 5 * 60,
+            'import_existing_tickets': 5 * 60,
+            'alert_overdue': alert_scan_minutes * 60,
+        }
+        if adaptive:
+            base_seconds = {name: adaptive_intervals.clamp(name, seconds) for name, seconds in base_seconds.items()}
 
-            # Verificar si el proceso con ese PID realmente existe
-            try:
-                os.kill(existing_pid, 0)  # Señal 0: solo verifica existencia, no mata el proceso
-                # El proceso existe — si es otro proceso, respetar el lock
-                if existing_pid != os.getpid():
-                    logger.warning(f"⚠️ Scheduler ya está corriendo en PID {existing_pid}, omitiendo...")
-                    return None
-                # Si es nuestro propio PID pero la instancia murió, continuar
-                logger.warning(f"⚠️ Lock file apunta al PID actual ({existing_pid}) pero instancia no activa, reinicializando...")
-                _cleanup_lock()
-            except OSError:
-                # El proceso ya no existe — lock file es stale (ej: reinicio del VPS)
-                logger.warning(f"⚠️ Lock file stale detectado (PID {existing_pid} ya no existe), limpiando y reinicializando...")
-                _cleanup_lock()
-        except (ValueError, Exception) as e:
-            logger.warning(f"⚠️ Error leyendo lock file: {e}, limpiando...")
-            _cleanup_lock()
-    
-    # Crear lock file con el PID actual
-    try:
-        with open(_scheduler_lock_file, 'w') as f:
-            f.write(str(os.getpid()))
-        # Registrar limpieza al salir
-        atexit.register(_cleanup_lock)
-    except Exception as e:
-        logger.warning(f"⚠️ No se pudo crear lock file: {e}")
-    
     scheduler = BackgroundScheduler(timezone='America/Argentina/Buenos_Aires')
     
     # Agregar job que se ejecuta cada 3 minutos - procesa webhooks y crea tickets
     scheduler.add_job(
-        func=lambda: run_process_webhooks_job(app),
+        func=submit_job,
+        args=[app, 'process_webhooks', 'scheduler'],
         trigger=IntervalTrigger(minutes=3),
         id='process_webhooks_job',
         name='Procesar webhooks cada 3 minutos',
@@ -215,99 +128,125 @@ def init_scheduler(app):
     
     # Agregar job para asignar tickets sin asignar (cada 3 minutos)
     scheduler.add_job(
-        func=lambda: requests.post('http://localhost:7842/api/tickets/assign_unassigned'),
+        func=submit_job,
+        args=[app, 'assign_unassigned', 'scheduler'],
         trigger=IntervalTrigger(minutes=3),
         id='assign_unassigned_job',
         name='Asignar tickets sin asignar cada 3 minutos',
         replace_existing=True
     )
 
-    # Agregar job para alertar tickets vencidos (cada 3 minutos)
+    # Agregar job para alertar tickets vencidos (barrido completo; también siembra la cola de vencimientos)
     scheduler.add_job(
-        func=lambda: requests.post('http://localhost:7842/api/tickets/alert_overdue'),
-        trigger=IntervalTrigger(minutes=3),
+        func=submit_job,
+        args=[app, 'alert_overdue', 'scheduler'],
+        trigger=IntervalTrigger(seconds=base_seconds['alert_overdue']),
         id='alert_overdue_job',
-        name='Alertar tickets vencidos cada 3 minutos',
-        replace_existing=True
-    )
-    
-    # Agregar job para notificaciones de fin de turno (cada hora)
-    scheduler.add_job(
-        func=lambda: requests.post('http://localhost:7842/api/tickets/end_of_shift_notifications'),
-        trigger=IntervalTrigger(hours=1),
-        id='end_of_shift_notifications_job',
-        name='Verificar notificaciones de fin de turno cada hora',
-        replace_existing=True
-    )
-    
-    # Agregar job para desasignación automática después de fin de turno (cada 40 minutos)
-    scheduler.add_job(
-        func=lambda: requests.post('http://localhost:7842/api/tickets/auto_unassign_after_shift'),
-        trigger=IntervalTrigger(minutes=40),
-        id='auto_unassign_after_shift_job',
-        name='Desasignar tickets 1 hora después del fin de turno cada 40 minutos',
+        name='Alertar tickets vencidos (intervalo adaptativo)' if adaptive else f'Alertar tickets vencidos cada {alert_scan_minutes} minutos',
+        next_run_time=datetime.now(pytz.timezone('America/Argentina/Buenos_Aires')) if deadline_queue_enabled else undefined,
         replace_existing=True
     )
     
     # Agregar job para sincronización de estado de tickets con Splynx (cada 5 minutos)
     scheduler.add_job(
-        func=lambda: requests.post('http://localhost:7842/api/tickets/sync_status'),
-        trigger=IntervalTrigger(minutes=5),
+        func=submit_job,
+        args=[app, 'sync_tickets_status', 'scheduler'],
+        trigger=IntervalTrigger(seconds=base_seconds['sync_tickets_status']),
         id='sync_tickets_status_job',
-        name='Sincronizar estado de tickets con Splynx cada 5 minutos',
+        name='Sincronizar estado de tickets con Splynx (intervalo adaptativo)' if adaptive else 'Sincronizar estado de tickets con Splynx cada 5 minutos',
         replace_existing=True
     )
     
     # Agregar job para importar tickets existentes del grupo 4 (cada 5 minutos)
     scheduler.add_job(
-        func=lambda: requests.post('http://localhost:7842/api/tickets/import_existing'),
-        trigger=IntervalTrigger(minutes=5),
+        func=submit_job,
+        args=[app, 'import_existing_tickets', 'scheduler'],
+        trigger=IntervalTrigger(seconds=base_seconds['import_existing_tickets']),
         id='import_existing_tickets_job',
-        name='Importar tickets existentes del grupo 4 cada 5 minutos',
+        name='Importar tickets existentes del grupo 4 (intervalo adaptativo)' if adaptive else 'Importar tickets existentes del grupo 4 cada 5 minutos',
         replace_existing=True
     )
     
     # Agregar job para verificar reapertura de tickets (cada 2 minutos)
     scheduler.add_job(
-        func=lambda: run_ticket_reopen_checker_job(app),
+        func=submit_job,
+        args=[app, 'ticket_reopen_checker', 'scheduler'],
         trigger=IntervalTrigger(minutes=2),
         id='ticket_reopen_checker_job',
         name='Verificar reapertura de tickets cada 2 minutos',
         replace_existing=True
     )
 
-    # Agregar job para resetear contadores de asignación por turno (cada 1 minuto)
+    # Agregar job para mantener el espejo local de tickets de Splynx (cada 1 minuto)
     scheduler.add_job(
-        func=lambda: run_reset_assignment_counters_job(app),
+        func=submit_job,
+        args=[app, 'ticket_mirror_sync', 'scheduler'],
         trigger=IntervalTrigger(minutes=1),
-        id='reset_assignment_counters_job',
-        name='Reset contadores de asignación por turno cada 1 minuto',
+        id='ticket_mirror_sync_job',
+        name='Sincronizar espejo local de tickets Splynx cada 1 minuto',
+        replace_existing=True
+    )
+
+    # Agregar job para procesar eventos de Splynx que quedaron pendientes (cada 5 minutos;
+    # normalmente los procesa el webhook apenas llegan)
+    scheduler.add_job(
+        func=submit_job,
+        args=[app, 'process_splynx_events', 'scheduler'],
+        trigger=IntervalTrigger(minutes=5),
+        id='process_splynx_events_job',
+        name='Procesar eventos de Splynx pendientes cada 5 minutos',
+        replace_existing=True
+    )
+
+    # Agregar job para purgar el registro de ejecuciones de jobs (cada 1 día)
+    scheduler.add_job(
+        func=submit_job,
+        args=[app, 'purge_job_runs', 'scheduler'],
+        trigger=IntervalTrigger(days=1),
+        id='purge_job_runs_job',
+        name='Purgar registro de ejecuciones de jobs cada 1 día',
         replace_existing=True
     )
 
     # Iniciar el scheduler
     scheduler.start()
     _scheduler_instance = scheduler
+
+    if adaptive:
+        adaptive_intervals.attach(scheduler, base_seconds)
+
+    # Reset de contadores, resúmenes de fin de turno y desasignación post-turno
+    # corren en triggers cron derivados de operator_schedule y system_config
+    shift_triggers.attach(app, scheduler)
+
+    if deadline_queue_enabled:
+        from app.services.alert_deadlines import deadline_queue
+        deadline_queue.start(on_due=lambda: submit_job(app, 'alert_deadlines', 'deadline'))
     
     logger.info("="*60)
     logger.info("SCHEDULER INICIADO")
     logger.info("Tareas programadas:")
     logger.info("   - process_webhooks cada 3 minutos")
     logger.info("   - Asignacion tickets sin asignar cada 3 minutos (independiente)")
-    logger.info("   - Alertas tickets vencidos cada 3 minutos")
-    logger.info("   - Notificaciones de fin de turno cada hora")
-    logger.info("   - Desasignacion automatica cada 40 minutos")
-    logger.info("   - Sincronizacion estado tickets cada 5 minutos")
-    logger.info("   - Importacion tickets existentes cada 5 minutos")
+    if deadline_queue_enabled:
+        logger.info(f"   - Alertas tickets vencidos al llegar cada vencimiento (barrido completo cada {base_seconds['alert_overdue'] // 60:g} minutos)")
+    else:
+        logger.info(f"   - Alertas tickets vencidos cada {base_seconds['alert_overdue'] // 60:g} minutos")
+    logger.info("   - Reset contadores, notificaciones de fin de turno y desasignacion automatica en los bordes de turno")
+    logger.info(f"   - Sincronizacion estado tickets cada {base_seconds['sync_tickets_status'] // 60:g} minutos")
+    logger.info(f"   - Importacion tickets existentes cada {base_seconds['import_existing_tickets'] // 60:g} minutos")
+    if adaptive:
+        logger.info("     (sincronizacion, alertas e importacion con intervalo adaptativo)")
     logger.info("   - Verificacion reapertura tickets cada 2 minutos")
-    logger.info("   - Reset contadores asignacion por turno cada 1 minuto")
+    logger.info("   - Sincronizacion espejo de tickets Splynx cada 1 minuto")
+    logger.info("   - Eventos de Splynx pendientes cada 5 minutos (los webhooks se procesan al llegar)")
+    logger.info("   - Purga registro de ejecuciones de jobs cada 1 dia")
     logger.info("Zona horaria: America/Argentina/Buenos_Aires")
     logger.info(f"PID: {os.getpid()}")
     logger.info("="*60)
 
     # Ejecutar inmediatamente al iniciar
     logger.info("Ejecutando flujo inicial al arrancar la aplicacion...")
-    import threading
-    threading.Thread(target=lambda: run_process_webhooks_job(app)).start()
+    submit_job(app, 'process_webhooks', 'scheduler')
     
     return scheduler
@@ -0,0 +1,261 @@
+"""
+Triggers de borde de turno precalculados.
+
+En lugar de jobs que despiertan cada minuto (o cada 40/60 minutos) para ver si
+"es la hora", el líder arma triggers cron a partir de operator_schedule y
+system_config:
+
+- reset de contadores:     ASSIGNMENT_RESET_HOURS, minuto 0
+- resumen de fin de turno: fin de cada turno laboral - END_OF_SHIFT_NOTIFICATION_MINUTES
+                           (lunes a viernes, un trigger por día/hora con sus operadores)
+- desasignación post-turno: fin de cada turno laboral + 60 minutos
+
+Los triggers usan coalesce y misfire_grace_time: una corrida demorada se
+ejecuta una sola vez en lugar de perderse o duplicarse.
+
+El plan se reconstruye cuando las rutas de admin cambian horarios o
+configuración en este proceso (request_rebuild). Si el cambio entró por otro
+worker, el líder lo detecta comparando la huella del plan cada
+SHIFT_TRIGGERS_CHECK_MINUTES.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.utils.constants import TIMEZONE
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_PREFIX = 'shift_'
+FINGERPRINT_JOB_ID = 'shift_triggers_fingerprint'
+SHIFT_TRIGGERS_CHECK_MINUTES = 5
+MISFIRE_GRACE_SECONDS = 10 * 60
+UNASSIGN_AFTER_SHIFT_MINUTES = 60
+NIGHT_SHIFT = ('00:00', '08:00')
+
+# Claves de system_config que cambian el plan
+CONFIG_KEYS = ('ASSIGNMENT_RESET_HOURS', 'END_OF_SHIFT_NOTIFICATION_MINUTES')
+
+
+def _read_config(key: str, default: str) -> str:
+    # Directo de BD: el caché de ConfigHelper del líder no ve cambios hechos en otro worker
+    from app.interface.interfaces import SystemConfigInterface
+    config = SystemConfigInterface.get_by_key(key)
+    return config.value if config and config.value not in (None, '') else default
+
+
+def _to_minutes(hhmm: str) -> Optional[int]:
+    try:
+        hour, minute = map(int, hhmm.split(':'))
+        return hour * 60 + minute
+    except (AttributeError, ValueError):
+        return None
+
+
+def _slot(day: int, minutes: int) -> str:
+    return f"{day}|{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def build_shift_plan() -> Dict[str, Any]:
+    """
+    Calcula los bordes de turno desde la BD (requiere app context).
+
+    Returns:
+        dict con 'reset_hours', 'end_of_shift' ({"dia|HH:MM": [person_ids]}) y
+        'unassign' (["dia|HH:MM"])
+    """
+    from app.models.models import OperatorConfig, OperatorSchedule
+
+    raw_hours = _read_config('ASSIGNMENT_RESET_HOURS', '8,16')
+    try:
+        reset_hours = sorted({int(h.strip()) for h in raw_hours.split(',') if h.strip()})
+    except ValueError:
+        logger.error(f"❌ ASSIGNMENT_RESET_HOURS inválido: '{raw_hours}', usando default 8,16")
+        reset_hours = [8, 16]
+
+    try:
+        notify_minutes = int(_read_config('END_OF_SHIFT_NOTIFICATION_MINUTES', '60'))
+    except ValueError:
+        notify_minutes = 60
+
+    active_ids = {op.person_id for op in OperatorConfig.query.filter_by(is_active=True).all()}
+    schedules = OperatorSchedule.query.filter_by(schedule_type='work', is_active=True).all()
+
+    end_of_shift: Dict[str, Set[int]] = {}
+    unassign: Set[str] = set()
+    for schedule in schedules:
+        end = _to_minutes(schedule.end_time)
+        if end is None:
+            continue
+
+        # Misma ventana que auto_unassign_after_shift: solo dentro del mismo día
+        if end + UNASSIGN_AFTER_SHIFT_MINUTES < 24 * 60:
+            unassign.add(_slot(schedule.day_of_week, end + UNASSIGN_AFTER_SHIFT_MINUTES))
+
+        if (schedule.person_id not in active_ids or schedule.day_of_week >= 5
+                or (schedule.start_time, schedule.end_time) == NIGHT_SHIFT):
+            continue
+        notify_at = end - notify_minutes
+        if notify_at >= 0:
+            end_of_shift.setdefault(_slot(schedule.day_of_week, notify_at), set()).add(schedule.person_id)
+
+    return {
+        'reset_hours': reset_hours,
+        'end_of_shift': {slot: sorted(ids) for slot, ids in sorted(end_of_shift.items())},
+        'unassign': sorted(unassign),
+    }
+
+
+def plan_fingerprint(plan: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(plan, sort_keys=True).encode()).hexdigest()
+
+
+class ShiftTriggers:
+    """Mantiene en el scheduler del líder los triggers derivados del plan de turnos"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._app = None
+        self._scheduler = None
+        self._fingerprint: Optional[str] = None
+        self._plan: Dict[str, Any] = {}
+        self._pending_summaries: Set[int] = set()
+        self.rebuilds = 0
+        self.built_at: Optional[datetime] = None
+
+    def attach(self, app, scheduler):
+        """Lo llama start_scheduler después de arrancar el scheduler"""
+        with self._lock:
+            self._app = app
+            self._scheduler = scheduler
+            self._fingerprint = None
+        scheduler.add_job(
+            func=self.rebuild,
+            trigger=IntervalTrigger(minutes=SHIFT_TRIGGERS_CHECK_MINUTES),
+            id=FINGERPRINT_JOB_ID,
+            name=f'Verificar cambios en horarios de turno cada {SHIFT_TRIGGERS_CHECK_MINUTES} minutos',
+            replace_existing=True
+        )
+        self.rebuild()
+
+    def detach(self):
+        with self._lock:
+            self._scheduler = None
+            self._fingerprint = None
+            self._pending_summaries.clear()
+
+    def request_rebuild(self):
+        """Avisar que cambiaron horarios o configuración de turnos (rutas de admin)"""
+        if self._scheduler is None:
+            logger.info(f"🗓️ Cambio de turnos registrado - el líder lo aplica en hasta {SHIFT_TRIGGERS_CHECK_MINUTES} minutos")
+            return
+        self.rebuild()
+
+    def rebuild(self) -> bool:
+        """Recalcula el plan y, si cambió su huella, reemplaza los triggers de turno"""
+        from app.utils.job_executor import submit_job
+
+        with self._lock:
+            scheduler, app = self._scheduler, self._app
+            if scheduler is None:
+                return False
+            try:
+                with app.app_context():
+                    plan = build_shift_plan()
+            except Exception as e:
+                logger.error(f"❌ Error calculando triggers de turno: {e}")
+                return False
+
+            fingerprint = plan_fingerprint(plan)
+            if fingerprint == self._fingerprint:
+                return False
+
+            for job in scheduler.get_jobs():
+                if job.id.startswith(JOB_PREFIX) and job.id != FINGERPRINT_JOB_ID:
+                    job.remove()
+
+            options = dict(misfire_grace_time=MISFIRE_GRACE_SECONDS, coalesce=True, replace_existing=True)
+            if plan['reset_hours']:
+                scheduler.add_job(
+                    func=submit_job,
+                    args=[app, 'reset_assignment_counters', 'shift'],
+                    trigger=CronTrigger(hour=','.join(map(str, plan['reset_hours'])), minute=0, timezone=TIMEZONE),
+                    id=f'{JOB_PREFIX}reset_assignment_counters',
+                    name=f"Reset contadores de asignación a las {', '.join(f'{h}:00' for h in plan['reset_hours'])}",
+                    **options
+                )
+            for slot, person_ids in plan['end_of_shift'].items():
+                day, hhmm = slot.split('|')
+                hour, minute = hhmm.split(':')
+                scheduler.add_job(
+                    func=self._fire_end_of_shift,
+                    args=[person_ids],
+                    trigger=CronTrigger(day_of_week=int(day), hour=int(hour), minute=int(minute), timezone=TIMEZONE),
+                    id=f'{JOB_PREFIX}end_of_shift_{day}_{hour}{minute}',
+                    name=f'Resumen de fin de turno día {day} {hhmm} ({len(person_ids)} operadores)',
+                    **options
+                )
+            for slot in plan['unassign']:
+                day, hhmm = slot.split('|')
+                hour, minute = hhmm.split(':')
+                scheduler.add_job(
+                    func=submit_job,
+                    args=[app, 'auto_unassign_after_shift', 'shift'],
+                    trigger=CronTrigger(day_of_week=int(day), hour=int(hour), minute=int(minute), timezone=TIMEZONE),
+                    id=f'{JOB_PREFIX}auto_unassign_{day}_{hour}{minute}',
+                    name=f'Desasignación post-turno día {day} {hhmm}',
+                    **options
+                )
+
+            self._plan = plan
+            self._fingerprint = fingerprint
+            self.rebuilds += 1
+            self.built_at = datetime.now()
+        logger.info(
+            f"🗓️ Triggers de turno reconstruidos: reset {plan['reset_hours']}, "
+            f"{len(plan['end_of_shift'])} resúmenes de fin de turno, {len(plan['unassign'])} desasignaciones"
+        )
+        return True
+
+    def _fire_end_of_shift(self, person_ids: List[int]):
+        from app.utils.job_executor import submit_job
+        with self._lock:
+            self._pending_summaries.update(person_ids)
+            app = self._app
+        submit_job(app, 'end_of_shift_notifications', 'shift')
+
+    def take_pending_summaries(self) -> Set[int]:
+        """Devuelve y vacía los operadores con resumen de fin de turno pendiente"""
+        with self._lock:
+            pending, self._pending_summaries = self._pending_summaries, set()
+            return pending
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            scheduler = self._scheduler
+            jobs = []
+            if scheduler is not None:
+                for job in scheduler.get_jobs():
+                    if job.id.startswith(JOB_PREFIX) and job.id != FINGERPRINT_JOB_ID:
+                        jobs.append({
+                            'id': job.id,
+                            'next_run_time': job.next_run_time.isoformat() if job.next_run_time else None,
+                        })
+            return {
+                'attached': scheduler is not None,
+                'fingerprint': self._fingerprint,
+                'rebuilds': self.rebuilds,
+                'built_at': self.built_at.isoformat() if self.built_at else None,
+                'pending_summaries': sorted(self._pending_summaries),
+                'jobs': sorted(jobs, key=lambda j: j['next_run_time'] or ''),
+            }
+
+
+shift_triggers = ShiftTriggers()
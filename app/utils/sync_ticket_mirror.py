@@ -0,0 +1,131 @@
+"""
+Job para mantener la tabla espejo de tickets abiertos del grupo de soporte de Splynx.
+Pide a Splynx solo los cambios desde la marca de agua (delta) y cada
+SPLYNX_FULL_RECONCILE_MINUTES hace una pasada completa como red de seguridad.
+
+Los jobs de lectura (alertas, fin de turno, desasignación, dashboards) consultan el
+espejo con SQL mientras esté habilitado y fresco; si no, vuelven a pedir a Splynx.
+"""
+
+from typing import List, Optional
+
+from app.interface.splynx_ticket_mirror import SplynxTicketMirrorInterface
+from app.services.alert_deadlines import deadline_queue
+from app.services.splynx_services_singleton import SplynxServicesSingleton
+from app.utils.config_helper import ConfigHelper
+from app.utils.constants import SPLYNX_SUPPORT_GROUP_ID
+from app.utils.logger import get_logger
+from app.utils.sync_watermark import SyncWatermark
+
+logger = get_logger(__name__)
+
+# Nombre de la marca de agua de este job en system_config
+WATERMARK_NAME = 'MIRROR'
+
+
+def sync_ticket_mirror():
+    """
+    Actualiza el espejo local con los tickets de Splynx del grupo de soporte.
+
+    Returns:
+        dict: Resultado de la sincronización
+    """
+    if not ConfigHelper.get_bool('SPLYNX_MIRROR_ENABLED', True):
+        return {'success': True, 'skipped': 'mirror_disabled'}
+
+    try:
+        splynx = SplynxServicesSingleton()
+        if splynx.is_circuit_open():
+            logger.warning("🔴 Splynx no disponible (circuito abierto) - sync del espejo omitido")
+            return {'success': False, 'skipped': 'splynx_circuit_open'}
+
+        full_reconcile = SyncWatermark.needs_full_reconcile(WATERMARK_NAME)
+
+        if full_reconcile:
+            seen_tickets = splynx.get_open_tickets(group_id=SPLYNX_SUPPORT_GROUP_ID)
+            result = SplynxTicketMirrorInterface.reconcile(seen_tickets, SPLYNX_SUPPORT_GROUP_ID)
+        else:
+            # Sin filtro de grupo: también hay que ver los tickets que salieron del grupo
+            since = SyncWatermark.get_since(WATERMARK_NAME)
+            seen_tickets = splynx.get_tickets_updated_since(since)
+            result = SplynxTicketMirrorInterface.apply_changes(seen_tickets, SPLYNX_SUPPORT_GROUP_ID)
+
+        # Los tickets que cambiaron recalculan su próximo vencimiento de alerta
+        if deadline_queue.running:
+            deadline_queue.schedule_tickets(seen_tickets, full=full_reconcile)
+
+        SyncWatermark.advance(WATERMARK_NAME, seen_tickets)
+        if full_reconcile:
+            SyncWatermark.mark_full_reconcile(WATERMARK_NAME)
+        SyncWatermark.mark_synced(WATERMARK_NAME)
+
+        logger.info(
+            f"🪞 Espejo Splynx ({'completo' if full_reconcile else 'incremental'}): "
+            f"{result['upserted']} actualizados, {result['removed']} eliminados"
+        )
+        return {
+            'success': True,
+            'mode': 'full' if full_reconcile else 'delta',
+            'splynx_changed': len(seen_tickets),
+            **result
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Error sincronizando espejo de tickets Splynx: {e}")
+        return {'success': False, 'error': str(e)}
+
+
+def mirror_is_usable() -> bool:
+    """True si el espejo está habilitado y se sincronizó hace menos de SPLYNX_MIRROR_MAX_AGE_SECONDS"""
+    if not ConfigHelper.get_bool('SPLYNX_MIRROR_ENABLED', True):
+        return False
+    age = SyncWatermark.seconds_since_sync(WATERMARK_NAME)
+    max_age = ConfigHelper.get_int('SPLYNX_MIRROR_MAX_AGE_SECONDS', 180)
+    return age is not None and age <= max_age
+
+
+def get_open_tickets(splynx: SplynxServicesSingleton, group_id: str = SPLYNX_SUPPORT_GROUP_ID,
+                     assigned: Optional[bool] = None) -> List[dict]:
+    """
+    Tickets abiertos del grupo: desde el espejo si está fresco, si no desde Splynx.
+
+    Args:
+        splynx: Cliente de Splynx para el fallback
+        group_id: Grupo de Splynx
+        assigned: True = asignados, False = sin asignar, None = todos
+    """
+    if str(group_id) == str(SPLYNX_SUPPORT_GROUP_ID) and mirror_is_usable():
+        tickets = SplynxTicketMirrorInterface.get_open(group_id, assigned=assigned)
+        logger.info(f"🪞 {len(tickets)} tickets leídos del espejo local (grupo {group_id})")
+        return tickets
+
+    if assigned is True:
+        return splynx.get_assigned_tickets(group_id=group_id)
+    if assigned is False:
+        return splynx.get_unassigned_tickets(group_id)
+    return splynx.get_open_tickets(group_id=group_id)
+
+
+def record_assignment(ticket_id, assign_to: int):
+    """Write-through tras asignar/desasignar en Splynx, para que el espejo no espere al próximo delta"""
+    if not assign_to:
+        deadline_queue.cancel(ticket_id)
+    try:
+        SplynxTicketMirrorInterface.update_assignment(str(ticket_id), assign_to, SPLYNX_SUPPORT_GROUP_ID)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo actualizar el espejo para ticket {ticket_id}: {e}")
+
+
+def record_created(ticket: dict):
+    """
+    Write-through tras crear un ticket en Splynx.
+
+    El ticket se crea con updated_at = fecha original de GR, casi siempre
+    anterior a la marca de agua, así que el delta no lo traería nunca.
+    """
+    try:
+        SplynxTicketMirrorInterface.apply_changes([ticket], SPLYNX_SUPPORT_GROUP_ID)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo agregar al espejo el ticket creado {ticket.get('id')}: {e}")
+    if deadline_queue.running:
+        deadline_queue.schedule_tickets([ticket])
@@ -15,6 +15,8 @@ from app.utils.logger import get_logger
 from app.interface.reassignment_history import ReassignmentHistoryInterface
 from app.interface.interfaces import OperatorConfigInterface
 from app.interface.webhook_interface import HookCierreTicketInterface
+from app.utils.sync_watermark import SyncWatermark
+from app.utils.leader_election import db_named_lock
 from datetime import datetime
 import pytz
 
@@ -23,6 +25,13 @@ logger = get_logger(__name__)
 # Timezone de Argentina
 ARGENTINA_TZ = pytz.timezone('America/Argentina/Buenos_Aires')
 
+# Nombre de la marca de agua de este job en system_config
+WATERMARK_NAME = 'SYNC'
+
+# Lock con nombre compartido con el procesador de eventos de Splynx: nunca se
+# aplica el mismo cambio dos veces (historial y aviso de reasignación duplicados)
+APPLY_LOCK_NAME = 'splynx_ticket_apply'
+
 
 def _get_operator_name(person_id):
     """Resuelve nombre del operador desde operator_config."""
@@ -66,14 +75,238 @@ def _close_ticket_normally(ticket, ticket_id, updated_at, status_id):
     logger.info(f"✅ Ticket {ticket_id} cerrado (is_closed=True, exceeded_threshold={ticket.exceeded_threshold}, resolution_time={ticket.resolution_time_minutes}min, status_id={status_id})")
 
 
+def _refresh_response_time(ticket, ticket_id, last_update, threshold_minutes, is_closed) -> bool:
+    """Recalcula response_time_minutes y exceeded_threshold. Retorna True si el ticket está vencido."""
+    # Usar hora de Argentina para el cálculo
+    now_argentina = datetime.now(ARGENTINA_TZ)
+
+    # Asegurar que last_update tenga timezone Argentina
+    last_update = ensure_argentina_tz(last_update)
+
+    # Calcular tiempo transcurrido en minutos
+    time_since_update = int((now_argentina - last_update).total_seconds() / 60)
+    ticket.response_time_minutes = time_since_update
+
+    # IMPORTANTE: exceeded_threshold persiste una vez activado
+    # Solo se puede desactivar cuando el ticket se cierra
+    # Si está cerrado, se maneja en el flujo de cierre
+    if is_closed:
+        return False
+
+    # Si ya estaba vencido, mantenerlo vencido
+    if ticket.exceeded_threshold:
+        return True
+
+    # Si no estaba vencido, verificar si ahora excede el threshold
+    if time_since_update > threshold_minutes:
+        ticket.exceeded_threshold = True
+        logger.info(f"🔴 Ticket {ticket_id} marcado como VENCIDO (response_time={time_since_update}min > {threshold_minutes}min)")
+        return True
+
+    return False
+
+
+def apply_splynx_ticket(ticket, splynx_ticket, threshold_minutes, gr_closed=None) -> dict:
+    """
+    Aplica a un IncidentsDetection el estado de su ticket en Splynx: asignación
+    (con historial y aviso por WhatsApp), última actualización, vencimiento y
+    cierre (directo o iniciando la ventana de reapertura).
+
+    Lo usan la sincronización por polling y el procesador de eventos de Splynx.
+    No hace commit.
+
+    Args:
+        gr_closed: numero_ticket_gr con cierre de GR ya consultados en bloque
+                   (prefetch_gr_closures); si es None se consulta este ticket
+
+    Returns:
+        dict: {'closed': bool, 'exceeded': bool, 'reassigned': bool}
+    """
+    outcome = {'closed': False, 'exceeded': False, 'reassigned': False}
+    ticket_id = ticket.Ticket_ID
+
+    # Usar el campo 'closed' de la respuesta de Splynx
+    is_closed = splynx_ticket.get('closed', '0') == '1'
+    status_id = splynx_ticket.get('status_id', '')
+    updated_at = splynx_ticket.get('updated_at', '')
+    # IMPORTANTE: La API de Splynx usa 'assign_to' no 'assigned_to'
+    assigned_to_splynx = splynx_ticket.get('assign_to', None) or splynx_ticket.get('assigned_to', None)
+
+    # Sincronizar assigned_to desde Splynx
+    if assigned_to_splynx:
+        # Convertir a int si no es None
+        new_assigned_to = int(assigned_to_splynx) if assigned_to_splynx else None
+    else:
+        new_assigned_to = None
+
+    # Sincronizar assigned_to si cambió en Splynx
+    if new_assigned_to is not None and new_assigned_to != ticket.assigned_to:
+        old_assigned_to = ticket.assigned_to
+        ticket.assigned_to = new_assigned_to
+
+        old_name = _get_operator_name(old_assigned_to)
+        new_name = _get_operator_name(new_assigned_to)
+
+        # Determinar si es primera asignación o reasignación
+        is_reassignment = old_assigned_to is not None and old_assigned_to != 0
+
+        # Notificar al nuevo operador por WhatsApp
+        notification_sent = False
+        if new_assigned_to and ConfigHelper.is_whatsapp_enabled():
+            try:
+                from app.services.whatsapp_service import WhatsAppService
+                whatsapp_service = WhatsAppService()
+
+                if is_reassignment:
+                    notif_resultado = whatsapp_service.send_ticket_reassignment_notification(
+                        person_id=new_assigned_to,
+                        ticket_id=ticket_id,
+                        subject=ticket.Asunto or 'Sin asunto',
+                        customer_name=ticket.Cliente_Nombre or 'Cliente desconocido',
+                        from_operator_name=old_name,
+                        priority=ticket.Prioridad or 'medium'
+                    )
+                else:
+                    notif_resultado = whatsapp_service.send_ticket_assignment_notification(
+                        person_id=new_assigned_to,
+                        ticket_id=ticket_id,
+                        subject=ticket.Asunto or 'Sin asunto',
+                        customer_name=ticket.Cliente_Nombre or 'Cliente desconocido',
+                        priority=ticket.Prioridad or 'medium'
+                    )
+
+                notification_sent = notif_resultado["success"]
+                if notification_sent:
+                    logger.info(f"📱 Notificación {'de reasignación' if is_reassignment else 'de asignación'} enviada a {new_name} para ticket {ticket_id}")
+                else:
+                    logger.error(f"❌ Error enviando notificación: {notif_resultado.get('error', 'Unknown')}")
+
+                # Notificar al operador anterior que le quitaron el ticket
+                if is_reassignment:
+                    try:
+                        whatsapp_service.send_ticket_removed_notification(
+                            person_id=old_assigned_to,
+                            ticket_id=ticket_id,
+                            subject=ticket.Asunto or 'Sin asunto',
+                            new_operator_name=new_name
+                        )
+                    except Exception as e:
+                        logger.warning(f"⚠️ No se pudo notificar al operador anterior ({old_name}): {e}")
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo enviar notificación WhatsApp: {e}")
+
+        ReassignmentHistoryInterface.create({
+            'ticket_id': str(ticket_id),
+            'from_operator_id': old_assigned_to,
+            'from_operator_name': old_name,
+            'to_operator_id': new_assigned_to,
+            'to_operator_name': new_name,
+            'reason': 'Reasignación detectada en Splynx' if is_reassignment else 'Asignación detectada en Splynx',
+            'reassignment_type': 'splynx_sync',
+            'created_by': 'system',
+            'notification_sent': notification_sent
+        })
+        outcome['reassigned'] = True
+        logger.info(f"🔄 Ticket {ticket_id}: {'reasignado' if is_reassignment else 'asignado'} {old_name} ({old_assigned_to}) → {new_name} ({new_assigned_to}) [WhatsApp: {'✅' if notification_sent else '❌'}]")
+
+    # Calcular tiempo desde última actualización (no desde creación)
+    # Si el ticket fue respondido/actualizado, el contador se resetea
+    last_update = None
+
+    # Usar updated_at de Splynx como fuente de última actualización
+    if updated_at:
+        last_update = parse_splynx_date(updated_at)
+        if last_update:
+            ticket.last_update = last_update
+            logger.debug(f"*** Ticket {ticket_id}: Usando updated_at: {last_update}")
+
+    # Si no hay last_update aún, usar fecha de creación como fallback
+    if not last_update:
+        last_update = parse_ticket_date(ticket.Fecha_Creacion)
+        if last_update and not ticket.last_update:
+            ticket.last_update = last_update
+            logger.debug(f"*** Ticket {ticket_id}: Fallback a Fecha_Creacion: {last_update}")
+
+    if last_update and _refresh_response_time(ticket, ticket_id, last_update, threshold_minutes, is_closed):
+        outcome['exceeded'] = True
+
+    # Si el ticket está cerrado en Splynx (closed = "1")
+    if is_closed:
+        # Caso 0: Ticket sin numero_ticket_gr (no vino de GR) → cerrar directamente
+        # La reapertura solo aplica a tickets que vinieron de GR
+        if not ticket.numero_ticket_gr:
+            _close_ticket_normally(ticket, ticket_id, updated_at, status_id)
+            outcome['closed'] = True
+            logger.info(f"✅ Ticket {ticket_id} cerrado directamente (sin numero_ticket_gr, no aplica reapertura)")
+            return outcome
+
+        # Caso 3: Verificar si ya existe cierre de GR antes de iniciar ventana
+        if gr_closed is not None:
+            gr_closure_exists = ticket.numero_ticket_gr in gr_closed
+        else:
+            gr_closure_exists = HookCierreTicketInterface.find_by_numero_ticket(ticket.numero_ticket_gr) is not None
+
+        if gr_closure_exists:
+            # Caso 3: GR cerró primero → cerrar directamente sin ventana
+            _close_ticket_normally(ticket, ticket_id, updated_at, status_id)
+            outcome['closed'] = True
+            logger.info(f"✅ Ticket {ticket_id} cerrado directamente (cierre GR ya existía, caso 3)")
+        elif ticket.splynx_closed_at is None:
+            # Caso 1/2: Iniciar ventana de espera
+            ticket.splynx_closed_at = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+            logger.info(f"⏳ Ticket {ticket_id} cerrado en Splynx - iniciando ventana de reapertura (splynx_closed_at={ticket.splynx_closed_at})")
+        else:
+            # Ya tiene splynx_closed_at, el reopen_checker se encarga
+            logger.debug(f"⏳ Ticket {ticket_id} en ventana de reapertura (splynx_closed_at={ticket.splynx_closed_at})")
+    else:
+        # Ticket aún abierto
+        ticket.is_closed = False
+        # Si tenía ventana de reapertura pero Splynx ya no lo marca como cerrado,
+        # limpiar splynx_closed_at (fue reabierto manualmente o por el reopen checker)
+        if ticket.splynx_closed_at is not None:
+            logger.info(f"🔄 Ticket {ticket_id} ya no está cerrado en Splynx, limpiando splynx_closed_at")
+            ticket.splynx_closed_at = None
+        logger.debug(f"ℹ️  Ticket {ticket_id} aún abierto (closed=0, response_time={ticket.response_time_minutes}min, exceeded={ticket.exceeded_threshold})")
+
+    return outcome
+
+
+def prefetch_gr_closures(pairs) -> set:
+    """
+    Cierres de GR de los tickets que Splynx reporta cerrados, en una consulta.
+
+    Args:
+        pairs: (IncidentsDetection, ticket de Splynx o None)
+    """
+    return HookCierreTicketInterface.get_closed_numeros(
+        ticket.numero_ticket_gr for ticket, splynx_ticket in pairs
+        if splynx_ticket and splynx_ticket.get('closed', '0') == '1'
+    )
+
+
 def sync_tickets_status():
     """
     Sincroniza el estado de tickets abiertos con Splynx.
     Actualiza: is_closed, closed_at, exceeded_threshold, response_time_minutes, assigned_to
     Registra cambios de asignación en historial de reasignaciones.
+
+    Modo incremental (SPLYNX_DELTA_SYNC_ENABLED): solo pide a Splynx los tickets con
+    updated_at posterior a la marca de agua; los demás solo recalculan tiempos con
+    los datos locales. Cada SPLYNX_FULL_RECONCILE_MINUTES se hace una pasada completa.
     """
+    with db_named_lock(APPLY_LOCK_NAME, timeout=60) as acquired:
+        if not acquired:
+            logger.info("Otro proceso está aplicando estados de Splynx - sincronización omitida")
+            return {'success': True, 'skipped': 'lock_busy'}
+        return _sync_tickets_status()
+
+
+def _sync_tickets_status():
     try:
         splynx = SplynxServicesSingleton()
+        if splynx.is_circuit_open():
+            logger.warning("🔴 Splynx no disponible (circuito abierto) - sincronización omitida")
+            return {'success': False, 'skipped': 'splynx_circuit_open'}
         
         # Obtener threshold desde configuración (default 60 minutos)
         threshold_minutes = ConfigHelper.get_int('TICKET_ALERT_THRESHOLD_MINUTES', 60)
@@ -85,10 +318,31 @@ def sync_tickets_status():
         ).all()
         
         logger.info(f"🔄 Sincronizando {len(open_tickets)} tickets abiertos con Splynx (threshold: {threshold_minutes} min)...")
+
+        full_reconcile = SyncWatermark.needs_full_reconcile(WATERMARK_NAME)
+
+        if full_reconcile:
+            # Traer todos los tickets abiertos en pocas requests (id IN (...)) en lugar de un GET por ticket
+            splynx_tickets = splynx.get_tickets_by_ids([ticket.Ticket_ID for ticket in open_tickets])
+            seen_tickets = list(splynx_tickets.values())
+        else:
+            # Solo los tickets que cambiaron en Splynx desde la última pasada
+            since = SyncWatermark.get_since(WATERMARK_NAME)
+            seen_tickets = splynx.get_tickets_updated_since(since)
+            open_ids = {str(ticket.Ticket_ID) for ticket in open_tickets}
+            splynx_tickets = {
+                str(t.get('id')): t for t in seen_tickets if str(t.get('id')) in open_ids
+            }
+            logger.info(f"🔖 Sync incremental desde {since}: {len(splynx_tickets)} de {len(open_tickets)} tickets abiertos cambiaron")
         
         closed_count = 0
         exceeded_count = 0
         reassigned_count = 0
+        failed_tickets = []
+
+        gr_closed = prefetch_gr_closures(
+            (ticket, splynx_tickets.get(str(ticket.Ticket_ID))) for ticket in open_tickets
+        )
         
         for ticket in open_tickets:
             try:
@@ -97,182 +351,43 @@ def sync_tickets_status():
                 if not ticket_id:
                     continue
                 
-                # Consultar ticket en Splynx
-                splynx_ticket = splynx.get_ticket_data_status(ticket_id)
+                # Ticket de Splynx ya obtenido en el fetch masivo
+                splynx_ticket = splynx_tickets.get(str(ticket_id))
+
+                if not splynx_ticket and not full_reconcile:
+                    # Sin cambios en Splynx: solo recalcular tiempos con la última actualización conocida
+                    last_update = ticket.last_update or parse_ticket_date(ticket.Fecha_Creacion)
+                    still_closed = ticket.splynx_closed_at is not None
+                    if last_update and _refresh_response_time(ticket, ticket_id, last_update, threshold_minutes, still_closed):
+                        exceeded_count += 1
+                    continue
                 
                 if splynx_ticket:
-                    # Usar el campo 'closed' de la respuesta de Splynx
-                    is_closed = splynx_ticket.get('closed', '0') == '1'
-                    status_id = splynx_ticket.get('status_id', '')
-                    updated_at = splynx_ticket.get('updated_at', '')
-                    # IMPORTANTE: La API de Splynx usa 'assign_to' no 'assigned_to'
-                    assigned_to_splynx = splynx_ticket.get('assign_to', None) or splynx_ticket.get('assigned_to', None)
-                    
-                    # Sincronizar assigned_to desde Splynx
-                    if assigned_to_splynx:
-                        # Convertir a int si no es None
-                        new_assigned_to = int(assigned_to_splynx) if assigned_to_splynx else None
-                    else:
-                        new_assigned_to = None
-
-                    # Sincronizar assigned_to si cambió en Splynx
-                    if new_assigned_to is not None and new_assigned_to != ticket.assigned_to:
-                        old_assigned_to = ticket.assigned_to
-                        ticket.assigned_to = new_assigned_to
-
-                        old_name = _get_operator_name(old_assigned_to)
-                        new_name = _get_operator_name(new_assigned_to)
-
-                        # Determinar si es primera asignación o reasignación
-                        is_reassignment = old_assigned_to is not None and old_assigned_to != 0
-
-                        # Notificar al nuevo operador por WhatsApp
-                        notification_sent = False
-                        if new_assigned_to and ConfigHelper.is_whatsapp_enabled():
-                            try:
-                                from app.services.whatsapp_service import WhatsAppService
-                                whatsapp_service = WhatsAppService()
-
-                                if is_reassignment:
-                                    notif_resultado = whatsapp_service.send_ticket_reassignment_notification(
-                                        person_id=new_assigned_to,
-                                        ticket_id=ticket_id,
-                                        subject=ticket.Asunto or 'Sin asunto',
-                                        customer_name=ticket.Cliente_Nombre or 'Cliente desconocido',
-                                        from_operator_name=old_name,
-                                        priority=ticket.Prioridad or 'medium'
-                                    )
-                                else:
-                                    notif_resultado = whatsapp_service.send_ticket_assignment_notification(
-                                        person_id=new_assigned_to,
-                                        ticket_id=ticket_id,
-                                        subject=ticket.Asunto or 'Sin asunto',
-                                        customer_name=ticket.Cliente_Nombre or 'Cliente desconocido',
-                                        priority=ticket.Prioridad or 'medium'
-                                    )
-
-                                notification_sent = notif_resultado["success"]
-                                if notification_sent:
-                                    logger.info(f"📱 Notificación {'de reasignación' if is_reassignment else 'de asignación'} enviada a {new_name} para ticket {ticket_id}")
-                                else:
-                                    logger.error(f"❌ Error enviando notificación: {notif_resultado.get('error', 'Unknown')}")
-
-                                # Notificar al operador anterior que le quitaron el ticket
-                                if is_reassignment:
-                                    try:
-                                        whatsapp_service.send_ticket_removed_notification(
-                                            person_id=old_assigned_to,
-                                            ticket_id=ticket_id,
-                                            subject=ticket.Asunto or 'Sin asunto',
-                                            new_operator_name=new_name
-                                        )
-                                    except Exception as e:
-                                        logger.warning(f"⚠️ No se pudo notificar al operador anterior ({old_name}): {e}")
-                            except Exception as e:
-                                logger.warning(f"⚠️ No se pudo enviar notificación WhatsApp: {e}")
-
-                        ReassignmentHistoryInterface.create({
-                            'ticket_id': str(ticket_id),
-                            'from_operator_id': old_assigned_to,
-                            'from_operator_name': old_name,
-                            'to_operator_id': new_assigned_to,
-                            'to_operator_name': new_name,
-                            'reason': 'Reasignación detectada en Splynx' if is_reassignment else 'Asignación detectada en Splynx',
-                            'reassignment_type': 'splynx_sync',
-                            'created_by': 'system',
-                            'notification_sent': notification_sent
-                        })
-                        reassigned_count += 1
-                        logger.info(f"🔄 Ticket {ticket_id}: {'reasignado' if is_reassignment else 'asignado'} {old_name} ({old_assigned_to}) → {new_name} ({new_assigned_to}) [WhatsApp: {'✅' if notification_sent else '❌'}]")
-
-                    # Calcular tiempo desde última actualización (no desde creación)
-                    # Si el ticket fue respondido/actualizado, el contador se resetea
-                    last_update = None
-
-                    # Usar updated_at de Splynx como fuente de última actualización
-                    if updated_at:
-                        last_update = parse_splynx_date(updated_at)
-                        if last_update:
-                            ticket.last_update = last_update
-                            logger.debug(f"*** Ticket {ticket_id}: Usando updated_at: {last_update}")
-
-                    # Si no hay last_update aún, usar fecha de creación como fallback
-                    if not last_update:
-                        last_update = parse_ticket_date(ticket.Fecha_Creacion)
-                        if last_update and not ticket.last_update:
-                            ticket.last_update = last_update
-                            logger.debug(f"*** Ticket {ticket_id}: Fallback a Fecha_Creacion: {last_update}")
-                    
-                    if last_update:
-                        # Usar hora de Argentina para el cálculo
-                        now_argentina = datetime.now(ARGENTINA_TZ)
-
-                        # Asegurar que last_update tenga timezone Argentina
-                        last_update = ensure_argentina_tz(last_update)
-
-                        # Calcular tiempo transcurrido en minutos
-                        time_since_update = int((now_argentina - last_update).total_seconds() / 60)
-                        ticket.response_time_minutes = time_since_update
-                        
-                        # IMPORTANTE: exceeded_threshold persiste una vez activado
-                        # Solo se puede desactivar cuando el ticket se cierra
-                        if not is_closed:
-                            # Si ya estaba vencido, mantenerlo vencido
-                            if ticket.exceeded_threshold:
-                                exceeded_count += 1
-                            # Si no estaba vencido, verificar si ahora excede el threshold
-                            elif time_since_update > threshold_minutes:
-                                ticket.exceeded_threshold = True
-                                exceeded_count += 1
-                                logger.info(f"🔴 Ticket {ticket_id} marcado como VENCIDO (response_time={time_since_update}min > {threshold_minutes}min)")
-                        # Si está cerrado, se manejará más abajo
-                    
-                    # Si el ticket está cerrado en Splynx (closed = "1")
-                    if is_closed:
-                        # Caso 0: Ticket sin numero_ticket_gr (no vino de GR) → cerrar directamente
-                        # La reapertura solo aplica a tickets que vinieron de GR
-                        if not ticket.numero_ticket_gr:
-                            _close_ticket_normally(ticket, ticket_id, updated_at, status_id)
-                            closed_count += 1
-                            logger.info(f"✅ Ticket {ticket_id} cerrado directamente (sin numero_ticket_gr, no aplica reapertura)")
-                            continue
-
-                        # Caso 3: Verificar si ya existe cierre de GR antes de iniciar ventana
-                        gr_closure = HookCierreTicketInterface.find_by_numero_ticket(ticket.numero_ticket_gr)
-                        gr_closure_exists = gr_closure is not None
-
-                        if gr_closure_exists:
-                            # Caso 3: GR cerró primero → cerrar directamente sin ventana
-                            _close_ticket_normally(ticket, ticket_id, updated_at, status_id)
-                            closed_count += 1
-                            logger.info(f"✅ Ticket {ticket_id} cerrado directamente (cierre GR ya existía, caso 3)")
-                        elif ticket.splynx_closed_at is None:
-                            # Caso 1/2: Iniciar ventana de espera
-                            ticket.splynx_closed_at = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
-                            logger.info(f"⏳ Ticket {ticket_id} cerrado en Splynx - iniciando ventana de reapertura (splynx_closed_at={ticket.splynx_closed_at})")
-                        else:
-                            # Ya tiene splynx_closed_at, el reopen_checker se encarga
-                            logger.debug(f"⏳ Ticket {ticket_id} en ventana de reapertura (splynx_closed_at={ticket.splynx_closed_at})")
-                    else:
-                        # Ticket aún abierto
-                        ticket.is_closed = False
-                        # Si tenía ventana de reapertura pero Splynx ya no lo marca como cerrado,
-                        # limpiar splynx_closed_at (fue reabierto manualmente o por el reopen checker)
-                        if ticket.splynx_closed_at is not None:
-                            logger.info(f"🔄 Ticket {ticket_id} ya no está cerrado en Splynx, limpiando splynx_closed_at")
-                            ticket.splynx_closed_at = None
-                        logger.debug(f"ℹ️  Ticket {ticket_id} aún abierto (closed=0, response_time={ticket.response_time_minutes}min, exceeded={ticket.exceeded_threshold})")
+                    outcome = apply_splynx_ticket(ticket, splynx_ticket, threshold_minutes, gr_closed)
+                    closed_count += outcome['closed']
+                    exceeded_count += outcome['exceeded']
+                    reassigned_count += outcome['reassigned']
                         
             except Exception as e:
                 logger.error(f"❌ Error al sincronizar ticket {ticket.Ticket_ID}: {e}")
+                if splynx_tickets.get(str(ticket.Ticket_ID)):
+                    failed_tickets.append(splynx_tickets[str(ticket.Ticket_ID)])
                 continue
         
         db.session.commit()
-        logger.info(f"✅ Sincronización completada: {closed_count} cerrados, {exceeded_count} vencidos, {reassigned_count} reasignados")
+
+        # Avanzar marca de agua solo después de persistir la pasada, sin pasar de los que fallaron
+        SyncWatermark.advance(WATERMARK_NAME, seen_tickets, failed_tickets)
+        if full_reconcile and not failed_tickets:
+            SyncWatermark.mark_full_reconcile(WATERMARK_NAME)
+
+        logger.info(f"✅ Sincronización {'completa' if full_reconcile else 'incremental'} completada: {closed_count} cerrados, {exceeded_count} vencidos, {reassigned_count} reasignados")
 
         return {
             'success': True,
+            'mode': 'full' if full_reconcile else 'delta',
             'total_checked': len(open_tickets),
+            'splynx_changed': len(splynx_tickets),
             'closed_count': closed_count,
             'exceeded_count': exceeded_count,
             'reassigned_count': reassigned_count
@@ -0,0 +1,168 @@
+"""
+Marca de agua (high-water mark) para sincronización incremental con Splynx.
+Persiste en system_config el último updated_at visto de Splynx por cada job
+y cuándo se hizo la última reconciliación completa.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+import pytz
+from app.interface.interfaces import SystemConfigInterface
+from app.utils.config_helper import ConfigHelper
+from app.utils.date_utils import parse_splynx_date
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARGENTINA_TZ = pytz.timezone('America/Argentina/Buenos_Aires')
+SPLYNX_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class SyncWatermark:
+    """Lee y escribe la marca de agua de un job de sincronización ('SYNC', 'IMPORT', ...)"""
+
+    @staticmethod
+    def _watermark_key(name: str) -> str:
+        return f'SPLYNX_WATERMARK_{name}'
+
+    @staticmethod
+    def _last_full_key(name: str) -> str:
+        return f'SPLYNX_LAST_FULL_SYNC_{name}'
+
+    @staticmethod
+    def get(name: str) -> Optional[datetime]:
+        """Último updated_at de Splynx procesado por el job (None si nunca corrió)"""
+        # No usar ConfigHelper: su caché no se invalida cuando el propio job escribe
+        config = SystemConfigInterface.get_by_key(SyncWatermark._watermark_key(name))
+        if not config or not config.value:
+            return None
+        return parse_splynx_date(config.value)
+
+    @staticmethod
+    def get_since(name: str) -> Optional[str]:
+        """
+        Fecha desde la cual pedir cambios a Splynx (marca de agua menos un solape
+        para no perder tickets actualizados mientras corría la pasada anterior).
+        """
+        watermark = SyncWatermark.get(name)
+        if watermark is None:
+            return None
+        overlap_seconds = ConfigHelper.get_int('SPLYNX_DELTA_OVERLAP_SECONDS', 120)
+        return (watermark - timedelta(seconds=overlap_seconds)).strftime(SPLYNX_DATE_FORMAT)
+
+    @staticmethod
+    def hold_back(tickets: Iterable[dict], failed: Iterable[dict]) -> List[dict]:
+        """
+        Tickets vistos que quedan antes del más viejo que falló (por updated_at).
+
+        Avanzar solo con estos deja a los que fallaron dentro del próximo delta.
+        Si algún ticket que falló no tiene updated_at válido no se avanza nada.
+        """
+        tickets = list(tickets)
+        failed_dates = [parse_splynx_date(t.get('updated_at', '')) for t in failed]
+        if not failed_dates:
+            return tickets
+        if None in failed_dates:
+            return []
+        oldest_failed = min(failed_dates)
+        return [
+            t for t in tickets
+            if (parse_splynx_date(t.get('updated_at', '')) or oldest_failed) < oldest_failed
+        ]
+
+    @staticmethod
+    def advance(name: str, tickets: Iterable[dict], failed: Iterable[dict] = ()) -> Optional[datetime]:
+        """
+        Avanza la marca de agua al mayor updated_at de los tickets vistos.
+        Nunca retrocede ni pasa del más viejo de los tickets que fallaron (failed).
+        """
+        failed = list(failed)
+        if failed:
+            tickets = SyncWatermark.hold_back(tickets, failed)
+            logger.warning(f"⚠️ {len(failed)} tickets con error: la marca de agua {name} no avanza más allá de ellos")
+        current = SyncWatermark.get(name)
+        newest = current
+
+        for ticket in tickets:
+            updated_at = parse_splynx_date(ticket.get('updated_at', ''))
+            if updated_at and (newest is None or updated_at > newest):
+                newest = updated_at
+
+        if newest is not None and newest != current:
+            SystemConfigInterface.update_or_create(
+                key=SyncWatermark._watermark_key(name),
+                value=newest.strftime(SPLYNX_DATE_FORMAT),
+                updated_by='system',
+                value_type='string',
+                category='sync',
+                description=f'Último updated_at de Splynx procesado por el job {name} (sincronización incremental)'
+            )
+            logger.debug(f"🔖 Marca de agua {name}: {current} -> {newest}")
+        return newest
+
+    @staticmethod
+    def needs_full_reconcile(name: str) -> bool:
+        """
+        True si corresponde una pasada completa: delta deshabilitado, nunca hubo
+        marca de agua o pasó SPLYNX_FULL_RECONCILE_MINUTES desde la última completa.
+        """
+        if not ConfigHelper.get_bool('SPLYNX_DELTA_SYNC_ENABLED', True):
+            return True
+        if SyncWatermark.get(name) is None:
+            return True
+
+        config = SystemConfigInterface.get_by_key(SyncWatermark._last_full_key(name))
+        if not config or not config.value:
+            return True
+
+        try:
+            last_full = datetime.fromisoformat(config.value)
+        except ValueError:
+            return True
+
+        interval_minutes = ConfigHelper.get_int('SPLYNX_FULL_RECONCILE_MINUTES', 60)
+        now = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+        return (now - last_full).total_seconds() >= interval_minutes * 60
+
+    @staticmethod
+    def mark_full_reconcile(name: str):
+        """Registra que se completó una reconciliación completa"""
+        now = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+        SystemConfigInterface.update_or_create(
+            key=SyncWatermark._last_full_key(name),
+            value=now.isoformat(timespec='seconds'),
+            updated_by='system',
+            value_type='string',
+            category='sync',
+            description=f'Última reconciliación completa del job {name} contra Splynx'
+        )
+
+    @staticmethod
+    def _last_sync_key(name: str) -> str:
+        return f'SPLYNX_LAST_SYNC_{name}'
+
+    @staticmethod
+    def mark_synced(name: str):
+        """Registra que el job terminó una pasada exitosa (completa o incremental)"""
+        now = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+        SystemConfigInterface.update_or_create(
+            key=SyncWatermark._last_sync_key(name),
+            value=now.isoformat(timespec='seconds'),
+            updated_by='system',
+            value_type='string',
+            category='sync',
+            description=f'Última sincronización exitosa del job {name} con Splynx'
+        )
+
+    @staticmethod
+    def seconds_since_sync(name: str) -> Optional[float]:
+        """Segundos desde la última pasada exitosa (None si nunca corrió)"""
+        config = SystemConfigInterface.get_by_key(SyncWatermark._last_sync_key(name))
+        if not config or not config.value:
+            return None
+        try:
+            last_sync = datetime.fromisoformat(config.value)
+        except ValueError:
+            return None
+        now = datetime.now(ARGENTINA_TZ).replace(tzinfo=None)
+        return (now - last_sync).total_seconds()
@@ -0,0 +1,107 @@
+"""
+Caché en memoria acotada (LRU) con expiración por TTL y caché negativa.
+Thread-safe: la usan los jobs del scheduler y los hilos de fan-out en paralelo.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU acotada a `maxsize` entradas. Cada entrada vence a los `ttl` segundos;
+    las entradas negativas (valor None, p. ej. cliente inexistente) vencen a
+    los `negative_ttl` segundos.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 900, negative_ttl: float = 300, name: str = 'cache'):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.name = name
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Busca una clave.
+
+        Returns:
+            tuple: (encontrado, valor). encontrado=True también para entradas
+            negativas, cuyo valor es None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return False, None
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._data.move_to_end(key)
+            if value is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Guarda un valor (None = entrada negativa) desalojando la menos usada si hace falta"""
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Elimina una clave. Devuelve True si existía"""
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> int:
+        """Vacía la caché. Devuelve cuántas entradas se eliminaron"""
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            return count
+
+    def stats(self) -> dict:
+        """Contadores de uso y tasa de aciertos"""
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'negative_ttl_seconds': self.negative_ttl,
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0
+            }
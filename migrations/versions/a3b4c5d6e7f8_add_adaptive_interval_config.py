@@ -0,0 +1,45 @@
+"""Add adaptive job interval config
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('ADAPTIVE_INTERVALS_ENABLED', 'true', 'bool',
+     'Ajustar el intervalo de sincronización, alertas e importación según la actividad de cada corrida'),
+    ('ADAPTIVE_BUSY_CHANGES', '5', 'int',
+     'Cambios por corrida a partir de los cuales el intervalo adaptativo se acorta a la mitad'),
+    ('ADAPTIVE_BUSY_BACKLOG', '20', 'int',
+     'Tickets pendientes (vencidos/excedidos) a partir de los cuales el intervalo adaptativo se acorta a la mitad'),
+    ('SYNC_STATUS_INTERVAL_MIN_MINUTES', '2', 'int', 'Intervalo mínimo (minutos) de la sincronización de estado'),
+    ('SYNC_STATUS_INTERVAL_MAX_MINUTES', '15', 'int', 'Intervalo máximo (minutos) de la sincronización de estado'),
+    ('IMPORT_TICKETS_INTERVAL_MIN_MINUTES', '2', 'int', 'Intervalo mínimo (minutos) de la importación de tickets existentes'),
+    ('IMPORT_TICKETS_INTERVAL_MAX_MINUTES', '20', 'int', 'Intervalo máximo (minutos) de la importación de tickets existentes'),
+    ('ALERT_SCAN_INTERVAL_MIN_MINUTES', '2', 'int', 'Intervalo mínimo (minutos) del barrido de tickets vencidos'),
+    ('ALERT_SCAN_INTERVAL_MAX_MINUTES', '30', 'int', 'Intervalo máximo (minutos) del barrido de tickets vencidos'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
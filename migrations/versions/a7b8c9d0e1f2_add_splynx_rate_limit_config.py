@@ -0,0 +1,45 @@
+"""Add Splynx rate limiter and adaptive concurrency config
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f6a7b8c9d0e1'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('SPLYNX_RATE_LIMIT_ENABLED', 'true', 'bool',
+     'Limitar del lado cliente la tasa y concurrencia de llamadas a Splynx'),
+    ('SPLYNX_RATE_LIMIT_PER_SECOND', '10', 'int',
+     'Llamadas por segundo permitidas hacia Splynx (token bucket)'),
+    ('SPLYNX_RATE_LIMIT_BURST', '20', 'int',
+     'Ráfaga máxima de llamadas a Splynx (capacidad del token bucket)'),
+    ('SPLYNX_MIN_CONCURRENCY', '2', 'int',
+     'Mínimo de llamadas simultáneas a Splynx (control adaptativo AIMD)'),
+    ('SPLYNX_MAX_CONCURRENCY', '16', 'int',
+     'Máximo de llamadas simultáneas a Splynx (control adaptativo AIMD)'),
+    ('SPLYNX_LATENCY_TARGET_MS', '2000', 'int',
+     'Latencia objetivo en ms: por encima se reduce la concurrencia hacia Splynx'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
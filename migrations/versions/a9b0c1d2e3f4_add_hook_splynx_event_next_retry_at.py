@@ -0,0 +1,25 @@
+"""Add hook_splynx_event.next_retry_at for events waiting to be retried
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a9b0c1d2e3f4'
+down_revision = 'f8a9b0c1d2e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('hook_splynx_event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_retry_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('hook_splynx_event', schema=None) as batch_op:
+        batch_op.drop_column('next_retry_at')
@@ -0,0 +1,34 @@
+"""Add journal_id to hook_nuevo_ticket and hook_cierre_ticket
+
+Id único de la línea del journal de webhooks; la recuperación del journal
+lo usa para no reinsertar payloads ya guardados.
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b0c1d2e3f4a5'
+down_revision = 'a9b0c1d2e3f4'
+branch_labels = None
+depends_on = None
+
+TABLES = ('hook_nuevo_ticket', 'hook_cierre_ticket')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('journal_id', sa.String(length=32), nullable=True))
+            batch_op.create_unique_constraint(f'uq_{table}_journal_id', ['journal_id'])
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(f'uq_{table}_journal_id', type_='unique')
+            batch_op.drop_column('journal_id')
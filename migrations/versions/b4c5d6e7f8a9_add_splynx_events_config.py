@@ -0,0 +1,35 @@
+"""Add Splynx push events config
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b4c5d6e7f8a9'
+down_revision = 'a3b4c5d6e7f8'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('SPLYNX_EVENTS_ACTIVE_MINUTES', '15', 'int',
+     'Si Splynx envió eventos de tickets en estos minutos, la sincronización por polling corre en su intervalo máximo'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
@@ -0,0 +1,39 @@
+"""Add Splynx circuit breaker config
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('SPLYNX_BREAKER_FAILURE_THRESHOLD', '5', 'int',
+     'Fallas consecutivas de Splynx (timeouts, 5xx, 429) que abren el circuito'),
+    ('SPLYNX_BREAKER_RECOVERY_SECONDS', '60', 'int',
+     'Segundos con el circuito abierto antes de volver a probar Splynx'),
+    ('SPLYNX_BREAKER_HALF_OPEN_MAX_CALLS', '1', 'int',
+     'Llamadas de prueba simultáneas permitidas con el circuito semiabierto'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
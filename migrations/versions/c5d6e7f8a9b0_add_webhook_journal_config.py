@@ -0,0 +1,39 @@
+"""Add webhook journal config
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b4c5d6e7f8a9'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('WEBHOOK_INGEST_MODE', 'direct', 'string',
+     "Ingesta de webhooks: 'direct' guarda en BD en cada request, 'journal' responde al escribir el journal local y guarda por lotes"),
+    ('WEBHOOK_GROUP_COMMIT_SIZE', '50', 'int',
+     'Modo journal: cantidad de webhooks que se guardan juntos en una transacción'),
+    ('WEBHOOK_GROUP_COMMIT_MAX_MS', '200', 'int',
+     'Modo journal: espera máxima (ms) de un webhook en el journal antes de guardarlo aunque el lote no esté completo'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
@@ -0,0 +1,62 @@
+"""Add splynx_ticket_mirror table and mirror config
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c9d0e1f2a3b4'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('SPLYNX_MIRROR_ENABLED', 'true', 'bool',
+     'Leer tickets abiertos del grupo de soporte desde el espejo local en lugar de Splynx'),
+    ('SPLYNX_MIRROR_MAX_AGE_SECONDS', '180', 'int',
+     'Antigüedad máxima (segundos) del espejo local para usarlo; si es mayor se consulta Splynx'),
+]
+
+
+def upgrade():
+    op.create_table('splynx_ticket_mirror',
+    sa.Column('ticket_id', sa.String(length=32), nullable=False),
+    sa.Column('group_id', sa.String(length=10), nullable=True),
+    sa.Column('status_id', sa.String(length=10), nullable=True),
+    sa.Column('closed', sa.Boolean(), nullable=True),
+    sa.Column('assign_to', sa.Integer(), nullable=True),
+    sa.Column('customer_id', sa.String(length=50), nullable=True),
+    sa.Column('subject', sa.String(length=255), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('synced_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('ticket_id')
+    )
+    with op.batch_alter_table('splynx_ticket_mirror', schema=None) as batch_op:
+        batch_op.create_index('ix_splynx_mirror_group_closed_assign', ['group_id', 'closed', 'assign_to'], unique=False)
+        batch_op.create_index(batch_op.f('ix_splynx_ticket_mirror_updated_at'), ['updated_at'], unique=False)
+
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
+
+    with op.batch_alter_table('splynx_ticket_mirror', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_splynx_ticket_mirror_updated_at'))
+        batch_op.drop_index('ix_splynx_mirror_group_closed_assign')
+
+    op.drop_table('splynx_ticket_mirror')
@@ -0,0 +1,37 @@
+"""Add alert deadline queue config
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('ALERT_DEADLINE_QUEUE_ENABLED', 'true', 'bool',
+     'Alertar cada ticket al llegar su vencimiento (cola de vencimientos) en lugar de esperar al barrido'),
+    ('ALERT_FULL_SCAN_MINUTES', '15', 'int',
+     'Intervalo (minutos) del barrido completo de tickets vencidos cuando la cola de vencimientos está activa'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'thresholds', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
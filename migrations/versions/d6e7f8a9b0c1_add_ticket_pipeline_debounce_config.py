@@ -0,0 +1,39 @@
+"""Add ticket pipeline debounce config
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd6e7f8a9b0c1'
+down_revision = 'c5d6e7f8a9b0'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('TICKET_PIPELINE_QUIET_MS', '500', 'int',
+     'Pipeline de tickets: milisegundos sin webhooks nuevos antes de procesar el lote acumulado'),
+    ('TICKET_PIPELINE_MAX_BATCH', '20', 'int',
+     'Pipeline de tickets: cantidad máxima de webhooks (y de tickets a crear en Splynx) por lote'),
+    ('TICKET_PIPELINE_MAX_WAIT_MS', '3000', 'int',
+     'Pipeline de tickets: espera máxima (ms) del webhook más viejo aunque sigan llegando otros'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
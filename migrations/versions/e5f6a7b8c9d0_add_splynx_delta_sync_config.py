@@ -0,0 +1,39 @@
+"""Add Splynx delta sync system config flags
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5f6a7b8c9d0'
+down_revision = 'd4e5f6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('SPLYNX_DELTA_SYNC_ENABLED', 'true', 'bool',
+     'Sincronización incremental con Splynx: solo pide tickets con updated_at posterior a la marca de agua'),
+    ('SPLYNX_FULL_RECONCILE_MINUTES', '60', 'int',
+     'Cada cuántos minutos se hace una reconciliación completa contra Splynx (red de seguridad del modo incremental)'),
+    ('SPLYNX_DELTA_OVERLAP_SECONDS', '120', 'int',
+     'Segundos de solape al pedir cambios a Splynx desde la marca de agua'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
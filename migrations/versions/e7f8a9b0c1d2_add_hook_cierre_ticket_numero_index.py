@@ -0,0 +1,22 @@
+"""Add index on hook_cierre_ticket.numero_ticket
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e7f8a9b0c1d2'
+down_revision = 'd6e7f8a9b0c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_hook_cierre_ticket_numero_ticket', 'hook_cierre_ticket', ['numero_ticket'])
+
+
+def downgrade():
+    op.drop_index('ix_hook_cierre_ticket_numero_ticket', table_name='hook_cierre_ticket')
@@ -0,0 +1,37 @@
+"""Add Splynx async fan-out system config
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+CONFIGS = [
+    ('SPLYNX_ASYNC_CONCURRENCY', '8', 'int',
+     'Máximo de llamadas simultáneas a Splynx en los jobs que hacen fan-out (clientes, desasignaciones, reaperturas)'),
+    ('SPLYNX_ASYNC_TIMEOUT_SECONDS', '30', 'int',
+     'Timeout en segundos de cada llamada a Splynx dentro de un fan-out'),
+]
+
+
+def upgrade():
+    for key, value, value_type, description in CONFIGS:
+        op.execute(sa.text("""
+            INSERT INTO system_config (`key`, value, value_type, description, category, updated_at, updated_by)
+            VALUES (:key, :value, :value_type, :description, 'sync', NOW(), 'migration')
+            ON DUPLICATE KEY UPDATE `key` = `key`
+        """).bindparams(key=key, value=value, value_type=value_type, description=description))
+
+
+def downgrade():
+    for key, _, _, _ in CONFIGS:
+        op.execute(sa.text("DELETE FROM system_config WHERE `key` = :key").bindparams(key=key))
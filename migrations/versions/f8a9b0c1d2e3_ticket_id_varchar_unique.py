@@ -0,0 +1,110 @@
+"""Change tickets_detection.Ticket_ID from TEXT to an indexed unique VARCHAR(32)
+
+Los Ticket_ID repetidos se conservan en el incidente más nuevo; los
+anteriores quedan en NULL y sus pares (id, Ticket_ID) se guardan en
+tickets_detection_ticket_id_backup para revisión (downgrade los restaura).
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+import logging
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f8a9b0c1d2e3'
+down_revision = 'e7f8a9b0c1d2'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Pares (id, Ticket_ID) que pierden el ID por estar repetidos; downgrade los restaura
+BACKUP_TABLE = 'tickets_detection_ticket_id_backup'
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Backfill: IDs sin espacios y vacíos como NULL (NULL no choca con la restricción única)
+    op.execute(sa.text("UPDATE tickets_detection SET Ticket_ID = TRIM(Ticket_ID) WHERE Ticket_ID IS NOT NULL"))
+    op.execute(sa.text("UPDATE tickets_detection SET Ticket_ID = NULL WHERE Ticket_ID = ''"))
+
+    # Si un Ticket_ID quedó repetido, conserva el incidente más nuevo; los anteriores
+    # pierden el ID, pero antes se registran y se guardan en la tabla de respaldo
+    duplicates = conn.execute(sa.text("""
+        SELECT t.id, t.Ticket_ID, d.keep_id
+        FROM tickets_detection t
+        JOIN (
+            SELECT Ticket_ID, MAX(id) AS keep_id
+            FROM tickets_detection
+            WHERE Ticket_ID IS NOT NULL
+            GROUP BY Ticket_ID
+            HAVING COUNT(*) > 1
+        ) d ON t.Ticket_ID = d.Ticket_ID AND t.id < d.keep_id
+        ORDER BY t.Ticket_ID, t.id
+    """)).fetchall()
+
+    op.create_table(BACKUP_TABLE,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('Ticket_ID', sa.Text(), nullable=False),
+        sa.Column('kept_id', sa.Integer(), nullable=False),
+        sa.Column('cleared_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    if duplicates:
+        logger.warning(
+            f"tickets_detection: {len(duplicates)} incidente(s) con Ticket_ID repetido pierden el ID "
+            f"(respaldo en {BACKUP_TABLE})"
+        )
+        for incident_id, ticket_id, keep_id in duplicates:
+            logger.warning(f"  id={incident_id} Ticket_ID={ticket_id!r} (se conserva en id={keep_id})")
+
+        backup = sa.table(BACKUP_TABLE,
+            sa.column('id', sa.Integer()),
+            sa.column('Ticket_ID', sa.Text()),
+            sa.column('kept_id', sa.Integer()),
+            sa.column('cleared_at', sa.DateTime())
+        )
+        now = datetime.now()
+        op.bulk_insert(backup, [
+            {'id': incident_id, 'Ticket_ID': ticket_id, 'kept_id': keep_id, 'cleared_at': now}
+            for incident_id, ticket_id, keep_id in duplicates
+        ])
+
+        ids = [incident_id for incident_id, _, _ in duplicates]
+        for start in range(0, len(ids), 500):
+            conn.execute(
+                sa.text("UPDATE tickets_detection SET Ticket_ID = NULL WHERE id IN :ids")
+                .bindparams(sa.bindparam('ids', expanding=True)),
+                {'ids': ids[start:start + 500]}
+            )
+
+    with op.batch_alter_table('tickets_detection', schema=None) as batch_op:
+        batch_op.alter_column('Ticket_ID',
+               existing_type=sa.Text(),
+               type_=sa.String(length=32),
+               existing_nullable=True)
+        batch_op.create_index('ix_tickets_detection_Ticket_ID', ['Ticket_ID'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('tickets_detection', schema=None) as batch_op:
+        batch_op.drop_index('ix_tickets_detection_Ticket_ID')
+        batch_op.alter_column('Ticket_ID',
+               existing_type=sa.String(length=32),
+               type_=sa.Text(),
+               existing_nullable=True)
+
+    # Devolver el Ticket_ID a los incidentes que lo perdieron por estar repetidos
+    op.execute(sa.text(f"""
+        UPDATE tickets_detection
+        SET Ticket_ID = (SELECT b.Ticket_ID FROM {BACKUP_TABLE} b WHERE b.id = tickets_detection.id)
+        WHERE id IN (SELECT id FROM {BACKUP_TABLE})
+    """))
+    op.drop_table(BACKUP_TABLE)
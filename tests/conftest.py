@@ -0,0 +1,31 @@
+"""
+Fixtures compartidos: una app Flask mínima sobre SQLite en memoria.
+
+No usa create_app() para no arrancar el scheduler ni los blueprints; solo
+crea las tablas que necesita cada test.
+"""
+
+import pytest
+from flask import Flask
+
+from app.utils.config import db
+from app.utils.config_helper import ConfigHelper
+from app.models.models import (
+    HookCierreTicket, HookNuevoTicket, SplynxTicketMirror, SystemConfig
+)
+
+TABLES = [m.__table__ for m in (SystemConfig, SplynxTicketMirror, HookNuevoTicket, HookCierreTicket)]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.metadata.create_all(bind=db.engine, tables=TABLES)
+        ConfigHelper.clear_cache()
+        yield app
+        db.session.remove()
+        db.metadata.drop_all(bind=db.engine, tables=TABLES)
@@ -0,0 +1,194 @@
+"""Tests de la cola de vencimientos de alertas (app.services.alert_deadlines)."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import alert_deadlines
+from app.services.alert_deadlines import FIRE_SLACK_SECONDS, AlertDeadlineQueue
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def queue():
+    q = AlertDeadlineQueue()
+    q.threshold_minutes = 60
+    q.pre_alert_minutes = 15
+    q.renotification_minutes = 60
+    q.outhouse_minutes = 120
+    # Sin hilo: la cola "corre" pero los tests controlan el reloj
+    q._running = True
+    return q
+
+
+def _ticket(ticket_id, updated_at, **extra):
+    return {
+        'id': ticket_id,
+        'group_id': '4',
+        'status_id': '1',
+        'closed': '0',
+        'assign_to': '7',
+        'updated_at': updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+        **extra,
+    }
+
+
+def _ts(queue, dt):
+    return queue._tz.localize(dt).timestamp()
+
+
+BASE = datetime(2026, 10, 16, 10, 0, 0)
+
+
+def test_next_deadline_pre_alert_then_threshold(queue):
+    ticket = _ticket('1', BASE)
+    updated = _ts(queue, BASE)
+
+    assert queue.next_deadline(ticket, now=updated) == updated + 45 * 60 + FIRE_SLACK_SECONDS
+    # Pasada la pre-alerta, el próximo es el umbral
+    assert queue.next_deadline(ticket, now=updated + 50 * 60) == updated + 60 * 60 + FIRE_SLACK_SECONDS
+    # Pasados ambos queda a cargo de la re-notificación
+    assert queue.next_deadline(ticket, now=updated + 61 * 60) is None
+
+
+def test_next_deadline_outhouse_uses_longer_window(queue):
+    ticket = _ticket('1', BASE, status_id=alert_deadlines.OUTHOUSE_STATUS_ID)
+    updated = _ts(queue, BASE)
+
+    assert queue.next_deadline(ticket, now=updated) == updated + 120 * 60 + FIRE_SLACK_SECONDS
+
+
+def test_next_deadline_without_updated_at(queue):
+    assert queue.next_deadline({'id': '1', 'updated_at': ''}) is None
+
+
+def test_schedule_tickets_drops_unalertable(queue, monkeypatch):
+    monkeypatch.setattr(alert_deadlines, 'time', FakeClock(_ts(queue, BASE)))
+    queue.schedule_tickets([_ticket('1', BASE), _ticket('2', BASE)])
+    assert set(queue._deadlines) == {'1', '2'}
+
+    queue.schedule_tickets([_ticket('1', BASE, closed='1'), _ticket('2', BASE, assign_to='0')])
+    assert queue._deadlines == {}
+
+
+def test_schedule_tickets_full_removes_unseen(queue, monkeypatch):
+    monkeypatch.setattr(alert_deadlines, 'time', FakeClock(_ts(queue, BASE)))
+    queue.schedule_tickets([_ticket('1', BASE), _ticket('2', BASE)])
+
+    queue.schedule_tickets([_ticket('1', BASE)], full=True)
+
+    assert set(queue._deadlines) == {'1'}
+    assert all(ticket_id == '1' for _, ticket_id in queue._heap)
+
+
+def test_overdue_ticket_rescheduling(queue, monkeypatch):
+    now = _ts(queue, BASE + timedelta(hours=2))
+    monkeypatch.setattr(alert_deadlines, 'time', FakeClock(now))
+    overdue = _ticket('1', BASE)
+
+    # Visto por el espejo por primera vez: se revisa de inmediato
+    queue.schedule_tickets([overdue])
+    assert queue._deadlines['1'] == now
+
+    # Visto otra vez por el espejo: conserva su vencimiento
+    queue._deadlines['1'] = now + 5
+    queue.schedule_tickets([overdue])
+    assert queue._deadlines['1'] == now + 5
+
+    # Recién revisado: próximo aviso en el intervalo de re-notificación
+    queue.schedule_tickets([overdue], evaluated=True)
+    assert queue._deadlines['1'] == now + 60 * 60
+
+
+def test_retry_keeps_earlier_deadline(queue, monkeypatch):
+    now = _ts(queue, BASE)
+    monkeypatch.setattr(alert_deadlines, 'time', FakeClock(now))
+    queue._deadlines['1'] = now + 10
+
+    queue.retry(['1', '2'], delay=30)
+
+    assert queue._deadlines == {'1': now + 10, '2': now + 30}
+    assert (now + 30, '2') in queue._heap
+
+
+def test_take_due_empties_the_set(queue):
+    queue._due = {'1', '2'}
+    assert queue.take_due() == {'1', '2'}
+    assert queue.take_due() == set()
+
+
+def test_loop_fires_due_tickets():
+    queue = AlertDeadlineQueue()
+    fired = threading.Event()
+    queue.start(fired.set)
+    try:
+        # updated_at muy viejo y no revisado: vence ya mismo
+        queue.schedule_tickets([_ticket('1', datetime(2020, 1, 1))])
+        assert fired.wait(5)
+        assert queue.take_due() == {'1'}
+        assert '1' not in queue._deadlines
+    finally:
+        queue.stop()
+
+
+@pytest.mark.parametrize('outcome', [
+    {'skipped': 'lock_busy'},
+    {'skipped': 'splynx_circuit_open'},
+    {'error': 'boom'},
+    RuntimeError('boom'),
+])
+def test_due_tickets_are_retried_when_not_evaluated(app, monkeypatch, outcome):
+    from app.routes import thread_functions
+    from app.services.alert_deadlines import deadline_queue
+
+    class FakeTicketManager:
+        def __init__(self, splynx):
+            pass
+
+        def check_and_alert_overdue_tickets(self, only_ticket_ids=None):
+            if isinstance(outcome, Exception):
+                raise outcome
+            return {'alertas_enviadas': 0, 'pre_alertas_enviadas': 0, **outcome}
+
+    monkeypatch.setattr(thread_functions, 'TicketManager', FakeTicketManager)
+    monkeypatch.setattr(thread_functions, 'get_splynx_service', lambda: None)
+    monkeypatch.setattr(deadline_queue, '_running', True)
+    monkeypatch.setattr(deadline_queue, '_due', {'1', '2'})
+    monkeypatch.setattr(deadline_queue, '_deadlines', {})
+    monkeypatch.setattr(deadline_queue, '_heap', [])
+
+    thread_functions.thread_alert_due_tickets(app)
+
+    assert deadline_queue.take_due() == set()
+    assert set(deadline_queue._deadlines) == {'1', '2'}
+
+
+def test_due_tickets_are_dropped_after_evaluation(app, monkeypatch):
+    from app.routes import thread_functions
+    from app.services.alert_deadlines import deadline_queue
+
+    class FakeTicketManager:
+        def __init__(self, splynx):
+            pass
+
+        def check_and_alert_overdue_tickets(self, only_ticket_ids=None):
+            return {'alertas_enviadas': 1, 'pre_alertas_enviadas': 0}
+
+    monkeypatch.setattr(thread_functions, 'TicketManager', FakeTicketManager)
+    monkeypatch.setattr(thread_functions, 'get_splynx_service', lambda: None)
+    monkeypatch.setattr(deadline_queue, '_running', True)
+    monkeypatch.setattr(deadline_queue, '_due', {'1'})
+    monkeypatch.setattr(deadline_queue, '_deadlines', {})
+    monkeypatch.setattr(deadline_queue, '_heap', [])
+
+    thread_functions.thread_alert_due_tickets(app)
+
+    assert deadline_queue._deadlines == {}
@@ -0,0 +1,71 @@
+"""Tests del espejo local de tickets de Splynx (app.interface.splynx_ticket_mirror)."""
+
+from app.interface import splynx_ticket_mirror
+from app.interface.splynx_ticket_mirror import SplynxTicketMirrorInterface
+from app.models.models import SplynxTicketMirror
+from app.utils.config import db
+
+
+def _ticket(ticket_id, group_id='4', closed='0', assign_to='0', updated_at='2026-10-16 10:00:00'):
+    return {
+        'id': ticket_id,
+        'group_id': group_id,
+        'status_id': '1',
+        'closed': closed,
+        'assign_to': assign_to,
+        'customer_id': '100',
+        'subject': f'Ticket {ticket_id}',
+        'created_at': '2026-10-16 09:00:00',
+        'updated_at': updated_at,
+    }
+
+
+def _mirror_ids():
+    return sorted(row.ticket_id for row in SplynxTicketMirror.query.all())
+
+
+def test_apply_changes_upserts_open_and_removes_closed(app):
+    SplynxTicketMirrorInterface.apply_changes([_ticket('1'), _ticket('2')], '4')
+    assert _mirror_ids() == ['1', '2']
+
+    result = SplynxTicketMirrorInterface.apply_changes(
+        [_ticket('1', assign_to='7', updated_at='2026-10-16 11:00:00'), _ticket('2', closed='1'), _ticket('3', group_id='5')],
+        '4'
+    )
+
+    assert result == {'upserted': 1, 'removed': 1}
+    assert _mirror_ids() == ['1']
+    row = db.session.get(SplynxTicketMirror, '1')
+    assert row.assign_to == 7
+    assert row.to_splynx_dict()['updated_at'] == '2026-10-16 11:00:00'
+
+
+def test_reconcile_deletes_stale_rows_in_chunks(app, monkeypatch):
+    monkeypatch.setattr(splynx_ticket_mirror, 'RECONCILE_CHUNK_SIZE', 2)
+    SplynxTicketMirrorInterface.apply_changes([_ticket(str(i)) for i in range(1, 7)], '4')
+    # Fila de otro grupo (por ejemplo un write-through viejo)
+    db.session.add(SplynxTicketMirror(ticket_id='99', group_id='5', closed=False))
+    db.session.commit()
+
+    open_tickets = [_ticket(tid) for tid in ('1', '3', '4', '6', '7')]
+    result = SplynxTicketMirrorInterface.reconcile(open_tickets, '4')
+
+    assert _mirror_ids() == ['1', '3', '4', '6', '7']
+    assert result['removed'] == 3
+
+
+def test_reconcile_with_no_open_tickets_empties_the_group(app):
+    SplynxTicketMirrorInterface.apply_changes([_ticket('1'), _ticket('2')], '4')
+
+    result = SplynxTicketMirrorInterface.reconcile([], '4')
+
+    assert _mirror_ids() == []
+    assert result == {'upserted': 0, 'removed': 2}
+
+
+def test_get_open_filters_assignment(app):
+    SplynxTicketMirrorInterface.apply_changes([_ticket('1'), _ticket('2', assign_to='7')], '4')
+
+    assert [t['id'] for t in SplynxTicketMirrorInterface.get_open('4', assigned=True)] == ['2']
+    assert [t['id'] for t in SplynxTicketMirrorInterface.get_open('4', assigned=False)] == ['1']
+    assert SplynxTicketMirrorInterface.count_by_operator('4') == {0: 1, 7: 1}
@@ -0,0 +1,99 @@
+"""Tests de la marca de agua de sincronización incremental (app.utils.sync_watermark)."""
+
+from datetime import datetime
+
+from app.utils.sync_watermark import SyncWatermark
+
+
+def _t(ticket_id, updated_at):
+    return {'id': ticket_id, 'updated_at': updated_at}
+
+
+SEEN = [
+    _t('1', '2026-10-16 10:00:00'),
+    _t('2', '2026-10-16 10:05:00'),
+    _t('3', '2026-10-16 10:10:00'),
+]
+
+
+def test_hold_back_without_failures_keeps_everything():
+    assert SyncWatermark.hold_back(SEEN, []) == SEEN
+
+
+def test_hold_back_stops_before_oldest_failure():
+    failed = [_t('3', '2026-10-16 10:10:00'), _t('2', '2026-10-16 10:05:00')]
+    assert [t['id'] for t in SyncWatermark.hold_back(SEEN, failed)] == ['1']
+
+
+def test_hold_back_failure_without_date_holds_everything():
+    assert SyncWatermark.hold_back(SEEN, [_t('2', '')]) == []
+
+
+def test_advance_never_moves_back(app):
+    assert SyncWatermark.advance('TEST', SEEN) == datetime(2026, 10, 16, 10, 10)
+    assert SyncWatermark.advance('TEST', [_t('4', '2026-10-16 09:00:00')]) == datetime(2026, 10, 16, 10, 10)
+    assert SyncWatermark.get('TEST') == datetime(2026, 10, 16, 10, 10)
+
+
+def test_advance_holds_back_at_failed_tickets(app):
+    SyncWatermark.advance('TEST', [_t('0', '2026-10-16 09:00:00')])
+
+    SyncWatermark.advance('TEST', SEEN, failed=[_t('2', '2026-10-16 10:05:00')])
+
+    assert SyncWatermark.get('TEST') == datetime(2026, 10, 16, 10, 0)
+
+
+def test_full_reconcile_needed_until_marked(app):
+    assert SyncWatermark.needs_full_reconcile('TEST') is True
+
+    SyncWatermark.advance('TEST', SEEN)
+    SyncWatermark.mark_full_reconcile('TEST')
+
+    assert SyncWatermark.needs_full_reconcile('TEST') is False
+
+
+class FakeSplynx:
+    def __init__(self, open_tickets=None, error=None):
+        self.open_tickets = open_tickets or []
+        self.error = error
+
+    def is_circuit_open(self):
+        return False
+
+    def get_open_tickets(self, group_id="4"):
+        if self.error:
+            raise self.error
+        return self.open_tickets
+
+    def get_tickets_updated_since(self, since, group_id="4"):
+        return self.open_tickets
+
+
+def _run_import(monkeypatch, splynx, fail_ids=()):
+    from app.interface.interfaces import IncidentsInterface
+    from app.utils import import_existing_tickets as module
+
+    monkeypatch.setattr(module, 'SplynxServicesSingleton', lambda: splynx)
+    monkeypatch.setattr(IncidentsInterface, 'find_by_ticket_ids', staticmethod(lambda ids: {}))
+    monkeypatch.setattr(IncidentsInterface, 'create', staticmethod(
+        lambda data: None if data['Ticket_ID'] in fail_ids else object()
+    ))
+    return module.import_existing_tickets_from_splynx()
+
+
+def test_import_full_pass_failure_is_not_marked_done(app, monkeypatch):
+    result = _run_import(monkeypatch, FakeSplynx(error=RuntimeError('Splynx down')))
+
+    assert result['success'] is False
+    assert SyncWatermark.needs_full_reconcile('IMPORT') is True
+
+
+def test_import_holds_watermark_at_failed_ticket(app, monkeypatch):
+    tickets = [dict(t, closed='0', group_id='4') for t in SEEN]
+
+    result = _run_import(monkeypatch, FakeSplynx(tickets), fail_ids={'2'})
+
+    assert result['errors'] == 1
+    assert SyncWatermark.get('IMPORT') == datetime(2026, 10, 16, 10, 0)
+    # Con errores la pasada completa no queda registrada
+    assert SyncWatermark.needs_full_reconcile('IMPORT') is True
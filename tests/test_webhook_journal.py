@@ -0,0 +1,132 @@
+"""Tests del journal de webhooks con group commit (app.services.webhook_journal)."""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import DataError, OperationalError
+
+from app.models.models import HookNuevoTicket
+from app.services.webhook_journal import DEAD_LETTER_FILE, WebhookJournal
+from app.utils.config import db
+
+
+@pytest.fixture
+def journal(app, tmp_path):
+    journal = WebhookJournal(directory=str(tmp_path))
+    # Proceso ya "armado" sin hilo de flush: los tests llaman a flush() a mano
+    journal._pid = os.getpid()
+    journal._app = app
+    yield journal
+    for _, handle in journal._sealed + ([journal._segment] if journal._segment else []):
+        handle.close()
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith('journal-'))
+
+
+def _fail_rows(predicate, error):
+    """Hace fallar el flush de la sesión cuando algún HookNuevoTicket nuevo cumple predicate"""
+    def before_flush(session, flush_context, instances):
+        for obj in session.new:
+            if isinstance(obj, HookNuevoTicket) and predicate(obj):
+                raise error
+    event.listen(db.session, 'before_flush', before_flush)
+    return lambda: event.remove(db.session, 'before_flush', before_flush)
+
+
+def test_flush_inserts_batch_and_removes_segment(app, journal, tmp_path):
+    journal.append(app, 'nuevo', {'numero_ticket': 1, 'numero_cliente': 'a'})
+    journal.append(app, 'cierre', {'numero_ticket': 1})
+    assert len(_segments(tmp_path)) == 1
+
+    assert journal.flush() is True
+
+    rows = HookNuevoTicket.query.all()
+    assert [r.numero_cliente for r in rows] == ['a']
+    assert rows[0].journal_id
+    assert _segments(tmp_path) == []
+    assert journal.stats()['flushed'] == 2
+
+
+def test_rejected_row_goes_to_dead_letter_without_blocking(app, journal, tmp_path):
+    remove = _fail_rows(lambda r: r.numero_cliente == 'bad', DataError('INSERT', {}, Exception('Data too long')))
+    try:
+        journal.append(app, 'nuevo', {'numero_ticket': 1, 'numero_cliente': 'bad'})
+        journal.append(app, 'nuevo', {'numero_ticket': 2, 'numero_cliente': 'ok'})
+
+        assert journal.flush() is True
+    finally:
+        remove()
+
+    assert [r.numero_ticket for r in HookNuevoTicket.query.all()] == [2]
+    with open(tmp_path / DEAD_LETTER_FILE) as handle:
+        dead = [json.loads(line) for line in handle]
+    assert [d['data']['numero_cliente'] for d in dead] == ['bad']
+    assert 'Data too long' in dead[0]['error']
+    assert journal.stats()['pending'] == 0
+    assert _segments(tmp_path) == []
+
+
+def test_transient_failure_keeps_batch_and_segments(app, journal, tmp_path):
+    remove = _fail_rows(lambda r: True, OperationalError('INSERT', {}, Exception('gone away')))
+    try:
+        journal.append(app, 'nuevo', {'numero_ticket': 1})
+        journal.append(app, 'nuevo', {'numero_ticket': 2})
+
+        assert journal.flush() is False
+        assert journal.stats()['pending'] == 2
+        assert len(_segments(tmp_path)) == 1
+        assert not (tmp_path / DEAD_LETTER_FILE).exists()
+    finally:
+        remove()
+
+    assert journal.flush() is True
+    assert sorted(r.numero_ticket for r in HookNuevoTicket.query.all()) == [1, 2]
+    assert _segments(tmp_path) == []
+
+
+def test_partial_transient_failure_rejournals_the_rest(app, journal, tmp_path):
+    remove = _fail_rows(lambda r: r.numero_ticket == 2, OperationalError('INSERT', {}, Exception('lock wait')))
+    try:
+        journal.append(app, 'nuevo', {'numero_ticket': 1})
+        journal.append(app, 'nuevo', {'numero_ticket': 2})
+        first_segment = _segments(tmp_path)
+
+        assert journal.flush() is False
+    finally:
+        remove()
+
+    # El segmento viejo se borró; el pendiente quedó en uno nuevo
+    remaining = _segments(tmp_path)
+    assert len(remaining) == 1 and remaining != first_segment
+    assert journal.stats()['pending'] == 1
+
+    assert journal.flush() is True
+    assert sorted(r.numero_ticket for r in HookNuevoTicket.query.all()) == [1, 2]
+
+
+def test_recover_dedups_on_entry_id(app, tmp_path):
+    received_at = datetime(2026, 10, 16, 12, 0, 0)
+    db.session.add(HookNuevoTicket(numero_ticket=5, received_at=received_at, journal_id='saved'))
+    db.session.commit()
+
+    # Dos payloads del mismo ticket en el mismo segundo: solo uno estaba guardado
+    lines = [
+        {'id': 'saved', 'kind': 'nuevo', 'data': {'numero_ticket': 5}, 'received_at': received_at.isoformat()},
+        {'id': 'lost', 'kind': 'nuevo', 'data': {'numero_ticket': 5}, 'received_at': received_at.isoformat()},
+    ]
+    path = tmp_path / 'journal-999999-1.jsonl'
+    path.write_text(''.join(json.dumps(line) + '\n' for line in lines))
+
+    assert WebhookJournal(directory=str(tmp_path)).recover(app) == 1
+
+    assert sorted(r.journal_id for r in HookNuevoTicket.query.all()) == ['lost', 'saved']
+    assert not path.exists()
+
+
+def test_recover_without_directory_does_nothing(app):
+    assert WebhookJournal(directory='').recover(app) == 0